@@ -0,0 +1,124 @@
+"""
+Compare the JSON response classes on a LoadTableResult with many snapshots.
+
+    python benchmarks/json_encoders.py --snapshots 10000 --repeat 5
+
+Reports the best encode time over `--repeat` runs and the peak memory allocated
+while encoding, measured with tracemalloc in a separate pass.
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+from typing import Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from iceberg_rest.api.catalog_api import LoadTableResult
+from iceberg_rest.responses import RESPONSE_CLASSES
+from pyiceberg.table.metadata import TableMetadataUtil
+
+
+def metadata_with_snapshots(count: int) -> Dict:
+    snapshots = [
+        {
+            "snapshot-id": snapshot_id,
+            "parent-snapshot-id": snapshot_id - 1 if snapshot_id > 1 else None,
+            "sequence-number": snapshot_id,
+            "timestamp-ms": 1602638573590 + snapshot_id,
+            "manifest-list": f"s3://warehouse/db/tbl/metadata/snap-{snapshot_id}-1-{uuid.uuid4()}.avro",
+            "summary": {
+                "operation": "append",
+                "added-data-files": "1",
+                "added-records": "100",
+                "added-files-size": "1024",
+                "total-data-files": str(snapshot_id),
+                "total-records": str(100 * snapshot_id),
+            },
+            "schema-id": 0,
+        }
+        for snapshot_id in range(1, count + 1)
+    ]
+    return {
+        "format-version": 2,
+        "table-uuid": str(uuid.uuid4()),
+        "location": "s3://warehouse/db/tbl",
+        "last-sequence-number": count,
+        "last-updated-ms": 1602638573590 + count,
+        "last-column-id": 1,
+        "current-schema-id": 0,
+        "schemas": [
+            {
+                "type": "struct",
+                "schema-id": 0,
+                "fields": [{"id": 1, "name": "x", "required": True, "type": "long"}],
+            }
+        ],
+        "default-spec-id": 0,
+        "partition-specs": [{"spec-id": 0, "fields": []}],
+        "last-partition-id": 999,
+        "default-sort-order-id": 0,
+        "sort-orders": [{"order-id": 0, "fields": []}],
+        "properties": {},
+        "current-snapshot-id": count,
+        "refs": {"main": {"snapshot-id": count, "type": "branch"}},
+        "snapshots": snapshots,
+        "snapshot-log": [
+            {"snapshot-id": s["snapshot-id"], "timestamp-ms": s["timestamp-ms"]}
+            for s in snapshots
+        ],
+    }
+
+
+def encoders() -> Dict[str, Callable[[LoadTableResult], bytes]]:
+    def fastapi_default(result: LoadTableResult) -> bytes:
+        # What a route returning the model went through before the catalog response classes
+        return JSONResponse(
+            jsonable_encoder(result, by_alias=True, exclude_none=True)
+        ).body
+
+    return {
+        "fastapi-default": fastapi_default,
+        **{
+            name: (lambda result, cls=cls: cls(result).body)
+            for name, cls in RESPONSE_CLASSES.items()
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--snapshots", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    metadata = TableMetadataUtil.parse_obj(metadata_with_snapshots(args.snapshots))
+    result = LoadTableResult(
+        metadata_location="s3://warehouse/db/tbl/metadata/00001.metadata.json",
+        metadata=metadata,
+        config={},
+    )
+
+    print(
+        f"{'encoder':<16}{'best time (ms)':>16}{'peak memory (MiB)':>20}{'size (KiB)':>12}"
+    )
+    for name, encode in encoders().items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            body = encode(result)
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        encode(result)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{name:<16}{min(timings) * 1000:>16.1f}{peak / 2**20:>20.1f}{len(body) / 2**10:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
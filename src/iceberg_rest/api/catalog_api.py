@@ -1,11 +1,34 @@
+import hashlib
+import json
+
 from fastapi import APIRouter, Depends
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Iterator, Literal, Optional
 
-from fastapi import Body, Path, Query
+from fastapi import Body, Header, Path, Query, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, StrictStr
 
+from iceberg_rest.cache import CachedMetadata
 from iceberg_rest.catalog import get_catalog
+from iceberg_rest.compression import (
+    compress,
+    encoded_etag,
+    identity_etag,
+    negotiate_encoding,
+)
 from iceberg_rest.exception import IcebergHTTPException
+from iceberg_rest.idempotency import IdempotencyKeyReusedError, request_digest
+from iceberg_rest.journal import IcebergCatalogChanges
+from iceberg_rest.maintenance import MaintenanceJob
+from iceberg_rest.metrics import CommitTimer, render_metrics, start_commit_timer
+from iceberg_rest.pagination import (
+    InvalidPageTokenError,
+    decode_page_token,
+    encode_page_token,
+)
+from iceberg_rest.patterns import parse_name_pattern
+from iceberg_rest.responses import get_response_class
+from iceberg_rest.settings import settings
 from pyiceberg.table import TableIdentifier
 from pyiceberg.table.metadata import TableMetadata
 from pyiceberg.exceptions import (
@@ -24,6 +47,7 @@ from iceberg_rest.models.request import (
     CommitTableRequest,
     CommitTransactionRequest,
     CreateNamespaceRequest,
+    ExpireSnapshotsRequest,
     CreateTableRequest,
     RegisterTableRequest,
     RenameTableRequest,
@@ -33,8 +57,11 @@ from iceberg_rest.models.response import (
     CommitTableResponse,
     CreateNamespaceResponse,
     GetNamespaceResponse,
+    CatalogChange,
+    ListChangesResponse,
     ListNamespacesResponse,
     ListTablesResponse,
+    MaintenanceJobResponse,
     UpdateNamespacePropertiesResponse,
 )
 
@@ -43,6 +70,76 @@ from pyiceberg.catalog import Catalog
 
 router = APIRouter(dependencies=[Depends(get_catalog)])
 
+# Separates the levels of a multipart namespace in path and query parameters
+NAMESPACE_SEPARATOR = "\x1f"
+
+PAGE_TOKEN_DESCRIPTION = "An opaque token from the `next-page-token` of the previous page. Send it empty to ask for the first page."
+PAGE_SIZE_DESCRIPTION = "Upper bound on the results of a page, capped by the server."
+ACCEPT_NDJSON_DESCRIPTION = "Send `application/x-ndjson` to have the whole listing streamed as one JSON value per line, as it is read from the catalog database, instead of a single JSON document. Page tokens and sizes do not apply to a streamed listing."
+NAME_PATTERN_DESCRIPTION = "Only list names matching this glob, where `*` matches any characters, `?` a single character, and `\\` makes the next character literal, e.g. `events_2024*`."
+IDEMPOTENCY_KEY_DESCRIPTION = "A unique key for the request. A retry with the same key gets the response of the request that already succeeded instead of running it again."
+
+
+def _namespace_tuple(namespace: str) -> Identifier:
+    return tuple(namespace.split(NAMESPACE_SEPARATOR))
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _wants_ndjson(accept: Optional[str]) -> bool:
+    return accept is not None and any(
+        media_range.split(";", 1)[0].strip() == NDJSON_MEDIA_TYPE
+        for media_range in accept.split(",")
+    )
+
+
+def _ndjson_response(values: Iterator[Any], chunk_size: int = 64 * 1024) -> Response:
+    # One JSON value per line, sent in chunks of about `chunk_size` bytes as the
+    # values are produced
+    def chunks() -> Iterator[bytes]:
+        chunk = bytearray()
+        for value in values:
+            chunk += json.dumps(value, separators=(",", ":")).encode()
+            chunk += b"\n"
+            if len(chunk) >= chunk_size:
+                yield bytes(chunk)
+                chunk.clear()
+        if chunk:
+            yield bytes(chunk)
+
+    return StreamingResponse(chunks(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def _run_idempotent(
+    catalog: Catalog,
+    idempotency_key: str,
+    digest: str,
+    operation: Callable[[], Optional[str]],
+) -> Optional[str]:
+    try:
+        return catalog.idempotency_keys.run(idempotency_key, digest, operation)
+    except IdempotencyKeyReusedError as e:
+        raise IcebergHTTPException(status_code=422, detail=str(e))
+
+
+def _read_result_metadata(
+    catalog: Catalog,
+    metadata_location: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> TableMetadata:
+    # A retried request is answered with the metadata file it produced, which later
+    # commits may have pruned since, see `write.metadata.delete-after-commit.enabled`
+    try:
+        return catalog.read_metadata(metadata_location).metadata
+    except FileNotFoundError:
+        raise IcebergHTTPException(
+            status_code=410,
+            detail=f"The request succeeded, but its metadata file {metadata_location} "
+            "was removed since. Load the table for its current metadata.",
+            headers=headers,
+        )
+
 
 @router.get("/reset")
 def reset(catalog: Catalog = Depends(get_catalog)):
@@ -51,6 +148,13 @@ def reset(catalog: Catalog = Depends(get_catalog)):
     return {"status": "ok"}
 
 
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # /v1/config
 @router.get(
     "/v1/config",
@@ -107,16 +211,59 @@ def list_namespaces(
         description="An optional namespace, underneath which to list namespaces. If not provided or empty, all top-level namespaces should be listed. If parent is a multipart namespace, the parts must be separated by the unit separator (&#x60;0x1F&#x60;) byte.",
         alias="parent",
     ),
+    page_token: Optional[str] = Query(
+        None,
+        alias="pageToken",
+        description=PAGE_TOKEN_DESCRIPTION,
+    ),
+    page_size: Optional[int] = Query(
+        None,
+        alias="pageSize",
+        ge=1,
+        description=PAGE_SIZE_DESCRIPTION,
+    ),
+    name_pattern: Optional[str] = Query(
+        None,
+        alias="namePattern",
+        description=NAME_PATTERN_DESCRIPTION,
+    ),
+    accept: Optional[str] = Header(None, description=ACCEPT_NDJSON_DESCRIPTION),
     catalog: Catalog = Depends(get_catalog),
 ) -> ListNamespacesResponse:
     """List all namespaces at a certain level, optionally starting from a given parent namespace. If table accounting.tax.paid.info exists, using &#39;SELECT NAMESPACE IN accounting&#39; would translate into &#x60;GET /namespaces?parent&#x3D;accounting&#x60; and must return a namespace, [\&quot;accounting\&quot;, \&quot;tax\&quot;] only. Using &#39;SELECT NAMESPACE IN accounting.tax&#39; would translate into &#x60;GET /namespaces?parent&#x3D;accounting%1Ftax&#x60; and must return a namespace, [\&quot;accounting\&quot;, \&quot;tax\&quot;, \&quot;paid\&quot;]. If &#x60;parent&#x60; is not provided, all top-level namespaces should be listed."""
+    next_page_token = None
+    parent_tuple = _namespace_tuple(parent) if parent else ()
+    pattern = parse_name_pattern(name_pattern) if name_pattern is not None else None
     try:
-        namespaces = catalog.list_namespaces(parent)
+        if _wants_ndjson(accept):
+            return _ndjson_response(
+                list(namespace)
+                for namespace in catalog.iter_namespaces(parent_tuple, pattern)
+            )
+        if page_token is None and page_size is None:
+            namespaces = catalog.list_namespaces(parent_tuple, pattern)
+        else:
+            listing = f"namespaces:{parent or ''}:{name_pattern or ''}"
+            after = decode_page_token(page_token or "", listing)
+            namespaces, has_more = catalog.list_namespaces_page(
+                parent_tuple,
+                _page_size(page_size),
+                after[0] if after else None,
+                pattern,
+            )
+            if has_more:
+                next_page_token = encode_page_token(
+                    listing, Catalog.namespace_to_string(namespaces[-1])
+                )
     except NoSuchNamespaceError:
         raise IcebergHTTPException(
-            status_code=404, detail=f"Namespace does not exist: {parent}"
+            status_code=404, detail=f"Namespace does not exist: {parent_tuple}"
         )
-    return ListNamespacesResponse(namespaces=namespaces)
+    except InvalidPageTokenError as e:
+        raise IcebergHTTPException(status_code=400, detail=str(e))
+    return ListNamespacesResponse(
+        next_page_token=next_page_token, namespaces=namespaces
+    )
 
 
 # /v1/{prefix}/namespaces/{namespace}
@@ -135,7 +282,7 @@ def load_namespace_metadata(
     catalog: Catalog = Depends(get_catalog),
 ) -> GetNamespaceResponse:
     """Return all stored metadata properties for a given namespace"""
-    namespace_tuple = (namespace,)
+    namespace_tuple = _namespace_tuple(namespace)
     try:
         properties = catalog.load_namespace_properties(namespace=namespace_tuple)
     except NoSuchNamespaceError:
@@ -159,7 +306,7 @@ def drop_namespace(
     ),
     catalog: Catalog = Depends(get_catalog),
 ) -> None:
-    namespace_tuple = (namespace,)
+    namespace_tuple = _namespace_tuple(namespace)
     try:
         catalog.drop_namespace(namespace_tuple)
     except NoSuchNamespaceError:
@@ -187,11 +334,12 @@ def namespace_exists(
     catalog: Catalog = Depends(get_catalog),
 ) -> None:
     """Check if a namespace exists. The response does not contain a body."""
+    namespace_tuple = _namespace_tuple(namespace)
     try:
-        catalog.load_namespace_properties(namespace=namespace)
+        catalog.load_namespace_properties(namespace=namespace_tuple)
     except NoSuchNamespaceError:
         raise IcebergHTTPException(
-            status_code=404, detail=f"Namespace does not exist: {namespace}"
+            status_code=404, detail=f"Namespace does not exist: {namespace_tuple}"
         )
 
 
@@ -214,7 +362,7 @@ def update_namespace_properties(
     catalog: Catalog = Depends(get_catalog),
 ) -> UpdateNamespacePropertiesResponse:
     """Set and/or remove properties on a namespace. The request body specifies a list of properties to remove and a map of key value pairs to update. Properties that are not in the request are not modified or removed by this call. Server implementations are not required to support namespace properties."""
-    namespace_tuple = (namespace,)
+    namespace_tuple = _namespace_tuple(namespace)
     try:
         summary = catalog.update_namespace_properties(
             namespace=namespace_tuple,
@@ -245,20 +393,70 @@ def list_tables(
         ...,
         description="A namespace identifier as a single string. Multipart namespace parts should be separated by the unit separator (&#x60;0x1F&#x60;) byte.",
     ),
+    page_token: Optional[str] = Query(
+        None,
+        alias="pageToken",
+        description=PAGE_TOKEN_DESCRIPTION,
+    ),
+    page_size: Optional[int] = Query(
+        None,
+        alias="pageSize",
+        ge=1,
+        description=PAGE_SIZE_DESCRIPTION,
+    ),
+    name_pattern: Optional[str] = Query(
+        None,
+        alias="namePattern",
+        description=NAME_PATTERN_DESCRIPTION,
+    ),
+    accept: Optional[str] = Header(None, description=ACCEPT_NDJSON_DESCRIPTION),
     catalog: Catalog = Depends(get_catalog),
 ) -> ListTablesResponse:
-    """Return all table identifiers under this namespace"""
+    """Return all table identifiers under this namespace, optionally only those whose name matches `namePattern`, or a page of them, by name, when `pageToken` or `pageSize` is sent. Listings are streamed as NDJSON when the client accepts `application/x-ndjson`."""
+    next_page_token = None
+    namespace_tuple = _namespace_tuple(namespace)
+    pattern = parse_name_pattern(name_pattern) if name_pattern is not None else None
     try:
-        identifiers = catalog.list_tables(namespace=namespace)
+        if _wants_ndjson(accept):
+            return _ndjson_response(
+                {"namespace": list(identifier[:-1]), "name": identifier[-1]}
+                for identifier in catalog.iter_tables(namespace_tuple, pattern)
+            )
+        if page_token is None and page_size is None:
+            identifiers, _ = catalog.list_tables_page(
+                namespace_tuple, None, pattern=pattern
+            )
+        else:
+            listing = f"tables:{namespace}:{name_pattern or ''}"
+            after = decode_page_token(page_token or "", listing)
+            identifiers, has_more = catalog.list_tables_page(
+                namespace_tuple,
+                _page_size(page_size),
+                after[0] if after else None,
+                pattern,
+            )
+            if has_more:
+                next_page_token = encode_page_token(listing, identifiers[-1][-1])
     except NoSuchNamespaceError:
         raise IcebergHTTPException(
-            status_code=404, detail=f"Namespace does not exist: {namespace}"
+            status_code=404, detail=f"Namespace does not exist: {namespace_tuple}"
         )
+    except InvalidPageTokenError as e:
+        raise IcebergHTTPException(status_code=400, detail=str(e))
     table_identifiers = [
-        TableIdentifier(namespace=[identifier[0]], name=identifier[1])
+        TableIdentifier(namespace=list(identifier[:-1]), name=identifier[-1])
         for identifier in identifiers
     ]
-    return ListTablesResponse(identifiers=table_identifiers)
+    return ListTablesResponse(
+        next_page_token=next_page_token, identifiers=table_identifiers
+    )
+
+
+def _page_size(page_size: Optional[int]) -> int:
+    return min(
+        page_size or settings.CATALOG_LIST_MAX_PAGE_SIZE,
+        settings.CATALOG_LIST_MAX_PAGE_SIZE,
+    )
 
 
 class LoadTableResult(BaseModel):
@@ -287,75 +485,102 @@ def create_table(
         description="A namespace identifier as a single string. Multipart namespace parts should be separated by the unit separator (&#x60;0x1F&#x60;) byte.",
     ),
     create_table_request: CreateTableRequest = Body(None, description=""),
+    idempotency_key: Optional[str] = Header(
+        None,
+        description=IDEMPOTENCY_KEY_DESCRIPTION,
+    ),
     catalog: Catalog = Depends(get_catalog),
 ) -> LoadTableResult:
     """Create a table or start a create transaction, like atomic CTAS.  If &#x60;stage-create&#x60; is false, the table is created immediately.  If &#x60;stage-create&#x60; is true, the table is not created, but table metadata is initialized and returned. The service should prepare as needed for a commit to the table commit endpoint to complete the create transaction. The client uses the returned metadata to begin a transaction. To commit the transaction, the client sends all create and subsequent changes to the table commit route. Changes from the table create operation include changes like AddSchemaUpdate and SetCurrentSchemaUpdate that set the initial table state."""
-    identifier = (namespace, create_table_request.name)
+    identifier = (*_namespace_tuple(namespace), create_table_request.name)
     if create_table_request.stage_create:
         return _stage_create_table(catalog, identifier, create_table_request)
     else:
-        return _create_table(catalog, identifier, create_table_request)
+        return _create_table(catalog, identifier, create_table_request, idempotency_key)
 
 
 def _stage_create_table(
     catalog: Catalog,
-    identifier: Union[str, Identifier],
+    identifier: Identifier,
     create_table_request: CreateTableRequest,
-) -> LoadTableResult:
-    try:
-        sort_order = (
-            create_table_request.write_order
-            if create_table_request.write_order is not None
-            else UNSORTED_SORT_ORDER
+) -> Response:
+    # Only build the initial metadata; nothing is written until the client commits
+    # the create transaction with an assert-create requirement
+    if catalog.table_exists(identifier):
+        raise IcebergHTTPException(
+            status_code=409, detail=f"Table already exists: {identifier}"
         )
-        tbl = catalog.create_table(
+    try:
+        staged_table = catalog._create_staged_table(
             identifier=identifier,
             schema=create_table_request.schema,
             location=create_table_request.location,
             partition_spec=create_table_request.partition_spec,
-            sort_order=sort_order,
+            sort_order=create_table_request.write_order
+            if create_table_request.write_order is not None
+            else UNSORTED_SORT_ORDER,
             properties=create_table_request.properties,
         )
-        # (TODO): temp fix, create/then remove table
-        catalog.drop_table(identifier)
-    except TableAlreadyExistsError:
+    except NoSuchNamespaceError:
         raise IcebergHTTPException(
-            status_code=409, detail=f"Table already exists: {identifier}"
+            status_code=404, detail=f"Namespace does not exist: {identifier[0]}"
         )
-    return LoadTableResult(
-        metadata_location=tbl.metadata_location,
-        metadata=tbl.metadata,
-        config=tbl.properties,
+    except ValueError as e:
+        raise IcebergHTTPException(status_code=400, detail=str(e))
+    # The metadata location stays null until the table is committed, and clients
+    # expect the key, so the body is not rendered with exclude_none
+    return get_response_class()(
+        {
+            "metadata_location": None,
+            "metadata": staged_table.metadata,
+            "config": staged_table.metadata.properties,
+        }
     )
 
 
 def _create_table(
     catalog: Catalog,
-    identifier: Union[str, Identifier],
+    identifier: Identifier,
     create_table_request: CreateTableRequest,
+    idempotency_key: Optional[str],
 ) -> LoadTableResult:
-    try:
-        sort_order = (
-            create_table_request.write_order
-            if create_table_request.write_order is not None
-            else UNSORTED_SORT_ORDER
-        )
-        tbl = catalog.create_table(
+    sort_order = (
+        create_table_request.write_order
+        if create_table_request.write_order is not None
+        else UNSORTED_SORT_ORDER
+    )
+
+    def create() -> str:
+        return catalog.create_table(
             identifier=identifier,
             schema=create_table_request.schema,
             location=create_table_request.location,
             partition_spec=create_table_request.partition_spec,
             sort_order=sort_order,
             properties=create_table_request.properties,
-        )
+        ).metadata_location
+
+    try:
+        if idempotency_key is None:
+            metadata_location = create()
+        else:
+            metadata_location = _run_idempotent(
+                catalog,
+                idempotency_key,
+                request_digest("create_table", *identifier, body=create_table_request),
+                create,
+            )
     except TableAlreadyExistsError:
         raise IcebergHTTPException(
             status_code=409, detail=f"Table already exists: {identifier}"
         )
+    except ValueError as e:
+        raise IcebergHTTPException(status_code=400, detail=str(e))
+    metadata = _read_result_metadata(catalog, metadata_location)
     return LoadTableResult(
-        metadata_location=tbl.metadata_location,
-        metadata=tbl.metadata,
-        config=tbl.properties,
+        metadata_location=metadata_location,
+        metadata=metadata,
+        config=metadata.properties,
     )
 
 
@@ -373,27 +598,47 @@ def register_table(
         description="A namespace identifier as a single string. Multipart namespace parts should be separated by the unit separator (&#x60;0x1F&#x60;) byte.",
     ),
     register_table_request: RegisterTableRequest = Body(None, description=""),
+    idempotency_key: Optional[str] = Header(
+        None,
+        description=IDEMPOTENCY_KEY_DESCRIPTION,
+    ),
     catalog: Catalog = Depends(get_catalog),
 ) -> LoadTableResult:
     """Register a table using given metadata file location."""
-    try:
-        tbl = catalog.register_table(
-            identifier=(namespace, register_table_request.name),
+    namespace_tuple = _namespace_tuple(namespace)
+    identifier = (*namespace_tuple, register_table_request.name)
+
+    def register() -> str:
+        return catalog.register_table(
+            identifier=identifier,
             metadata_location=register_table_request.metadata_location,
-        )
+        ).metadata_location
+
+    try:
+        if idempotency_key is None:
+            metadata_location = register()
+        else:
+            metadata_location = _run_idempotent(
+                catalog,
+                idempotency_key,
+                request_digest(
+                    "register_table", namespace, body=register_table_request
+                ),
+                register,
+            )
     except NoSuchNamespaceError:
         raise IcebergHTTPException(
-            status_code=404, detail=f"Namespace does not exist: {namespace}"
+            status_code=404, detail=f"Namespace does not exist: {namespace_tuple}"
         )
     except TableAlreadyExistsError:
         raise IcebergHTTPException(
-            status_code=409,
-            detail=f"Table already exists: {(namespace, register_table_request.name)}",
+            status_code=409, detail=f"Table already exists: {identifier}"
         )
+    metadata = _read_result_metadata(catalog, metadata_location)
     return LoadTableResult(
-        metadata_location=tbl.metadata_location,
-        metadata=tbl.metadata,
-        config=tbl.properties,
+        metadata_location=metadata_location,
+        metadata=metadata,
+        config=metadata.properties,
     )
 
 
@@ -411,20 +656,148 @@ def load_table(
         description="A namespace identifier as a single string. Multipart namespace parts should be separated by the unit separator (&#x60;0x1F&#x60;) byte.",
     ),
     table: str = Path(..., description="A table name"),
+    if_none_match: Optional[str] = Header(
+        None,
+        description="ETag values of metadata the client already has. The server answers with 304 Not Modified if the table has not changed since.",
+    ),
+    accept_encoding: Optional[str] = Header(
+        None,
+        description="Content-codings the client accepts for the response body, such as gzip or zstd.",
+    ),
+    snapshots: Literal["all", "refs"] = Query(
+        "all",
+        description="The snapshots to return in the body of the metadata. Setting the value to `all` would return the full set of snapshots currently valid for the table. Setting the value to `refs` would load all snapshots referenced by branches or tags.",
+        alias="snapshots",
+    ),
     catalog: Catalog = Depends(get_catalog),
 ) -> LoadTableResult:
     """Load a table from the catalog.  The response contains both configuration and table metadata. The configuration, if non-empty is used as additional configuration for the table that overrides catalog configuration. For example, this configuration may change the FileIO implementation to be used for the table.  The response also contains the table&#39;s full metadata, matching the table metadata JSON file.  The catalog configuration may contain credentials that should be used for subsequent requests for the table. The configuration key \&quot;token\&quot; is used to pass an access token to be used as a bearer token for table requests. Otherwise, a token may be passed using a RFC 8693 token type as a configuration key. For example, \&quot;urn:ietf:params:oauth:token-type:jwt&#x3D;&lt;JWT-token&gt;\&quot;."""
+    identifier = (*_namespace_tuple(namespace), table)
+    passthrough = snapshots == "all" and settings.CATALOG_METADATA_PASSTHROUGH
     try:
-        identifier = (namespace, table)
-        tbl = catalog.load_table(identifier=identifier)
+        metadata_location = catalog.load_metadata_location(identifier)
+        etag = _etag(metadata_location, snapshots)
+        if if_none_match is not None and (
+            matching_etag := _matching_etag(if_none_match, etag)
+        ):
+            return Response(status_code=304, headers={"ETag": matching_etag})
+        if passthrough:
+            entry = catalog.load_cached_metadata(identifier, metadata_location)
+        else:
+            entry = catalog.load_metadata(identifier, metadata_location)
     except NoSuchTableError:
         raise IcebergHTTPException(
             status_code=404, detail=f"Table does not exist: {identifier}"
         )
-    return LoadTableResult(
-        metadata_location=tbl.metadata_location,
-        metadata=tbl.metadata,
-        config=tbl.properties,
+    if passthrough and entry is None:
+        return _load_table_streaming(catalog, identifier, metadata_location, etag)
+    if passthrough and entry.json_bytes is not None:
+        return _load_table_passthrough(metadata_location, entry, etag, accept_encoding)
+    metadata = entry.metadata
+    if snapshots == "refs":
+        metadata = _referenced_snapshots_only(metadata)
+    return get_response_class()(
+        LoadTableResult(
+            metadata_location=metadata_location,
+            metadata=metadata,
+            config=metadata.properties,
+        ),
+        headers={"ETag": etag},
+    )
+
+
+def _load_table_result_head(metadata_location: str) -> bytes:
+    # The LoadTableResult envelope up to the metadata, which is spliced in as stored
+    return b"".join(
+        (
+            b'{"metadata_location":',
+            json.dumps(metadata_location).encode(),
+            b',"metadata":',
+        )
+    )
+
+
+def _load_table_result_tail(entry: CachedMetadata) -> bytes:
+    return b"".join(
+        (
+            b',"config":',
+            json.dumps(entry.properties, separators=(",", ":")).encode(),
+            b"}",
+        )
+    )
+
+
+def _load_table_passthrough(
+    metadata_location: str,
+    entry: CachedMetadata,
+    etag: str,
+    accept_encoding: Optional[str],
+) -> Response:
+    # Splice the stored metadata JSON into the LoadTableResult envelope as-is, skipping
+    # model validation and re-serialization
+    head = _load_table_result_head(metadata_location)
+    tail = _load_table_result_tail(entry)
+    size = len(head) + len(entry.json_bytes) + len(tail)
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None or size < settings.CATALOG_COMPRESSION_MIN_BYTES:
+        return Response(
+            content=b"".join((head, entry.json_bytes, tail)),
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+    # The body only depends on the metadata file, so it is compressed once per
+    # coding and cached with the entry; the compression middleware passes it through
+    if (body := entry.encoded_bodies.get(encoding)) is None:
+        body = compress(encoding, b"".join((head, entry.json_bytes, tail)))
+        entry.add_encoded_body(encoding, body)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={
+            "ETag": encoded_etag(etag, encoding),
+            "Content-Encoding": encoding,
+            "Vary": "Accept-Encoding",
+        },
+    )
+
+
+def _load_table_streaming(
+    catalog: Catalog, identifier: Identifier, metadata_location: str, etag: str
+) -> Response:
+    # Nothing is cached for the metadata file, so it is streamed into the response as
+    # it is read, and cached along the way. The file is opened before the response
+    # starts, so a missing file fails the request instead of cutting the body short.
+    # The config is taken from the properties of the file once it was read, so it
+    # comes last.
+    metadata_chunks = catalog.stream_metadata(identifier, metadata_location)
+
+    def chunks() -> Iterator[bytes]:
+        yield _load_table_result_head(metadata_location)
+        entry = yield from metadata_chunks
+        yield _load_table_result_tail(entry)
+
+    return StreamingResponse(
+        chunks(), media_type="application/json", headers={"ETag": etag}
+    )
+
+
+def _referenced_snapshots_only(metadata: TableMetadata) -> TableMetadata:
+    # Keep only the snapshots that branches and tags point at, and the history entries for them
+    snapshot_ids = {ref.snapshot_id for ref in metadata.refs.values()}
+    return metadata.model_copy(
+        update={
+            "snapshots": [
+                snapshot
+                for snapshot in metadata.snapshots
+                if snapshot.snapshot_id in snapshot_ids
+            ],
+            "snapshot_log": [
+                entry
+                for entry in metadata.snapshot_log
+                if entry.snapshot_id in snapshot_ids
+            ],
+            "metadata_log": [],
+        }
     )
 
 
@@ -442,24 +815,66 @@ def update_table(
     ),
     table: str = Path(..., description="A table name"),
     commit_table_request: CommitTableRequest = Body(None, description=""),
+    idempotency_key: Optional[str] = Header(
+        None,
+        description=IDEMPOTENCY_KEY_DESCRIPTION,
+    ),
+    timer: CommitTimer = Depends(start_commit_timer),
     catalog: Catalog = Depends(get_catalog),
 ) -> CommitTableResponse:
     """Commit updates to a table.  Commits have two parts, requirements and updates. Requirements are assertions that will be validated before attempting to make and commit changes. For example, &#x60;assert-ref-snapshot-id&#x60; will check that a named ref&#39;s snapshot ID has a certain value.  Updates are changes to make to table metadata. For example, after asserting that the current main ref is at the expected snapshot, a commit may add a new child snapshot and set the ref to the new snapshot id.  Create table transactions that are started by createTable with &#x60;stage-create&#x60; set to true are committed using this route. Transactions should include all changes to the table, including table initialization, like AddSchemaUpdate and SetCurrentSchemaUpdate. The &#x60;assert-create&#x60; requirement is used to ensure that the table was not created concurrently."""
+    identifier = (*_namespace_tuple(namespace), table)
     try:
         if commit_table_request.identifier is None:
             commit_table_request.identifier = TableIdentifier(
-                namespace=[namespace], name=table
+                namespace=list(identifier[:-1]), name=table
             )
-        resp = catalog._commit_table(commit_table_request)
+        with timer.measure():
+            if idempotency_key is None:
+                resp = catalog._commit_table(commit_table_request)
+            else:
+                metadata_location = _run_idempotent(
+                    catalog,
+                    idempotency_key,
+                    request_digest(
+                        "update_table", namespace, table, body=commit_table_request
+                    ),
+                    lambda: catalog._commit_table(
+                        commit_table_request
+                    ).metadata_location,
+                )
+                resp = CommitTableResponse(
+                    metadata_location=metadata_location,
+                    metadata=_read_result_metadata(
+                        catalog,
+                        metadata_location,
+                        headers={"Server-Timing": timer.server_timing()},
+                    ),
+                )
     except NoSuchTableError:
         raise IcebergHTTPException(
-            status_code=404, detail=f"Table does not exist: {(namespace, table)}"
+            status_code=404,
+            detail=f"Table does not exist: {identifier}",
+            headers={"Server-Timing": timer.server_timing()},
         )
     except CommitFailedException as e:
         raise IcebergHTTPException(
-            status_code=409, detail=f"Commit failed: {(namespace, table)}, Error: {e}"
+            status_code=409,
+            detail=f"Commit failed: {identifier}, Error: {e}",
+            headers={"Server-Timing": timer.server_timing()},
+        )
+    except ValueError as e:
+        raise IcebergHTTPException(
+            status_code=400,
+            detail=str(e),
+            headers={"Server-Timing": timer.server_timing()},
         )
-    return resp
+    return get_response_class()(
+        CommitTableResponse(
+            metadata_location=resp.metadata_location, metadata=resp.metadata
+        ),
+        headers={"Server-Timing": timer.server_timing()},
+    )
 
 
 @router.delete(
@@ -478,11 +893,12 @@ def drop_table(
     catalog: Catalog = Depends(get_catalog),
 ) -> None:
     """Remove a table from the catalog"""
+    identifier = (*_namespace_tuple(namespace), table)
     try:
-        catalog.drop_table(identifier=(namespace, table))
+        catalog.drop_table(identifier=identifier)
     except NoSuchTableError:
         raise IcebergHTTPException(
-            status_code=404, detail=f"Table does not exist: {(namespace, table)}"
+            status_code=404, detail=f"Table does not exist: {identifier}"
         )
 
 
@@ -494,6 +910,7 @@ def drop_table(
     response_model_exclude_none=True,
 )
 def table_exists(
+    response: Response,
     namespace: str = Path(
         ...,
         description="A namespace identifier as a single string. Multipart namespace parts should be separated by the unit separator (&#x60;0x1F&#x60;) byte.",
@@ -502,28 +919,234 @@ def table_exists(
     catalog: Catalog = Depends(get_catalog),
 ) -> None:
     """Check if a table exists within a given namespace. The response does not contain a body."""
+    identifier = (*_namespace_tuple(namespace), table)
     try:
-        catalog.load_table(identifier=(namespace, table))
+        metadata_location = catalog.load_metadata_location(identifier)
     except NoSuchTableError:
         raise IcebergHTTPException(
-            status_code=404, detail=f"Table does not exist: {(namespace, table)}"
+            status_code=404, detail=f"Table does not exist: {identifier}"
+        )
+    response.headers["ETag"] = _etag(metadata_location)
+
+
+@router.post(
+    "/v1/namespaces/{namespace}/tables/{table}/expire-snapshots",
+    tags=["Maintenance API"],
+    summary="Expire old snapshots of a table in the background",
+    status_code=202,
+    response_model_by_alias=True,
+    response_model_exclude_none=True,
+)
+def expire_snapshots(
+    response: Response,
+    namespace: str = Path(
+        ...,
+        description="A namespace identifier as a single string. Multipart namespace parts should be separated by the unit separator (&#x60;0x1F&#x60;) byte.",
+    ),
+    table: str = Path(..., description="A table name"),
+    expire_snapshots_request: Optional[ExpireSnapshotsRequest] = Body(
+        None, description=""
+    ),
+    catalog: Catalog = Depends(get_catalog),
+) -> MaintenanceJobResponse:
+    """Start a job that removes the snapshots older than a timestamp from the table metadata, keeping the snapshots that branches and tags point at and the most recent ancestors of the current snapshot, and then deletes the manifest lists, manifests and data files only the removed snapshots referenced. Poll the job at the returned Location for its outcome."""
+    identifier = (*_namespace_tuple(namespace), table)
+    if not catalog.table_exists(identifier):
+        raise IcebergHTTPException(
+            status_code=404, detail=f"Table does not exist: {identifier}"
+        )
+    request = expire_snapshots_request or ExpireSnapshotsRequest()
+    job = catalog.maintenance_jobs.submit(
+        "expire-snapshots",
+        identifier,
+        lambda: catalog.expire_snapshots(
+            identifier, request.older_than_ms, request.retain_last
+        ),
+    )
+    response.headers["Location"] = f"/v1/maintenance/jobs/{job.job_id}"
+    return _maintenance_job_response(job)
+
+
+@router.get(
+    "/v1/maintenance/jobs/{job_id}",
+    tags=["Maintenance API"],
+    summary="Get the status of a maintenance job",
+    response_model_by_alias=True,
+    response_model_exclude_none=True,
+)
+def get_maintenance_job(
+    job_id: str = Path(..., description="A maintenance job id"),
+    catalog: Catalog = Depends(get_catalog),
+) -> MaintenanceJobResponse:
+    """Get the status of a maintenance job started by this server and, once it finished, its result or error. Jobs are kept in memory, so they are gone after a restart."""
+    job = catalog.maintenance_jobs.get(job_id)
+    if job is None:
+        raise IcebergHTTPException(
+            status_code=404, detail=f"Maintenance job does not exist: {job_id}"
         )
+    return _maintenance_job_response(job)
+
+
+def _maintenance_job_response(job: MaintenanceJob) -> MaintenanceJobResponse:
+    response = MaintenanceJobResponse(
+        job_id=job.job_id,
+        kind=job.kind,
+        identifier=TableIdentifier(
+            namespace=list(job.identifier[:-1]), name=job.identifier[-1]
+        ),
+        status=job.status,
+        error=job.error,
+    )
+    if job.result is not None:
+        response.expired_snapshot_ids = job.result.snapshot_ids
+        response.deleted_files = job.result.deleted_files
+    return response
+
+
+@router.get(
+    "/v1/changes",
+    tags=["Changes API"],
+    summary="List the table and namespace changes made after a sequence number",
+    response_model_by_alias=True,
+    response_model_exclude_none=True,
+)
+def list_changes(
+    since: int = Query(
+        0,
+        ge=0,
+        description="Sequence number of the last change already seen; 0 lists from the start",
+    ),
+    page_size: Optional[int] = Query(
+        None,
+        alias="pageSize",
+        ge=1,
+        description="Upper bound on the changes returned, capped by the server",
+    ),
+    catalog: Catalog = Depends(get_catalog),
+) -> ListChangesResponse:
+    """List the creates, registrations, commits, renames and drops of tables, and the creates, property updates and drops of namespaces, in the catalog after the change with sequence number `since`, oldest first. Send the returned `next_since` as `since` to get the next page; a page with fewer changes than asked for means the feed is caught up for now. Changes become visible in sequence number order, so resuming from `next_since` never skips a change."""
+    limit = min(
+        page_size or settings.CATALOG_CHANGES_MAX_PAGE_SIZE,
+        settings.CATALOG_CHANGES_MAX_PAGE_SIZE,
+    )
+    changes = [_catalog_change(change) for change in catalog.list_changes(since, limit)]
+    return ListChangesResponse(
+        changes=changes,
+        next_since=changes[-1].sequence_number if changes else since,
+    )
+
+
+def _catalog_change(change: IcebergCatalogChanges) -> CatalogChange:
+    namespace = list(Catalog.identifier_to_tuple(change.table_namespace))
+    if change.table_name is None:
+        return CatalogChange(
+            sequence_number=change.sequence_number,
+            operation=change.operation,
+            namespace=namespace,
+            timestamp_ms=change.timestamp_ms,
+        )
+    source = None
+    if change.source_name is not None:
+        source = TableIdentifier(
+            namespace=list(Catalog.identifier_to_tuple(change.source_namespace)),
+            name=change.source_name,
+        )
+    return CatalogChange(
+        sequence_number=change.sequence_number,
+        operation=change.operation,
+        identifier=TableIdentifier(namespace=namespace, name=change.table_name),
+        metadata_location=change.metadata_location,
+        previous_metadata_location=change.previous_metadata_location,
+        source=source,
+        timestamp_ms=change.timestamp_ms,
+    )
+
+
+def _etag(metadata_location: str, snapshots: str = "all") -> str:
+    # Metadata files are immutable, so the metadata location identifies the table state
+    if snapshots != "all":
+        metadata_location = f"{metadata_location}?snapshots={snapshots}"
+    return f'"{hashlib.sha256(metadata_location.encode()).hexdigest()}"'
+
+
+def _matching_etag(if_none_match: str, etag: str) -> Optional[str]:
+    # If-None-Match uses the weak comparison function, so W/ prefixes are ignored. The
+    # ETags of compressed bodies match as well, and the one that matched is returned
+    # for the 304, so a client keeps the validator of the body it has.
+    for candidate in (candidate.strip() for candidate in if_none_match.split(",")):
+        if candidate == "*":
+            return etag
+        candidate = candidate.removeprefix("W/")
+        if identity_etag(candidate) == etag:
+            return candidate
+    return None
 
 
 # /v1/{prefix}/transactions/commit
 @router.post(
-    "/v1/{prefix}/transactions/commit",
+    "/v1/transactions/commit",
     tags=["Catalog API"],
     summary="Commit updates to multiple tables in an atomic operation",
     response_model_by_alias=True,
     response_model_exclude_none=True,
 )
 def commit_transaction(
+    response: Response,
     commit_transaction_request: CommitTransactionRequest = Body(
         None,
         description="Commit updates to multiple tables in an atomic operation  A commit for a single table consists of a table identifier with requirements and updates. Requirements are assertions that will be validated before attempting to make and commit changes. For example, &#x60;assert-ref-snapshot-id&#x60; will check that a named ref&#39;s snapshot ID has a certain value.  Updates are changes to make to table metadata. For example, after asserting that the current main ref is at the expected snapshot, a commit may add a new child snapshot and set the ref to the new snapshot id.",
     ),
-) -> None: ...
+    idempotency_key: Optional[str] = Header(
+        None,
+        description=IDEMPOTENCY_KEY_DESCRIPTION,
+    ),
+    timer: CommitTimer = Depends(start_commit_timer),
+    catalog: Catalog = Depends(get_catalog),
+) -> None:
+    """Commit updates to multiple tables in an atomic operation. Either all tables move to their new metadata, or none of them do."""
+    table_changes = commit_transaction_request.table_changes
+    if any(table_change.identifier is None for table_change in table_changes):
+        raise IcebergHTTPException(
+            status_code=400,
+            detail="Every table change in a transaction must have an identifier",
+        )
+
+    def commit() -> None:
+        # A transaction has no single metadata location to replay
+        catalog.commit_tables(table_changes)
+
+    try:
+        with timer.measure():
+            if idempotency_key is None:
+                commit()
+            else:
+                _run_idempotent(
+                    catalog,
+                    idempotency_key,
+                    request_digest(
+                        "commit_transaction", body=commit_transaction_request
+                    ),
+                    commit,
+                )
+    except ValueError as e:
+        raise IcebergHTTPException(
+            status_code=400,
+            detail=str(e),
+            headers={"Server-Timing": timer.server_timing()},
+        )
+    except NoSuchTableError as e:
+        raise IcebergHTTPException(
+            status_code=404,
+            detail=str(e),
+            headers={"Server-Timing": timer.server_timing()},
+        )
+    except (CommitFailedException, TableAlreadyExistsError) as e:
+        raise IcebergHTTPException(
+            status_code=409,
+            detail=f"Commit failed, Error: {e}",
+            headers={"Server-Timing": timer.server_timing()},
+        )
+    response.headers["Server-Timing"] = timer.server_timing()
 
 
 # /v1/{prefix}/tables/rename
@@ -543,18 +1166,19 @@ def rename_table(
 ) -> None:
     """Rename a table from one identifier to another. It&#39;s valid to move a table across namespaces, but the server implementation is not required to support it."""
     source = (
-        ".".join(rename_table_request.source.namespace.root),
+        *rename_table_request.source.namespace.root,
         rename_table_request.source.name,
     )
     destination = (
-        ".".join(rename_table_request.destination.namespace.root),
+        *rename_table_request.destination.namespace.root,
         rename_table_request.destination.name,
     )
     try:
         catalog.rename_table(source, destination)
     except NoSuchNamespaceError:
         raise IcebergHTTPException(
-            status_code=404, detail=f"Namespace does not exist: {source}"
+            status_code=404,
+            detail=f"Namespace does not exist: {destination[:-1]}",
         )
     except NoSuchTableError:
         raise IcebergHTTPException(
@@ -603,7 +1227,7 @@ def list_views(
 ) -> ListTablesResponse:
     # (TODO): implement this!
     """Return all view identifiers under this namespace"""
-    namespace_tuple = (namespace,)
+    namespace_tuple = _namespace_tuple(namespace)
     raise IcebergHTTPException(
         status_code=404, detail=f"Namespace does not exist: {namespace_tuple}"
     )
@@ -625,7 +1249,7 @@ def load_view(
     view: str = Path(..., description="A view name"),
 ) -> None:
     # (TODO): implement this! should return LoadViewResult
-    namespace_tuple = (namespace,)
+    namespace_tuple = _namespace_tuple(namespace)
     """Load a view from the catalog.  The response contains both configuration and view metadata. The configuration, if non-empty is used as additional configuration for the view that overrides catalog configuration.  The response also contains the view&#39;s full metadata, matching the view metadata JSON file.  The catalog configuration may contain credentials that should be used for subsequent requests for the view. The configuration key \&quot;token\&quot; is used to pass an access token to be used as a bearer token for view requests. Otherwise, a token may be passed using a RFC 8693 token type as a configuration key. For example, \&quot;urn:ietf:params:oauth:token-type:jwt&#x3D;&lt;JWT-token&gt;\&quot;."""
     raise IcebergHTTPException(
         status_code=404, detail=f"Namespace does not exist: {namespace_tuple}"
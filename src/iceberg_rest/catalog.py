@@ -1,5 +1,1471 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from iceberg_rest.cache import (
+    PARSED_METADATA_WEIGHT,
+    CachedMetadata,
+    MetadataCache,
+    MissingTables,
+)
+from iceberg_rest.collation import collate, create_name_indexes, name_collation
+from iceberg_rest.concurrency import GroupCommitQueue, KeyedLock, SingleFlight
+from iceberg_rest.group_commit import (
+    group_commit_enabled,
+    is_fast_append,
+    rebase_fast_append,
+)
+from iceberg_rest.idempotency import IcebergIdempotencyKeys, IdempotencyKeys
+from iceberg_rest.journal import (
+    COMMIT_TABLE,
+    CREATE_NAMESPACE,
+    CREATE_TABLE,
+    DROP_NAMESPACE,
+    DROP_TABLE,
+    REGISTER_TABLE,
+    RENAME_TABLE,
+    UPDATE_NAMESPACE_PROPERTIES,
+    IcebergCatalogChanges,
+    IcebergChangeSequences,
+    create_sequence,
+    list_changes,
+    record_change,
+)
+from iceberg_rest.maintenance import (
+    ExpiredSnapshots,
+    MaintenanceJobs,
+    MetadataPruner,
+    add_previous_metadata,
+    delete_unreachable_files,
+    remove_snapshots,
+    snapshots_to_expire,
+)
+from iceberg_rest.metrics import commit_phase
+from iceberg_rest.patterns import NamePattern, name_conditions
 from iceberg_rest.settings import settings
-from pyiceberg.catalog.sql import SqlCatalog
+from pyiceberg.catalog import METADATA_LOCATION, PropertiesUpdateSummary
+from pyiceberg.catalog import Catalog as BaseCatalog
+from pyiceberg.catalog.sql import IcebergNamespaceProperties, IcebergTables, SqlCatalog
+from pyiceberg.exceptions import (
+    CommitFailedException,
+    NamespaceAlreadyExistsError,
+    NamespaceNotEmptyError,
+    NoSuchNamespaceError,
+    NoSuchTableError,
+    TableAlreadyExistsError,
+)
+from pyiceberg.io import FileIO, InputStream, load_file_io
+from pyiceberg.partitioning import UNPARTITIONED_PARTITION_SPEC, PartitionSpec
+from pyiceberg.schema import Schema
+from pyiceberg.serializers import Compressor
+from pyiceberg.table import (
+    AddPartitionSpecUpdate,
+    AddSchemaUpdate,
+    AddSortOrderUpdate,
+    CommitTableRequest,
+    CommitTableResponse,
+    StagedTable,
+    Table,
+    TableUpdate,
+    update_table_metadata,
+)
+from pyiceberg.table.metadata import TableMetadata, new_table_metadata
+from pyiceberg.table.sorting import UNSORTED_SORT_ORDER, SortOrder
+from pyiceberg.typedef import EMPTY_DICT, UTF8, Identifier, Properties
+from pyiceberg.utils.config import Config
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    delete,
+    insert,
+    select,
+    union,
+    update,
+)
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Table property that selects the codec of new metadata files, "none" or "gzip"
+METADATA_COMPRESSION_CODEC = "write.metadata.compression-codec"
+
+
+# Namespaces read per index seek while listing the children of a namespace
+_NAMESPACE_SEEK_ROWS = 100
+
+
+class MetadataLocationMovedError(CommitFailedException):
+    """Raised when a concurrent commit moved the metadata location of a table being committed."""
+
+
+def _commit_backoff_seconds(attempt: int) -> float:
+    # Exponential backoff with full jitter, so concurrent committers spread out
+    wait_ms = min(
+        settings.CATALOG_COMMIT_RETRY_MIN_WAIT_MS * 2 ** (attempt - 1),
+        settings.CATALOG_COMMIT_RETRY_MAX_WAIT_MS,
+    )
+    return random.uniform(0, wait_ms) / 1000
+
+
+def _initial_changes(updates: List[TableUpdate]) -> List[TableUpdate]:
+    # `initial_change` is not serialized, so the updates of a create transaction arrive
+    # without it. The first schema, spec and sort order replace the placeholders of the
+    # empty metadata they are applied to, instead of being added next to them.
+    initial_types = {AddSchemaUpdate, AddPartitionSpecUpdate, AddSortOrderUpdate}
+    changes = []
+    for table_update in updates:
+        if type(table_update) in initial_types:
+            initial_types.remove(type(table_update))
+            table_update = table_update.model_copy(update={"initial_change": True})
+        changes.append(table_update)
+    return changes
+
+
+def _delete_uncommitted_file(io: FileIO, location: str) -> None:
+    try:
+        io.delete(location)
+    except Exception:
+        logger.warning("Failed to delete uncommitted file %s", location, exc_info=True)
+
+
+class RestSqlCatalog(SqlCatalog):
+    """
+    SqlCatalog used by the REST server.
+
+    Table metadata is kept in an in-process `MetadataCache`, so loading a table whose
+    metadata location has not moved costs a single catalog lookup and no read from
+    the warehouse. Concurrent loads of the same table share that lookup, and
+    concurrent reads of the same metadata file share a single read. Tables that were
+    just looked up and not found are remembered for a short while in `MissingTables`.
+    """
+
+    def __init__(self, name: str, **properties: str):
+        self.metadata_cache = MetadataCache(
+            max_bytes=settings.CATALOG_METADATA_CACHE_MAX_BYTES
+        )
+        self.missing_tables = MissingTables(
+            ttl_seconds=settings.CATALOG_MISSING_TABLE_TTL_SECONDS
+        )
+        self._location_lookups = SingleFlight()
+        self._metadata_reads = SingleFlight()
+        self._commit_locks = KeyedLock()
+        self._group_commits: GroupCommitQueue[
+            CommitTableRequest, CommitTableResponse
+        ] = GroupCommitQueue()
+        self.metadata_pruner = MetadataPruner(
+            max_workers=settings.CATALOG_MAINTENANCE_MAX_WORKERS
+        )
+        self.maintenance_jobs = MaintenanceJobs(
+            max_workers=settings.CATALOG_MAINTENANCE_MAX_JOBS
+        )
+        super().__init__(name, **properties)
+        self.idempotency_keys = IdempotencyKeys(
+            self.engine, name, ttl_seconds=settings.CATALOG_IDEMPOTENCY_KEY_TTL_SECONDS
+        )
+
+    def _ensure_tables_exist(self) -> None:
+        super()._ensure_tables_exist()
+        # Catalog databases created before idempotency keys and the change journal were
+        # recorded lack their tables
+        IcebergIdempotencyKeys.__table__.create(self.engine, checkfirst=True)
+        IcebergCatalogChanges.__table__.create(self.engine, checkfirst=True)
+        IcebergChangeSequences.__table__.create(self.engine, checkfirst=True)
+        create_sequence(self.engine, self.name)
+        self._prepare_name_lookups()
+
+    def create_tables(self) -> None:
+        super().create_tables()
+        create_sequence(self.engine, self.name)
+        self._prepare_name_lookups()
+
+    def _prepare_name_lookups(self) -> None:
+        # Ranges over names need the columns compared by code point, see
+        # `name_collation`, and indexes under that collation if it is not theirs
+        self.name_collation = name_collation(self.engine)
+        create_name_indexes(self.engine, self.name_collation)
+
+    def destroy_tables(self) -> None:
+        super().destroy_tables()
+        self.metadata_cache.clear()
+        self.missing_tables.clear()
+
+    def identifier_to_tuple_without_catalog(
+        self, identifier: Union[str, Identifier]
+    ) -> Identifier:
+        # Identifiers sent to the server never start with the catalog name, so a
+        # namespace whose first level is named like the catalog is kept as is
+        return BaseCatalog.identifier_to_tuple(identifier)
+
+    def table_exists(self, identifier: Union[str, Identifier]) -> bool:
+        try:
+            self.load_metadata_location(identifier)
+            return True
+        except NoSuchTableError:
+            return False
+
+    def load_metadata_location(self, identifier: Union[str, Identifier]) -> str:
+        """Return the current metadata location of a table without reading its metadata.
+
+        Raises:
+            NoSuchTableError: If a table with the name does not exist.
+        """
+        identifier_tuple = self.identifier_to_tuple_without_catalog(identifier)
+        if identifier_tuple in self.missing_tables:
+            raise NoSuchTableError(
+                f"Table does not exist: {'.'.join(identifier_tuple)}"
+            )
+        return self._location_lookups.do(
+            identifier_tuple, lambda: self._select_metadata_location(identifier_tuple)
+        )
+
+    def _select_metadata_location(self, identifier: Identifier) -> str:
+        namespace = BaseCatalog.namespace_to_string(
+            BaseCatalog.namespace_from(identifier), NoSuchTableError
+        )
+        table_name = BaseCatalog.table_name_from(identifier)
+        stmt = select(IcebergTables.metadata_location).where(
+            IcebergTables.catalog_name == self.name,
+            IcebergTables.table_namespace == namespace,
+            IcebergTables.table_name == table_name,
+        )
+        generation = self.missing_tables.generation
+        with Session(self.engine) as session:
+            metadata_location = session.scalar(stmt)
+        if not metadata_location:
+            self.missing_tables.add(identifier, generation)
+            raise NoSuchTableError(f"Table does not exist: {namespace}.{table_name}")
+        return metadata_location
+
+    def _convert_orm_to_iceberg(self, orm_table: IcebergTables) -> Table:
+        # Check for expected properties.
+        if not (metadata_location := orm_table.metadata_location):
+            raise NoSuchTableError(f"Table property {METADATA_LOCATION} is missing")
+        if not (table_namespace := orm_table.table_namespace):
+            raise NoSuchTableError(
+                f"Table property {IcebergTables.table_namespace} is missing"
+            )
+        if not (table_name := orm_table.table_name):
+            raise NoSuchTableError(
+                f"Table property {IcebergTables.table_name} is missing"
+            )
+
+        identifier = BaseCatalog.identifier_to_tuple(table_namespace) + (table_name,)
+        metadata = self.load_metadata(identifier, metadata_location).metadata
+        return Table(
+            identifier=(self.name,) + identifier,
+            metadata=metadata,
+            metadata_location=metadata_location,
+            io=self._load_file_io(metadata.properties, metadata_location),
+            catalog=self,
+        )
+
+    def load_metadata(
+        self, identifier: Union[str, Identifier], metadata_location: str
+    ) -> CachedMetadata:
+        """Return the metadata file of a table at `metadata_location`, from the cache if possible."""
+        entry = self._read_metadata(metadata_location)
+        self.metadata_cache.bind(
+            self.identifier_to_tuple_without_catalog(identifier), metadata_location
+        )
+        return entry
+
+    def read_metadata(self, metadata_location: str) -> CachedMetadata:
+        """Return the metadata file at `metadata_location`, from the cache if possible,
+        without making it the current metadata of a table."""
+        return self._read_metadata(metadata_location)
+
+    def load_cached_metadata(
+        self, identifier: Union[str, Identifier], metadata_location: str
+    ) -> Optional[CachedMetadata]:
+        """Return the metadata file of a table at `metadata_location` if it is cached,
+        without reading it from the warehouse otherwise."""
+        if (entry := self.metadata_cache.get(metadata_location)) is not None:
+            self.metadata_cache.bind(
+                self.identifier_to_tuple_without_catalog(identifier), metadata_location
+            )
+        return entry
+
+    def stream_metadata(
+        self,
+        identifier: Union[str, Identifier],
+        metadata_location: str,
+        chunk_size: int = 1024 * 1024,
+    ) -> Generator[bytes, None, CachedMetadata]:
+        """Stream the serialized JSON of a metadata file straight from the warehouse.
+
+        The file is opened and its first chunk read before this returns, so a missing
+        or unreadable file raises here rather than once a response is under way. The
+        chunks are kept as they are streamed, and once the file is read it is cached
+        like `load_metadata` would. The entry is the return value of the generator, so
+        a file is read once however large, but it is held in memory in full.
+        """
+        io = load_file_io(properties=self.properties, location=metadata_location)
+        compressor = Compressor.get_compressor(location=metadata_location)
+        input_stream = io.new_input(metadata_location).open()
+        try:
+            json_stream = compressor.stream_decompressor(input_stream)
+            first_chunk = json_stream.read(chunk_size)
+        except BaseException:
+            input_stream.close()
+            raise
+        return self._stream_metadata_chunks(
+            identifier,
+            metadata_location,
+            input_stream,
+            json_stream,
+            first_chunk,
+            chunk_size,
+        )
+
+    def _stream_metadata_chunks(
+        self,
+        identifier: Union[str, Identifier],
+        metadata_location: str,
+        input_stream: InputStream,
+        json_stream: InputStream,
+        chunk: bytes,
+        chunk_size: int,
+    ) -> Generator[bytes, None, CachedMetadata]:
+        chunks = []
+        with input_stream:
+            while chunk:
+                chunks.append(chunk)
+                yield chunk
+                chunk = json_stream.read(chunk_size)
+        entry = self._cache_metadata_file(metadata_location, b"".join(chunks))
+        self.metadata_cache.bind(
+            self.identifier_to_tuple_without_catalog(identifier), metadata_location
+        )
+        return entry
+
+    def _read_metadata(self, metadata_location: str) -> CachedMetadata:
+        if (entry := self.metadata_cache.get(metadata_location)) is not None:
+            return entry
+        return self._metadata_reads.do(
+            metadata_location, lambda: self._read_metadata_file(metadata_location)
+        )
+
+    def _read_metadata_file(self, metadata_location: str) -> CachedMetadata:
+        io = load_file_io(properties=self.properties, location=metadata_location)
+        compressor = Compressor.get_compressor(location=metadata_location)
+        with io.new_input(metadata_location).open() as input_stream:
+            json_bytes = compressor.stream_decompressor(input_stream).read()
+        return self._cache_metadata_file(metadata_location, json_bytes)
+
+    def _cache_metadata_file(
+        self, metadata_location: str, json_bytes: bytes
+    ) -> CachedMetadata:
+        entry = CachedMetadata(len(json_bytes), json_bytes=json_bytes)
+        if self._holds_json_bytes(entry.size):
+            self.metadata_cache.put(metadata_location, entry)
+            return entry
+        if not self.metadata_cache.holds(entry.size * PARSED_METADATA_WEIGHT):
+            # Not even the parsed metadata would be cached, so it is left to whoever
+            # needs the model to parse it
+            return entry
+        entry = CachedMetadata(entry.size, metadata=entry.metadata)
+        self.metadata_cache.put(metadata_location, entry)
+        return entry
+
+    def _write_metadata(
+        self, metadata: TableMetadata, io: FileIO, metadata_path: str
+    ) -> None:
+        # Same serialization as `ToOutputFile.table_metadata`, but the new metadata is
+        # cached as well, so the first load after a create or commit is served from memory.
+        exclude_none = not Config().get_bool("legacy-current-snapshot-id")
+        json_bytes = metadata.model_dump_json(exclude_none=exclude_none).encode(UTF8)
+        compressor = Compressor.get_compressor(location=metadata_path)
+        with io.new_output(metadata_path).create(overwrite=False) as output_stream:
+            output_stream.write(compressor.bytes_compressor()(json_bytes))
+        self.metadata_cache.put(
+            metadata_path,
+            CachedMetadata(
+                len(json_bytes),
+                json_bytes=json_bytes
+                if self._holds_json_bytes(len(json_bytes))
+                else None,
+                metadata=metadata,
+            ),
+        )
+
+    @staticmethod
+    def _holds_json_bytes(size: int) -> bool:
+        return (
+            settings.CATALOG_METADATA_PASSTHROUGH
+            and size <= settings.CATALOG_METADATA_PASSTHROUGH_MAX_BYTES
+        )
+
+    def _new_metadata_location(self, metadata: TableMetadata, new_version: int) -> str:
+        """Return the location of a new metadata file, compressed as the table asks.
+
+        Raises:
+            ValueError: If the table sets an unsupported metadata compression codec.
+        """
+        metadata_location = self._get_metadata_location(metadata.location, new_version)
+        codec = metadata.properties.get(
+            METADATA_COMPRESSION_CODEC, settings.CATALOG_METADATA_COMPRESSION_CODEC
+        ).lower()
+        if codec == "gzip":
+            # Readers pick the decompressor from this suffix, see `Compressor.get_compressor`
+            return (
+                metadata_location.removesuffix(".metadata.json") + ".gz.metadata.json"
+            )
+        if codec != "none":
+            raise ValueError(f"Unsupported metadata compression codec: {codec}")
+        return metadata_location
+
+    def create_table(
+        self,
+        identifier: Union[str, Identifier],
+        schema: Union[Schema, "pa.Schema"],
+        location: Optional[str] = None,
+        partition_spec: PartitionSpec = UNPARTITIONED_PARTITION_SPEC,
+        sort_order: SortOrder = UNSORTED_SORT_ORDER,
+        properties: Properties = EMPTY_DICT,
+    ) -> Table:
+        staged_table = self._create_staged_table(
+            identifier, schema, location, partition_spec, sort_order, properties
+        )
+        self._commit_staged_tables(
+            [self.identifier_to_tuple_without_catalog(identifier)],
+            [None],
+            [staged_table],
+        )
+        return self.load_table(identifier)
+
+    def _create_staged_table(
+        self,
+        identifier: Union[str, Identifier],
+        schema: Union[Schema, "pa.Schema"],
+        location: Optional[str] = None,
+        partition_spec: PartitionSpec = UNPARTITIONED_PARTITION_SPEC,
+        sort_order: SortOrder = UNSORTED_SORT_ORDER,
+        properties: Properties = EMPTY_DICT,
+    ) -> StagedTable:
+        # Same as `SqlCatalog.create_table` up to writing the metadata, with the
+        # metadata file named after the table's compression codec
+        schema: Schema = self._convert_schema_if_needed(schema)  # type: ignore
+        identifier_nocatalog = self.identifier_to_tuple_without_catalog(identifier)
+        namespace_identifier = BaseCatalog.namespace_from(identifier_nocatalog)
+        table_name = BaseCatalog.table_name_from(identifier_nocatalog)
+        if not self._namespace_exists(namespace_identifier):
+            raise NoSuchNamespaceError(
+                f"Namespace does not exist: {namespace_identifier}"
+            )
+
+        location = self._resolve_table_location(
+            location, BaseCatalog.namespace_to_string(namespace_identifier), table_name
+        )
+        metadata = new_table_metadata(
+            location=location,
+            schema=schema,
+            partition_spec=partition_spec,
+            sort_order=sort_order,
+            properties=properties,
+        )
+        metadata_location = self._new_metadata_location(metadata, 0)
+        return StagedTable(
+            identifier=(self.name,) + identifier_nocatalog,
+            metadata=metadata,
+            metadata_location=metadata_location,
+            io=self._load_file_io(properties=properties, location=metadata_location),
+            catalog=self,
+        )
+
+    def register_table(
+        self, identifier: Union[str, Identifier], metadata_location: str
+    ) -> Table:
+        # Same as `SqlCatalog.register_table`, journaled in the same transaction
+        identifier_tuple = self.identifier_to_tuple_without_catalog(identifier)
+        namespace = BaseCatalog.namespace_to_string(
+            BaseCatalog.namespace_from(identifier_tuple)
+        )
+        table_name = BaseCatalog.table_name_from(identifier_tuple)
+        if not self._namespace_exists(namespace):
+            raise NoSuchNamespaceError(f"Namespace does not exist: {namespace}")
+        with Session(self.engine) as session:
+            self._swap_metadata_location(
+                session, identifier_tuple, None, metadata_location
+            )
+            record_change(
+                session,
+                self.name,
+                REGISTER_TABLE,
+                namespace,
+                table_name,
+                metadata_location,
+            )
+            session.commit()
+        self._location_lookups.forget(identifier_tuple)
+        self.missing_tables.discard(identifier_tuple)
+        return self.load_table(identifier_tuple)
+
+    def drop_table(self, identifier: Union[str, Identifier]) -> None:
+        # Same as `SqlCatalog.drop_table`, journaled in the same transaction
+        identifier_tuple = self.identifier_to_tuple_without_catalog(identifier)
+        namespace = BaseCatalog.namespace_to_string(
+            BaseCatalog.namespace_from(identifier_tuple)
+        )
+        table_name = BaseCatalog.table_name_from(identifier_tuple)
+        with Session(self.engine) as session:
+            tbl = self._select_table_for_update(session, namespace, table_name)
+            session.delete(tbl)
+            record_change(
+                session,
+                self.name,
+                DROP_TABLE,
+                namespace,
+                table_name,
+                None,
+                previous_metadata_location=tbl.metadata_location,
+            )
+            session.commit()
+        self._location_lookups.forget(identifier_tuple)
+        self.metadata_cache.invalidate(identifier_tuple)
+
+    def rename_table(
+        self,
+        from_identifier: Union[str, Identifier],
+        to_identifier: Union[str, Identifier],
+    ) -> Table:
+        # Same as `SqlCatalog.rename_table`, journaled in the same transaction
+        from_identifier_tuple = self.identifier_to_tuple_without_catalog(
+            from_identifier
+        )
+        to_identifier_tuple = self.identifier_to_tuple_without_catalog(to_identifier)
+        from_namespace = BaseCatalog.namespace_to_string(
+            BaseCatalog.namespace_from(from_identifier_tuple)
+        )
+        from_table_name = BaseCatalog.table_name_from(from_identifier_tuple)
+        to_namespace = BaseCatalog.namespace_to_string(
+            BaseCatalog.namespace_from(to_identifier_tuple)
+        )
+        to_table_name = BaseCatalog.table_name_from(to_identifier_tuple)
+        if not self._namespace_exists(to_namespace):
+            raise NoSuchNamespaceError(f"Namespace does not exist: {to_namespace}")
+        with Session(self.engine) as session:
+            tbl = self._select_table_for_update(
+                session, from_namespace, from_table_name
+            )
+            tbl.table_namespace = to_namespace
+            tbl.table_name = to_table_name
+            record_change(
+                session,
+                self.name,
+                RENAME_TABLE,
+                to_namespace,
+                to_table_name,
+                tbl.metadata_location,
+                source_namespace=from_namespace,
+                source_name=from_table_name,
+            )
+            try:
+                session.commit()
+            except IntegrityError as e:
+                raise TableAlreadyExistsError(
+                    f"Table {to_namespace}.{to_table_name} already exists"
+                ) from e
+        self._location_lookups.forget(from_identifier_tuple)
+        self._location_lookups.forget(to_identifier_tuple)
+        # The metadata file does not move, so the cached entry stays valid for the new name.
+        self.metadata_cache.forget(from_identifier_tuple)
+        self.missing_tables.discard(to_identifier_tuple)
+        return self.load_table(to_identifier_tuple)
+
+    def _select_table_for_update(
+        self, session: Session, namespace: str, table_name: str
+    ) -> IcebergTables:
+        tbl = (
+            session.query(IcebergTables)
+            .with_for_update(of=IcebergTables)
+            .filter(
+                IcebergTables.catalog_name == self.name,
+                IcebergTables.table_namespace == namespace,
+                IcebergTables.table_name == table_name,
+            )
+            .one_or_none()
+        )
+        if tbl is None:
+            raise NoSuchTableError(f"Table does not exist: {namespace}.{table_name}")
+        return tbl
+
+    def create_namespace(
+        self, namespace: Union[str, Identifier], properties: Properties = EMPTY_DICT
+    ) -> None:
+        # Same as `SqlCatalog.create_namespace`, journaled in the same transaction
+        if self._namespace_exists(namespace):
+            raise NamespaceAlreadyExistsError(f"Namespace {namespace} already exists")
+        namespace_str = BaseCatalog.namespace_to_string(namespace, NoSuchNamespaceError)
+        with Session(self.engine) as session:
+            for key, value in (
+                properties or IcebergNamespaceProperties.NAMESPACE_MINIMAL_PROPERTIES
+            ).items():
+                session.add(
+                    IcebergNamespaceProperties(
+                        catalog_name=self.name,
+                        namespace=namespace_str,
+                        property_key=key,
+                        property_value=value,
+                    )
+                )
+            record_change(session, self.name, CREATE_NAMESPACE, namespace_str)
+            session.commit()
+
+    def drop_namespace(self, namespace: Union[str, Identifier]) -> None:
+        # Same as `SqlCatalog.drop_namespace`, journaled in the same transaction
+        if not self._namespace_exists(namespace):
+            raise NoSuchNamespaceError(f"Namespace does not exist: {namespace}")
+        namespace_str = BaseCatalog.namespace_to_string(namespace)
+        if tables := self.list_tables(namespace):
+            raise NamespaceNotEmptyError(
+                f"Namespace {namespace_str} is not empty. {len(tables)} tables exist."
+            )
+        if (child := next(self._child_namespaces(namespace_str), None)) is not None:
+            raise NamespaceNotEmptyError(
+                f"Namespace {namespace_str} is not empty. Namespace {child} exists."
+            )
+        with Session(self.engine) as session:
+            session.execute(
+                delete(IcebergNamespaceProperties).where(
+                    IcebergNamespaceProperties.catalog_name == self.name,
+                    IcebergNamespaceProperties.namespace == namespace_str,
+                )
+            )
+            record_change(session, self.name, DROP_NAMESPACE, namespace_str)
+            session.commit()
+
+    def update_namespace_properties(
+        self,
+        namespace: Union[str, Identifier],
+        removals: Optional[Set[str]] = None,
+        updates: Properties = EMPTY_DICT,
+    ) -> PropertiesUpdateSummary:
+        # Same as `SqlCatalog.update_namespace_properties`, journaled in the same
+        # transaction
+        namespace_str = BaseCatalog.namespace_to_string(namespace)
+        if not self._namespace_exists(namespace):
+            raise NoSuchNamespaceError(f"Namespace {namespace_str} does not exists")
+        current_properties = self.load_namespace_properties(namespace=namespace)
+        properties_update_summary = self._get_updated_props_and_update_summary(
+            current_properties=current_properties, removals=removals, updates=updates
+        )[0]
+        with Session(self.engine) as session:
+            # Updated keys are deleted and inserted again, as there is no portable upsert
+            deleted_keys = set(removals or ()) | set(updates)
+            if deleted_keys:
+                session.execute(
+                    delete(IcebergNamespaceProperties).where(
+                        IcebergNamespaceProperties.catalog_name == self.name,
+                        IcebergNamespaceProperties.namespace == namespace_str,
+                        IcebergNamespaceProperties.property_key.in_(deleted_keys),
+                    )
+                )
+            if updates:
+                session.execute(
+                    insert(IcebergNamespaceProperties).values(
+                        [
+                            {
+                                IcebergNamespaceProperties.catalog_name: self.name,
+                                IcebergNamespaceProperties.namespace: namespace_str,
+                                IcebergNamespaceProperties.property_key: key,
+                                IcebergNamespaceProperties.property_value: value,
+                            }
+                            for key, value in updates.items()
+                        ]
+                    )
+                )
+            record_change(
+                session, self.name, UPDATE_NAMESPACE_PROPERTIES, namespace_str
+            )
+            session.commit()
+        return properties_update_summary
+
+    def list_tables_page(
+        self,
+        namespace: Union[str, Identifier],
+        page_size: Optional[int],
+        after: Optional[str] = None,
+        pattern: Optional[NamePattern] = None,
+    ) -> Tuple[List[Identifier], bool]:
+        """Return up to `page_size` tables of a namespace whose name sorts after `after`
+        and matches `pattern`, by name, and whether more tables follow. Without a page
+        size, every such table is returned.
+
+        The page is a range seek on the primary key of the tables table, so it costs
+        the same however deep into the namespace it starts. The literal prefix of the
+        pattern narrows that range, see `name_conditions`.
+
+        Raises:
+            NoSuchNamespaceError: If a namespace with the given name does not exist.
+        """
+        if not self._namespace_exists(namespace):
+            raise NoSuchNamespaceError(f"Namespace does not exist: {namespace}")
+        namespace_str = BaseCatalog.namespace_to_string(namespace)
+        stmt = (
+            select(IcebergTables.table_name)
+            .where(
+                IcebergTables.catalog_name == self.name,
+                IcebergTables.table_namespace == namespace_str,
+            )
+            .order_by(IcebergTables.table_name)
+        )
+        if page_size is not None:
+            # One more row tells whether there is a next page
+            stmt = stmt.limit(page_size + 1)
+        if after is not None:
+            stmt = stmt.where(IcebergTables.table_name > after)
+        if pattern is not None:
+            stmt = stmt.where(
+                *name_conditions(
+                    IcebergTables.table_name,
+                    pattern,
+                    self.engine.dialect,
+                    self.name_collation,
+                )
+            )
+        with Session(self.engine) as session:
+            table_names = list(session.scalars(stmt))
+        namespace_tuple = BaseCatalog.identifier_to_tuple(namespace_str)
+        return (
+            [namespace_tuple + (table_name,) for table_name in table_names[:page_size]],
+            page_size is not None and len(table_names) > page_size,
+        )
+
+    def iter_tables(
+        self,
+        namespace: Union[str, Identifier],
+        pattern: Optional[NamePattern] = None,
+    ) -> Iterator[Identifier]:
+        """Iterate over the tables of a namespace whose name matches `pattern`, by name.
+
+        Rows are fetched from a server-side cursor `CATALOG_LIST_STREAM_BATCH_SIZE` at
+        a time as the iterator is consumed, so memory use does not grow with the
+        namespace. The catalog session stays open until the iterator is exhausted or
+        closed.
+
+        Raises:
+            NoSuchNamespaceError: If a namespace with the given name does not exist,
+                right away rather than once iterating.
+        """
+        if not self._namespace_exists(namespace):
+            raise NoSuchNamespaceError(f"Namespace does not exist: {namespace}")
+        namespace_str = BaseCatalog.namespace_to_string(namespace)
+        stmt = (
+            select(IcebergTables.table_name)
+            .where(
+                IcebergTables.catalog_name == self.name,
+                IcebergTables.table_namespace == namespace_str,
+            )
+            .order_by(IcebergTables.table_name)
+        )
+        if pattern is not None:
+            stmt = stmt.where(
+                *name_conditions(
+                    IcebergTables.table_name,
+                    pattern,
+                    self.engine.dialect,
+                    self.name_collation,
+                )
+            )
+        return self._stream_tables(BaseCatalog.identifier_to_tuple(namespace_str), stmt)
+
+    def _stream_tables(
+        self, namespace: Identifier, stmt: Select[Tuple[str]]
+    ) -> Iterator[Identifier]:
+        with Session(self.engine) as session:
+            for table_name in session.scalars(
+                stmt,
+                execution_options={
+                    "yield_per": settings.CATALOG_LIST_STREAM_BATCH_SIZE
+                },
+            ):
+                yield namespace + (table_name,)
+
+    def list_namespaces(
+        self,
+        namespace: Union[str, Identifier] = (),
+        pattern: Optional[NamePattern] = None,
+    ) -> List[Identifier]:
+        """List the namespaces one level below `namespace`, or the top-level ones,
+        whose last level matches `pattern` if given.
+
+        Raises:
+            NoSuchNamespaceError: If a namespace with the given name does not exist.
+        """
+        return list(self.iter_namespaces(namespace, pattern))
+
+    def iter_namespaces(
+        self,
+        namespace: Union[str, Identifier] = (),
+        pattern: Optional[NamePattern] = None,
+    ) -> Iterator[Identifier]:
+        """Iterate over the namespaces `list_namespaces` lists, reading them as they
+        are consumed, so memory use does not grow with their number.
+
+        Raises:
+            NoSuchNamespaceError: If a namespace with the given name does not exist,
+                right away rather than once iterating.
+        """
+        parent = self._parent_namespace(namespace)
+        children = self._child_namespaces(parent, pattern=pattern)
+        if parent and not self._namespace_exists(parent):
+            # The parent may still be implied by its children
+            if (first := next(children, None)) is None:
+                raise NoSuchNamespaceError(f"Namespace does not exist: {namespace}")
+            children = chain((first,), children)
+        return (BaseCatalog.identifier_to_tuple(child) for child in children)
+
+    def list_namespaces_page(
+        self,
+        namespace: Union[str, Identifier],
+        page_size: int,
+        after: Optional[str] = None,
+        pattern: Optional[NamePattern] = None,
+    ) -> Tuple[List[Identifier], bool]:
+        """Return up to `page_size` of the namespaces `list_namespaces` lists that sort
+        after `after`, by name, and whether more namespaces follow.
+
+        Raises:
+            NoSuchNamespaceError: If a namespace with the given name does not exist.
+        """
+        parent = self._parent_namespace(namespace)
+        # One more namespace tells whether there is a next page
+        children = list(
+            islice(self._child_namespaces(parent, after, pattern), page_size + 1)
+        )
+        if parent and not children and not self._namespace_exists(parent):
+            raise NoSuchNamespaceError(f"Namespace does not exist: {namespace}")
+        return (
+            [BaseCatalog.identifier_to_tuple(child) for child in children[:page_size]],
+            len(children) > page_size,
+        )
+
+    @staticmethod
+    def _parent_namespace(namespace: Union[str, Identifier]) -> str:
+        if not namespace:
+            return ""
+        return BaseCatalog.namespace_to_string(namespace, NoSuchNamespaceError)
+
+    def _child_namespaces(
+        self,
+        parent: str,
+        after: Optional[str] = None,
+        pattern: Optional[NamePattern] = None,
+    ) -> Iterator[str]:
+        # Namespaces are stored with their levels joined by ".", so the descendants of
+        # `parent` are the range ["parent.", "parent/"), "/" sorting right after ".".
+        # Children are read from that range with index seeks, skipping the subtree of
+        # each child once it is listed, so a listing reads about one row per child,
+        # however many namespaces sit deeper. Namespaces implied by deeper ones, like
+        # "a" by "a.b", are listed too. The literal prefix of a name pattern narrows
+        # the range to the children it can match. Both the range and the comparisons
+        # below rely on names sorting by code point, see `name_collation`.
+        prefix = f"{parent}." if parent else ""
+        end = f"{parent}/" if parent else None
+        start, inclusive = prefix, True
+        if pattern is not None and pattern.prefix:
+            start = prefix + pattern.prefix
+            if (prefix_end := pattern.prefix_end()) is not None:
+                end = prefix + prefix_end
+        if after is not None and after >= start:
+            start, inclusive = after, False
+        while True:
+            namespace_strs = self._select_namespaces(
+                start, inclusive, end, _NAMESPACE_SEEK_ROWS
+            )
+            for namespace_str in namespace_strs:
+                child = prefix + namespace_str[len(prefix) :].split(".", 1)[0]
+                if after is not None and child <= after:
+                    # A descendant of a child listed already
+                    start, inclusive = f"{child}/", True
+                    break
+                if pattern is None or pattern.matches(child[len(prefix) :]):
+                    yield child
+                after = child
+                if namespace_str != child:
+                    start, inclusive = f"{child}/", True
+                    break
+                start, inclusive = namespace_str, False
+            else:
+                if len(namespace_strs) < _NAMESPACE_SEEK_ROWS:
+                    return
+
+    def _select_namespaces(
+        self, start: str, inclusive: bool, end: Optional[str], limit: int
+    ) -> List[str]:
+        # The first `limit` namespaces of tables or with properties in the range from
+        # `start` to `end`, each side a range seek on the primary key of its table
+        def in_range(column: ColumnElement[str]) -> ColumnElement[bool]:
+            condition = column >= start if inclusive else column > start
+            return condition if end is None else condition & (column < end)
+
+        table_namespace = collate(IcebergTables.table_namespace, self.name_collation)
+        table_stmt = (
+            select(table_namespace.label("namespace"))
+            .where(IcebergTables.catalog_name == self.name, in_range(table_namespace))
+            .distinct()
+            .order_by(table_namespace)
+            .limit(limit)
+        )
+        namespace = collate(IcebergNamespaceProperties.namespace, self.name_collation)
+        namespace_stmt = (
+            select(namespace.label("namespace"))
+            .where(
+                IcebergNamespaceProperties.catalog_name == self.name,
+                in_range(namespace),
+            )
+            .distinct()
+            .order_by(namespace)
+            .limit(limit)
+        )
+        namespaces = union(
+            table_stmt.subquery().select(), namespace_stmt.subquery().select()
+        ).subquery()
+        stmt = (
+            select(namespaces.c.namespace).order_by(namespaces.c.namespace).limit(limit)
+        )
+        with Session(self.engine) as session:
+            return list(session.scalars(stmt))
+
+    def list_changes(self, since: int, limit: int) -> List[IcebergCatalogChanges]:
+        """Return up to `limit` journaled changes after sequence number `since`.
+
+        Every create, register, commit, rename and drop of a table, and every create,
+        property update and drop of a namespace, is journaled in the transaction that
+        makes it, so a change is listed if and only if it happened. Sequence numbers
+        are taken in commit order, see `record_change`, so a reader that resumes after
+        the last sequence number it saw never misses a change.
+        """
+        with Session(self.engine) as session:
+            return list_changes(session, self.name, since, limit)
+
+    def _commit_table(self, table_request: CommitTableRequest) -> CommitTableResponse:
+        return self.commit_tables([table_request])[0]
+
+    def commit_tables(
+        self, table_requests: List[CommitTableRequest]
+    ) -> List[CommitTableResponse]:
+        """Commit updates to one or more tables atomically.
+
+        The requirements of every request are validated against the current metadata of
+        its table, the new metadata files are written in parallel, and then the metadata
+        locations of all changed tables are swapped in a single catalog transaction, so
+        either every table moves to its new metadata or none does.
+
+        Requirements are checked against the cached metadata of the tables first, so a
+        commit that cannot succeed fails without waiting for other commits or reading
+        from the warehouse. Commits to the same table are applied one after another
+        within this process.
+        When a commit from another process moved the metadata location of one of the
+        tables in the meantime, the whole commit is retried up to
+        `CATALOG_COMMIT_MAX_ATTEMPTS` times with exponential backoff: the requirements
+        are validated again and the updates are re-applied on top of the fresh
+        metadata. Requirements that no longer hold fail the commit right away.
+
+        Fast appends to a format version 2 table with `commit.group-commit.enabled` set
+        are committed in groups: concurrent appends are chained into one metadata file
+        and one swap, see `rebase_fast_append`.
+
+        Raises:
+            ValueError: If more than one request targets the same table.
+            CommitFailedException: Requirement not met, or a conflict with a concurrent commit
+                that outlasted the retries.
+            TableAlreadyExistsError: If a table created by the commit already exists.
+        """
+        identifiers = [
+            self.identifier_to_tuple_without_catalog(
+                tuple(
+                    table_request.identifier.namespace.root
+                    + [table_request.identifier.name]
+                )
+            )
+            for table_request in table_requests
+        ]
+        if len(set(identifiers)) != len(identifiers):
+            raise ValueError("Each table can only be committed once per transaction")
+
+        if len(table_requests) == 1 and is_fast_append(table_requests[0]):
+            identifier = identifiers[0]
+            try:
+                table = self.load_table(identifier)
+            except NoSuchTableError:
+                table = None
+            if (
+                table is not None
+                and table.metadata.format_version == 2
+                and group_commit_enabled(table.properties)
+            ):
+                return [
+                    self._group_commits.submit(
+                        identifier,
+                        table_requests[0],
+                        lambda batch: self._commit_group(identifier, batch),
+                    )
+                ]
+
+        self._precheck_requirements(identifiers, table_requests)
+        # Commits to the same table in this process take turns in arrival order, so
+        # they never race each other on the compare-and-swap
+        with self._hold_commit_locks(identifiers):
+            return self._retry_on_conflict(
+                lambda is_retry: self._try_commit_tables(
+                    identifiers, table_requests, is_retry
+                )
+            )
+
+    def _precheck_requirements(
+        self, identifiers: List[Identifier], table_requests: List[CommitTableRequest]
+    ) -> None:
+        # Fail a commit whose requirements do not hold against the current metadata of
+        # its tables before it queues for the commit locks, as long as that metadata
+        # is cached. The pointer is read fresh, so the check sees what the commit would
+        # load; tables whose metadata is not cached are only checked by the commit.
+        with commit_phase("precheck"):
+            for identifier, table_request in zip(identifiers, table_requests):
+                if not table_request.requirements:
+                    continue
+                try:
+                    metadata_location = self._select_metadata_location(identifier)
+                except NoSuchTableError:
+                    continue
+                if (entry := self.metadata_cache.get(metadata_location)) is None:
+                    continue
+                for requirement in table_request.requirements:
+                    requirement.validate(entry.metadata)
+
+    def expire_snapshots(
+        self,
+        identifier: Union[str, Identifier],
+        older_than_ms: Optional[int] = None,
+        retain_last: Optional[int] = None,
+    ) -> ExpiredSnapshots:
+        """Remove old snapshots from a table and delete the files only they referenced.
+
+        The snapshots to expire are picked by `snapshots_to_expire` from the current
+        metadata, and picked again if a concurrent commit moves the table before the
+        new metadata is swapped in. Files are deleted once the commit succeeded, see
+        `delete_unreachable_files`.
+
+        Raises:
+            NoSuchTableError: If a table with the name does not exist.
+            CommitFailedException: If concurrent commits outlasted the retries.
+        """
+        identifier = self.identifier_to_tuple_without_catalog(identifier)
+        with self._hold_commit_locks([identifier]):
+            current_table, staged_table = self._retry_on_conflict(
+                lambda _: self._try_expire_snapshots(
+                    identifier, older_than_ms, retain_last
+                )
+            )
+        if staged_table is None:
+            return ExpiredSnapshots(snapshot_ids=[], deleted_files=0)
+        deleted_files = delete_unreachable_files(
+            staged_table.io,
+            current_table.metadata,
+            staged_table.metadata,
+            max_workers=settings.CATALOG_MAINTENANCE_MAX_WORKERS,
+            batch_size=settings.CATALOG_MAINTENANCE_DELETE_BATCH_SIZE,
+        )
+        kept_ids = {
+            snapshot.snapshot_id for snapshot in staged_table.metadata.snapshots
+        }
+        return ExpiredSnapshots(
+            snapshot_ids=[
+                snapshot.snapshot_id
+                for snapshot in current_table.metadata.snapshots
+                if snapshot.snapshot_id not in kept_ids
+            ],
+            deleted_files=deleted_files,
+        )
+
+    def _try_expire_snapshots(
+        self,
+        identifier: Identifier,
+        older_than_ms: Optional[int],
+        retain_last: Optional[int],
+    ) -> Tuple[Table, Optional[StagedTable]]:
+        # pyiceberg cannot apply a remove-snapshots update, so the new metadata is
+        # built here and committed like any other staged table
+        current_table = self.load_table(identifier)
+        snapshot_ids = snapshots_to_expire(
+            current_table.metadata, older_than_ms, retain_last
+        )
+        if not snapshot_ids:
+            return current_table, None
+        metadata = remove_snapshots(current_table.metadata, snapshot_ids)
+        metadata_location = self._new_metadata_location(
+            metadata, self._parse_metadata_version(current_table.metadata_location) + 1
+        )
+        staged_table = StagedTable(
+            identifier=identifier,
+            metadata=metadata,
+            metadata_location=metadata_location,
+            io=self._load_file_io(metadata.properties, metadata_location),
+            catalog=self,
+        )
+        self._commit_staged_tables([identifier], [current_table], [staged_table])
+        return current_table, staged_table
+
+    @staticmethod
+    def _retry_on_conflict(commit: Callable[[bool], T]) -> T:
+        attempt = 1
+        while True:
+            try:
+                return commit(attempt > 1)
+            except MetadataLocationMovedError:
+                if attempt >= settings.CATALOG_COMMIT_MAX_ATTEMPTS:
+                    raise
+            with commit_phase("backoff"):
+                time.sleep(_commit_backoff_seconds(attempt))
+            attempt += 1
+
+    @contextmanager
+    def _hold_commit_locks(self, identifiers: List[Identifier]) -> Iterator[None]:
+        with ExitStack() as stack:
+            with commit_phase("wait"):
+                stack.enter_context(self._commit_locks.hold_all(identifiers))
+            yield
+
+    def _commit_group(
+        self, identifier: Identifier, table_requests: List[CommitTableRequest]
+    ) -> List[Union[CommitTableResponse, BaseException]]:
+        with self._hold_commit_locks([identifier]):
+            return self._retry_on_conflict(
+                lambda _: self._try_commit_group(identifier, table_requests)
+            )
+
+    def _try_commit_group(
+        self, identifier: Identifier, table_requests: List[CommitTableRequest]
+    ) -> List[Union[CommitTableResponse, BaseException]]:
+        # Chain the fast appends on top of each other and commit them with a single
+        # metadata file and a single swap. An append whose requirements fail is left
+        # out and fails on its own, without failing the rest of the group.
+        with commit_phase("load"):
+            current_table = self.load_table(identifier)
+        metadata = current_table.metadata
+        errors: List[Optional[BaseException]] = []
+        manifest_lists: List[str] = []
+        with commit_phase("apply"):
+            for table_request in table_requests:
+                try:
+                    updates = rebase_fast_append(
+                        metadata, table_request, current_table.io, manifest_lists
+                    )
+                    metadata = update_table_metadata(metadata, updates)
+                    errors.append(None)
+                except CommitFailedException as e:
+                    errors.append(e)
+                except ValueError as e:
+                    errors.append(
+                        CommitFailedException(f"Cannot apply the updates: {e}")
+                    )
+        if metadata is current_table.metadata:
+            return errors
+
+        metadata_location = self._new_metadata_location(
+            metadata, self._parse_metadata_version(current_table.metadata_location) + 1
+        )
+        staged_table = StagedTable(
+            identifier=identifier,
+            metadata=metadata,
+            metadata_location=metadata_location,
+            io=self._load_file_io(metadata.properties, metadata_location),
+            catalog=self,
+        )
+        try:
+            [response] = self._commit_staged_tables(
+                [identifier], [current_table], [staged_table]
+            )
+        except MetadataLocationMovedError:
+            for manifest_list in manifest_lists:
+                _delete_uncommitted_file(current_table.io, manifest_list)
+            raise
+        return [response if error is None else error for error in errors]
+
+    def _try_commit_tables(
+        self,
+        identifiers: List[Identifier],
+        table_requests: List[CommitTableRequest],
+        is_retry: bool,
+    ) -> List[CommitTableResponse]:
+        current_tables: List[Optional[Table]] = []
+        staged_tables: List[Optional[StagedTable]] = []
+        for identifier, table_request in zip(identifiers, table_requests):
+            with commit_phase("load"):
+                try:
+                    current_table = self.load_table(identifier)
+                except NoSuchTableError:
+                    current_table = None
+            try:
+                staged_table = self._update_and_stage_table(
+                    current_table, table_request
+                )
+            except ValueError as e:
+                if not is_retry:
+                    raise
+                # The updates applied to the metadata the client started from, but no
+                # longer apply to the metadata a concurrent commit left behind
+                raise CommitFailedException(
+                    f"Table has been updated by another process: {'.'.join(identifier)}, Error: {e}"
+                ) from e
+            current_tables.append(current_table)
+            # No changes, nothing to write or swap
+            if current_table and staged_table.metadata == current_table.metadata:
+                staged_table = None
+            staged_tables.append(staged_table)
+
+        return self._commit_staged_tables(identifiers, current_tables, staged_tables)
+
+    def _update_and_stage_table(
+        self, current_table: Optional[Table], table_request: CommitTableRequest
+    ) -> StagedTable:
+        # Same as `MetastoreCatalog._update_and_stage_table`, timed per phase
+        base_metadata = current_table.metadata if current_table else None
+        with commit_phase("validate"):
+            for requirement in table_request.requirements:
+                requirement.validate(base_metadata)
+        with commit_phase("apply"):
+            updated_metadata = update_table_metadata(
+                base_metadata=base_metadata or self._empty_table_metadata(),
+                updates=table_request.updates
+                if current_table
+                else _initial_changes(table_request.updates),
+                enforce_validation=current_table is None,
+            )
+
+        new_metadata_version = (
+            self._parse_metadata_version(current_table.metadata_location) + 1
+            if current_table
+            else 0
+        )
+        new_metadata_location = self._new_metadata_location(
+            updated_metadata, new_metadata_version
+        )
+        return StagedTable(
+            identifier=tuple(
+                table_request.identifier.namespace.root
+                + [table_request.identifier.name]
+            ),
+            metadata=updated_metadata,
+            metadata_location=new_metadata_location,
+            io=self._load_file_io(
+                properties=updated_metadata.properties, location=new_metadata_location
+            ),
+            catalog=self,
+        )
+
+    def _commit_staged_tables(
+        self,
+        identifiers: List[Identifier],
+        current_tables: List[Optional[Table]],
+        staged_tables: List[Optional[StagedTable]],
+    ) -> List[CommitTableResponse]:
+        staged_tables = [
+            self._log_previous_metadata(current_table, staged_table)
+            if current_table and staged_table
+            else staged_table
+            for current_table, staged_table in zip(current_tables, staged_tables)
+        ]
+        written_tables = [
+            staged_table for staged_table in staged_tables if staged_table
+        ]
+        with commit_phase("write"):
+            self._write_staged_metadata(written_tables)
+        try:
+            with commit_phase("swap"), Session(self.engine) as session:
+                # Rows are locked in identifier order, like `KeyedLock.hold_all` does,
+                # so transactions of other processes over the same tables cannot
+                # deadlock with this one
+                swaps = sorted(
+                    (
+                        (identifier, current_table, staged_table)
+                        for identifier, current_table, staged_table in zip(
+                            identifiers, current_tables, staged_tables
+                        )
+                        if staged_table
+                    ),
+                    key=lambda swap: swap[0],
+                )
+                for identifier, current_table, staged_table in swaps:
+                    self._swap_metadata_location(
+                        session,
+                        identifier,
+                        current_table.metadata_location if current_table else None,
+                        staged_table.metadata_location,
+                    )
+                # Journaled last, as `record_change` asks
+                for identifier, current_table, staged_table in swaps:
+                    record_change(
+                        session,
+                        self.name,
+                        COMMIT_TABLE if current_table else CREATE_TABLE,
+                        BaseCatalog.namespace_to_string(
+                            BaseCatalog.namespace_from(identifier)
+                        ),
+                        BaseCatalog.table_name_from(identifier),
+                        staged_table.metadata_location,
+                        previous_metadata_location=current_table.metadata_location
+                        if current_table
+                        else None,
+                    )
+                session.commit()
+        except MetadataLocationMovedError:
+            # None of the new metadata files were committed, so nothing refers to them
+            for staged_table in written_tables:
+                _delete_uncommitted_file(
+                    staged_table.io, staged_table.metadata_location
+                )
+            raise
+
+        responses = []
+        for identifier, current_table, staged_table in zip(
+            identifiers, current_tables, staged_tables
+        ):
+            committed = staged_table or current_table
+            # Lookups that started before the swap may return the previous location, so
+            # loads that arrive after the commit do not join them
+            self._location_lookups.forget(identifier)
+            if current_table and staged_table:
+                self.metadata_pruner.prune(
+                    staged_table.io, current_table.metadata, staged_table.metadata
+                )
+            self.metadata_cache.bind(identifier, committed.metadata_location)
+            # The commit may have created the table
+            self.missing_tables.discard(identifier)
+            responses.append(
+                CommitTableResponse(
+                    metadata=committed.metadata,
+                    metadata_location=committed.metadata_location,
+                )
+            )
+        return responses
+
+    @staticmethod
+    def _log_previous_metadata(
+        current_table: Table, staged_table: StagedTable
+    ) -> StagedTable:
+        # pyiceberg leaves the metadata log alone, a Java catalog appends the metadata
+        # file each commit replaces
+        return StagedTable(
+            identifier=staged_table.identifier,
+            metadata=add_previous_metadata(
+                staged_table.metadata,
+                current_table.metadata_location,
+                current_table.metadata,
+            ),
+            metadata_location=staged_table.metadata_location,
+            io=staged_table.io,
+            catalog=staged_table.catalog,
+        )
+
+    def _write_staged_metadata(self, staged_tables: List[StagedTable]) -> None:
+        def write(staged_table: StagedTable) -> None:
+            self._write_metadata(
+                metadata=staged_table.metadata,
+                io=staged_table.io,
+                metadata_path=staged_table.metadata_location,
+            )
+
+        if len(staged_tables) <= 1:
+            for staged_table in staged_tables:
+                write(staged_table)
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(
+                len(staged_tables), settings.CATALOG_COMMIT_MAX_PARALLEL_WRITES
+            )
+        ) as executor:
+            # Consume the results so the first failed write is raised here
+            list(executor.map(write, staged_tables))
+
+    def _swap_metadata_location(
+        self,
+        session: Session,
+        identifier: Identifier,
+        current_metadata_location: Optional[str],
+        new_metadata_location: str,
+    ) -> None:
+        # Same compare-and-swap as `SqlCatalog._commit_table`, without committing the
+        # session, so several tables can be swapped in one transaction
+        namespace = BaseCatalog.namespace_to_string(
+            BaseCatalog.namespace_from(identifier)
+        )
+        table_name = BaseCatalog.table_name_from(identifier)
+        if current_metadata_location is None:
+            try:
+                session.add(
+                    IcebergTables(
+                        catalog_name=self.name,
+                        table_namespace=namespace,
+                        table_name=table_name,
+                        metadata_location=new_metadata_location,
+                        previous_metadata_location=None,
+                    )
+                )
+                session.flush()
+            except IntegrityError as e:
+                raise TableAlreadyExistsError(
+                    f"Table {namespace}.{table_name} already exists"
+                ) from e
+        elif self.engine.dialect.supports_sane_rowcount:
+            stmt = (
+                update(IcebergTables)
+                .where(
+                    IcebergTables.catalog_name == self.name,
+                    IcebergTables.table_namespace == namespace,
+                    IcebergTables.table_name == table_name,
+                    IcebergTables.metadata_location == current_metadata_location,
+                )
+                .values(
+                    metadata_location=new_metadata_location,
+                    previous_metadata_location=current_metadata_location,
+                )
+            )
+            if session.execute(stmt).rowcount < 1:
+                raise MetadataLocationMovedError(
+                    f"Table has been updated by another process: {namespace}.{table_name}"
+                )
+        else:
+            try:
+                tbl = (
+                    session.query(IcebergTables)
+                    .with_for_update(of=IcebergTables)
+                    .filter(
+                        IcebergTables.catalog_name == self.name,
+                        IcebergTables.table_namespace == namespace,
+                        IcebergTables.table_name == table_name,
+                        IcebergTables.metadata_location == current_metadata_location,
+                    )
+                    .one()
+                )
+            except NoResultFound as e:
+                raise MetadataLocationMovedError(
+                    f"Table has been updated by another process: {namespace}.{table_name}"
+                ) from e
+            tbl.metadata_location = new_metadata_location
+            tbl.previous_metadata_location = current_metadata_location
 
 
 class Catalog:
@@ -12,7 +1478,7 @@ class Catalog:
 
 
 def _create_catalog():
-    catalog = SqlCatalog(
+    catalog = RestSqlCatalog(
         settings.CATALOG_NAME,
         **{
             "uri": settings.CATALOG_JDBC_URI,
@@ -0,0 +1,100 @@
+import logging
+from typing import List, Optional
+
+from pyiceberg.catalog.sql import IcebergNamespaceProperties, IcebergTables
+from sqlalchemy import ColumnElement, Engine, Index, MetaData, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Mapped
+
+logger = logging.getLogger(__name__)
+
+# Database collations that already compare strings by code point, like Python does
+POSTGRESQL_BINARY_COLLATIONS = {"C", "POSIX"}
+
+
+def name_collation(engine: Engine) -> Optional[str]:
+    """The collation under which the name columns of the catalog tables compare by
+    code point, or None if they already do.
+
+    Listing namespaces and matching name patterns turn prefixes into ranges, like
+    ["a.", "a/"), which only hold the names starting with the prefix in that order.
+    On PostgreSQL that is the "C" collation, unless the database uses it already. On
+    MySQL it is the binary collation of the character set of the columns, unless
+    they use a binary collation already. SQLite compares with BINARY by default.
+    """
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            collation = connection.scalar(
+                text(
+                    "SELECT datcollate FROM pg_database"
+                    " WHERE datname = current_database()"
+                )
+            )
+            return None if collation in POSTGRESQL_BINARY_COLLATIONS else "C"
+        if engine.dialect.name in ("mysql", "mariadb"):
+            character_set, collation = connection.execute(
+                text(
+                    "SELECT character_set_name, collation_name"
+                    " FROM information_schema.columns"
+                    " WHERE table_schema = DATABASE() AND table_name = :table_name"
+                    " AND column_name = 'table_namespace'"
+                ),
+                {"table_name": IcebergTables.__tablename__},
+            ).one()
+            return None if collation.endswith("_bin") else f"{character_set}_bin"
+    return None
+
+
+def collate(column: Mapped[str], collation: Optional[str]) -> ColumnElement[str]:
+    """`column` compared under `collation`, see `name_collation`."""
+    if collation is None:
+        return column
+    return column.collate(collation)
+
+
+def create_name_indexes(engine: Engine, collation: Optional[str]) -> None:
+    """Add the indexes that serve ranges over names compared under `collation`,
+    unless they exist.
+
+    Indexes on the name columns only serve comparisons under their own collation, so
+    when `collation` is not None, the primary keys cannot serve the ranges. Databases
+    that cannot index an expression, like MySQL before 8.0.13, are only warned
+    about, as the ranges are then scanned.
+    """
+    if collation is None:
+        return
+    for index in _name_indexes(collation):
+        try:
+            index.create(engine, checkfirst=True)
+        except DBAPIError:
+            logger.warning(
+                "Failed to create index %s, names are looked up by scanning",
+                index.name,
+                exc_info=True,
+            )
+
+
+def _name_indexes(collation: str) -> List[Index]:
+    # Built on copies of the tables, so the indexes do not end up in the metadata
+    # that `SqlCatalog.create_tables` creates
+    metadata = MetaData()
+    tables = IcebergTables.__table__.to_metadata(metadata)
+    namespace_properties = IcebergNamespaceProperties.__table__.to_metadata(metadata)
+    return [
+        Index(
+            "iceberg_tables_namespace_bin",
+            tables.c.catalog_name,
+            tables.c.table_namespace.collate(collation),
+        ),
+        Index(
+            "iceberg_tables_name_bin",
+            tables.c.catalog_name,
+            tables.c.table_namespace,
+            tables.c.table_name.collate(collation),
+        ),
+        Index(
+            "iceberg_namespace_properties_namespace_bin",
+            namespace_properties.c.catalog_name,
+            namespace_properties.c.namespace.collate(collation),
+        ),
+    ]
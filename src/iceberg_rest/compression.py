@@ -0,0 +1,173 @@
+import zlib
+from typing import Dict, List, Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from iceberg_rest.settings import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+def available_encodings() -> List[str]:
+    """Content-codings the server can produce, in order of preference."""
+    return [ZSTD, GZIP] if zstandard is not None else [GZIP]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the content-coding for a response from the request's Accept-Encoding header.
+
+    Returns None when the client accepts none of the available codings, in which case
+    the response is sent uncompressed.
+    """
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    best_encoding, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+    return best_encoding
+
+
+def new_compressor(encoding: str) -> Compressor:
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(
+            level=settings.CATALOG_COMPRESSION_ZSTD_LEVEL
+        ).compressobj()
+    return zlib.compressobj(
+        settings.CATALOG_COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+
+
+def compress(encoding: str, data: bytes) -> bytes:
+    compressor = new_compressor(encoding)
+    return compressor.compress(data) + compressor.flush()
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """The ETag of a body compressed with `encoding`, given the ETag of the identity body.
+
+    A strong ETag identifies the exact bytes of a body, so every content-coding gets
+    its own, made by suffixing the opaque tag with the coding. Weak ETags stay as they
+    are.
+    """
+    if etag.startswith("W/"):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def identity_etag(etag: str) -> str:
+    """The ETag of the identity body, given the ETag of a body made by `encoded_etag`."""
+    for encoding in available_encodings():
+        if etag.endswith(f'-{encoding}"'):
+            return f'{etag[: -len(encoding) - 2]}"'
+    return etag
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the content-coding negotiated from Accept-Encoding.
+
+    Works like Starlette's GZipMiddleware, with zstd as an additional coding. Bodies
+    smaller than `minimum_size` are sent as-is, and so are responses that already set
+    a Content-Encoding, such as load_table responses compressed ahead of time. The
+    ETag of a compressed body is made specific to its coding, see `encoded_etag`.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = negotiate_encoding(Headers(scope=scope).get("Accept-Encoding"))
+            if encoding is not None:
+                responder = _CompressionResponder(self.app, encoding, self.minimum_size)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.content_encoding_set = False
+        self.compressor: Optional[Compressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the start message until the first body chunk shows whether to compress
+            self.initial_message = message
+            headers = Headers(raw=self.initial_message["headers"])
+            self.content_encoding_set = "content-encoding" in headers
+        elif message_type == "http.response.body" and self.content_encoding_set:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+        elif message_type == "http.response.body" and not self.started:
+            self.started = True
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if len(body) < self.minimum_size and not more_body:
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if (etag := headers.get("ETag")) is not None:
+                headers["ETag"] = encoded_etag(etag, self.encoding)
+            if more_body:
+                del headers["Content-Length"]
+                self.compressor = new_compressor(self.encoding)
+                message["body"] = self.compressor.compress(body)
+            else:
+                message["body"] = compress(self.encoding, body)
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+        elif message_type == "http.response.body":
+            # Remaining chunks of a streamed response
+            body = self.compressor.compress(message.get("body", b""))
+            if not message.get("more_body", False):
+                body += self.compressor.flush()
+            message["body"] = body
+            await self.send(message)
@@ -0,0 +1,188 @@
+import threading
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    The first caller for a key runs the function, and every caller that arrives while
+    it is still running waits for it and receives the same result, or the same error.
+    `forget` detaches the running call, so callers that arrive after it start a new one.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def forget(self, key: Hashable) -> None:
+        """Stop handing the result of the running call for `key` to new callers, e.g.
+        because the value it computes changed after it started."""
+        with self._lock:
+            self._calls.pop(key, None)
+
+
+class KeyedLock:
+    """
+    Mutual exclusion per key, granted in arrival order.
+
+    Callers holding different keys run in parallel, while callers for the same key
+    queue up and take turns first come, first served, unlike `threading.Lock`, which
+    makes no promise about the order in which waiting threads wake up.
+    """
+
+    def __init__(self) -> None:
+        self._queues: Dict[Hashable, Deque[threading.Event]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def hold(self, key: Hashable) -> Iterator[None]:
+        turn = threading.Event()
+        with self._lock:
+            queue = self._queues.setdefault(key, deque())
+            queue.append(turn)
+            if len(queue) == 1:
+                turn.set()
+        turn.wait()
+        try:
+            yield
+        finally:
+            with self._lock:
+                queue.popleft()
+                if queue:
+                    queue[0].set()
+                else:
+                    del self._queues[key]
+
+    @contextmanager
+    def hold_all(self, keys: Iterable[Hashable]) -> Iterator[None]:
+        """Hold the locks for several keys, taken in sorted order so callers cannot deadlock."""
+        with ExitStack() as stack:
+            for key in sorted(set(keys)):
+                stack.enter_context(self.hold(key))
+            yield
+
+
+class _PendingCommit(Generic[T, R]):
+    def __init__(self, request: T) -> None:
+        self.request = request
+        self.wake = threading.Event()
+        self.leads = False
+        self.outcome: Optional[Union[R, BaseException]] = None
+
+
+class GroupCommitQueue(Generic[T, R]):
+    """
+    Collects concurrent commits to the same key and hands them over in batches.
+
+    The first caller for a key leads: it commits the batch of everything queued for the
+    key, including its own request. Callers that arrive while a batch is being
+    committed queue up behind it, and once it is done the oldest of them leads the
+    next batch, so every batch holds all commits that arrived during the previous one.
+    """
+
+    def __init__(self) -> None:
+        self._queues: Dict[Hashable, List[_PendingCommit[T, R]]] = {}
+        self._leading: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        key: Hashable,
+        request: T,
+        commit_batch: Callable[[List[T]], List[Union[R, BaseException]]],
+    ) -> R:
+        """Queue `request` and return its outcome once the batch holding it was committed.
+
+        `commit_batch` returns the outcome of every request in the batch, in order, as
+        either a result or an exception to raise to that caller.
+        """
+        pending: _PendingCommit[T, R] = _PendingCommit(request)
+        with self._lock:
+            self._queues.setdefault(key, []).append(pending)
+            if key not in self._leading:
+                self._leading.add(key)
+                pending.leads = True
+        if not pending.leads:
+            pending.wake.wait()
+        if pending.leads:
+            self._lead(key, commit_batch)
+        if isinstance(pending.outcome, BaseException):
+            raise pending.outcome
+        return pending.outcome
+
+    def _lead(
+        self,
+        key: Hashable,
+        commit_batch: Callable[[List[T]], List[Union[R, BaseException]]],
+    ) -> None:
+        with self._lock:
+            batch = self._queues.pop(key)
+        try:
+            outcomes = commit_batch([pending.request for pending in batch])
+        except BaseException as e:
+            outcomes = [e] * len(batch)
+
+        with self._lock:
+            next_leader = None
+            if queue := self._queues.get(key):
+                next_leader = queue[0]
+                next_leader.leads = True
+            else:
+                self._leading.discard(key)
+        for pending, outcome in zip(batch, outcomes):
+            pending.outcome = outcome
+            pending.wake.set()
+        if next_leader is not None:
+            next_leader.wake.set()
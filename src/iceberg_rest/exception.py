@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 
@@ -7,12 +9,16 @@ MESSAGE = "message"
 
 
 class IcebergHTTPException(HTTPException):
-    def __init__(self, status_code: int, detail: str):
+    def __init__(
+        self, status_code: int, detail: str, headers: Optional[Dict[str, str]] = None
+    ):
         error_msg = {ERROR: {CODE: status_code, MESSAGE: detail}}
-        super().__init__(status_code=status_code, detail=error_msg)
+        super().__init__(status_code=status_code, detail=error_msg, headers=headers)
 
     def to_json_response(self):
-        return JSONResponse(status_code=self.status_code, content=self.detail)
+        return JSONResponse(
+            status_code=self.status_code, content=self.detail, headers=self.headers
+        )
 
 
 def iceberg_http_exception_handler(request: Request, exc: IcebergHTTPException):
@@ -0,0 +1,164 @@
+import uuid
+from copy import copy
+from typing import List
+
+from pyiceberg.io import FileIO
+from pyiceberg.manifest import UNASSIGNED_SEQ, write_manifest_list
+from pyiceberg.table import (
+    AddSnapshotUpdate,
+    AssertRefSnapshotId,
+    AssertTableUUID,
+    CommitTableRequest,
+    SetSnapshotRefUpdate,
+    TableUpdate,
+)
+from pyiceberg.table.metadata import TableMetadata
+from pyiceberg.table.snapshots import (
+    Operation,
+    Summary,
+    ancestors_of,
+    update_snapshot_summaries,
+)
+from pyiceberg.exceptions import CommitFailedException
+from pyiceberg.typedef import Properties
+
+# Table property that opts a table into group commit
+GROUP_COMMIT_ENABLED = "commit.group-commit.enabled"
+
+
+def group_commit_enabled(properties: Properties) -> bool:
+    return properties.get(GROUP_COMMIT_ENABLED, "false").lower() == "true"
+
+
+def is_fast_append(table_request: CommitTableRequest) -> bool:
+    """Whether a commit only adds an append snapshot and moves a branch to it.
+
+    Those are the commits a fast append produces: an `add-snapshot` of an append on top
+    of the branch head, a `set-snapshot-ref` of the branch to the new snapshot, and
+    at most an `assert-table-uuid` and an `assert-ref-snapshot-id` of the branch head.
+    """
+    add_snapshots = [
+        u for u in table_request.updates if isinstance(u, AddSnapshotUpdate)
+    ]
+    set_refs = [u for u in table_request.updates if isinstance(u, SetSnapshotRefUpdate)]
+    if len(add_snapshots) != 1 or len(set_refs) != 1 or len(table_request.updates) != 2:
+        return False
+    snapshot, set_ref = add_snapshots[0].snapshot, set_refs[0]
+    if (
+        snapshot.parent_snapshot_id is None
+        or snapshot.summary is None
+        or snapshot.summary.operation != Operation.APPEND
+        or set_ref.type != "branch"
+        or set_ref.snapshot_id != snapshot.snapshot_id
+    ):
+        return False
+    for requirement in table_request.requirements:
+        if isinstance(requirement, AssertTableUUID):
+            continue
+        if (
+            isinstance(requirement, AssertRefSnapshotId)
+            and requirement.ref == set_ref.ref_name
+            and requirement.snapshot_id == snapshot.parent_snapshot_id
+        ):
+            continue
+        return False
+    return True
+
+
+def rebase_fast_append(
+    metadata: TableMetadata,
+    table_request: CommitTableRequest,
+    io: FileIO,
+    written_manifest_lists: List[str],
+) -> List[TableUpdate]:
+    """Return the updates of a fast append, moved on top of the branch head in `metadata`.
+
+    Appends never conflict with each other, so an append whose branch moved since the
+    client planned it is applied on top of the new head, the same way a Java fast
+    append is retried: the manifest list is rewritten to hold the manifests of the new
+    head plus the manifests the append added, the snapshot gets the next sequence
+    number, and its summary totals are recomputed. The locations of rewritten manifest
+    lists are appended to `written_manifest_lists`. Merge appends, whose manifests
+    carry files of the snapshot they started from, are not moved.
+
+    Raises:
+        CommitFailedException: If a requirement fails, the snapshot the client started
+            from is no longer an ancestor of the branch head, or the append merged
+            manifests and the branch moved.
+    """
+    for requirement in table_request.requirements:
+        if isinstance(requirement, AssertTableUUID):
+            requirement.validate(metadata)
+    snapshot = next(
+        u.snapshot for u in table_request.updates if isinstance(u, AddSnapshotUpdate)
+    )
+    set_ref = next(
+        u for u in table_request.updates if isinstance(u, SetSnapshotRefUpdate)
+    )
+    ref = metadata.refs.get(set_ref.ref_name)
+    if ref is None:
+        raise CommitFailedException(
+            f"Requirement failed: branch {set_ref.ref_name} was removed"
+        )
+    if (
+        ref.snapshot_id == snapshot.parent_snapshot_id
+        and snapshot.sequence_number > metadata.last_sequence_number
+    ):
+        return list(table_request.updates)
+
+    head = metadata.snapshot_by_id(ref.snapshot_id)
+    if snapshot.parent_snapshot_id not in {
+        ancestor.snapshot_id for ancestor in ancestors_of(head, metadata)
+    }:
+        raise CommitFailedException(
+            f"Requirement failed: branch {set_ref.ref_name} no longer descends from "
+            f"snapshot {snapshot.parent_snapshot_id}"
+        )
+
+    sequence_number = metadata.next_sequence_number()
+    added_manifests = []
+    for manifest in snapshot.manifests(io):
+        if manifest.added_snapshot_id == snapshot.snapshot_id:
+            if manifest.existing_files_count != 0 or manifest.deleted_files_count != 0:
+                # A merge append rewrote manifests of the snapshot it started from into
+                # this one, so re-adding it next to the manifests of the new head would
+                # list those files twice
+                raise CommitFailedException(
+                    f"Requirement failed: branch {set_ref.ref_name} has changed, and "
+                    f"the append merged manifests of snapshot {snapshot.parent_snapshot_id}"
+                )
+            # Let the manifest list assign the new sequence number to the added files
+            manifest = copy(manifest)
+            manifest.sequence_number = UNASSIGNED_SEQ
+            manifest.min_sequence_number = UNASSIGNED_SEQ
+            added_manifests.append(manifest)
+
+    manifest_list = f"{metadata.location}/metadata/snap-{snapshot.snapshot_id}-1-{uuid.uuid4()}.avro"
+    with write_manifest_list(
+        format_version=metadata.format_version,
+        output_file=io.new_output(manifest_list),
+        snapshot_id=snapshot.snapshot_id,
+        parent_snapshot_id=head.snapshot_id,
+        sequence_number=sequence_number,
+    ) as writer:
+        writer.add_manifests(added_manifests + head.manifests(io))
+    written_manifest_lists.append(manifest_list)
+
+    summary = Summary(
+        operation=snapshot.summary.operation,
+        **{
+            key: value
+            for key, value in snapshot.summary.additional_properties.items()
+            if not key.startswith("total-")
+        },
+    )
+    rebased_snapshot = snapshot.model_copy(
+        update={
+            "parent_snapshot_id": head.snapshot_id,
+            "sequence_number": sequence_number,
+            "manifest_list": manifest_list,
+            "summary": update_snapshot_summaries(summary, head.summary),
+            "timestamp_ms": max(snapshot.timestamp_ms, head.timestamp_ms),
+        }
+    )
+    return [AddSnapshotUpdate(snapshot=rebased_snapshot), set_ref]
@@ -0,0 +1,140 @@
+import hashlib
+import time
+from typing import Callable, Optional
+
+from iceberg_rest.concurrency import SingleFlight
+from pydantic import BaseModel
+from pyiceberg.catalog.sql import SqlCatalogBaseTable
+from sqlalchemy import Engine, Float, String, delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+
+class IcebergIdempotencyKeys(SqlCatalogBaseTable):
+    __tablename__ = "iceberg_idempotency_keys"
+
+    catalog_name: Mapped[str] = mapped_column(
+        String(255), nullable=False, primary_key=True
+    )
+    idempotency_key: Mapped[str] = mapped_column(
+        String(255), nullable=False, primary_key=True
+    )
+    request_digest: Mapped[str] = mapped_column(String(64), nullable=False)
+    # None for operations that do not produce a single table, like transactions
+    metadata_location: Mapped[Optional[str]] = mapped_column(
+        String(1000), nullable=True
+    )
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an Idempotency-Key is sent again with a different request."""
+
+
+def request_digest(operation: str, *path: str, body: BaseModel) -> str:
+    """Fingerprint of a request, to tell a retry from another request reusing its key."""
+    digest = hashlib.sha256(operation.encode())
+    for part in path:
+        digest.update(b"\x00" + part.encode())
+    digest.update(b"\x00" + body.model_dump_json(by_alias=True).encode())
+    return digest.hexdigest()
+
+
+class IdempotencyKeys:
+    """
+    Remembers the outcome of mutating requests sent with an Idempotency-Key.
+
+    A successful request records the metadata location it produced in the catalog
+    database, so every server process sharing it can answer a retry of the request
+    with the stored result instead of running it again. Records expire after
+    `ttl_seconds`; failed requests are not recorded, so they can be retried.
+    Concurrent retries of a request still in flight in this process wait for it and
+    share its result. Only the metadata location is recorded, so a retry after the
+    metadata file was pruned can no longer be answered with the metadata.
+    """
+
+    def __init__(self, engine: Engine, catalog_name: str, ttl_seconds: float):
+        self.engine = engine
+        self.catalog_name = catalog_name
+        self.ttl_seconds = ttl_seconds
+        self._flights = SingleFlight()
+        self._next_purge = 0.0
+
+    def run(
+        self,
+        idempotency_key: str,
+        request_digest: str,
+        operation: Callable[[], Optional[str]],
+    ) -> Optional[str]:
+        """Run `operation` unless a request with this key already succeeded, and
+        return the metadata location it produced.
+
+        Raises:
+            IdempotencyKeyReusedError: If the key was recorded for a different request.
+        """
+        return self._flights.do(
+            (idempotency_key, request_digest),
+            lambda: self._run(idempotency_key, request_digest, operation),
+        )
+
+    def _run(
+        self,
+        idempotency_key: str,
+        request_digest: str,
+        operation: Callable[[], Optional[str]],
+    ) -> Optional[str]:
+        now = time.time()
+        with Session(self.engine) as session:
+            record = session.scalar(
+                select(IcebergIdempotencyKeys).where(
+                    IcebergIdempotencyKeys.catalog_name == self.catalog_name,
+                    IcebergIdempotencyKeys.idempotency_key == idempotency_key,
+                    IcebergIdempotencyKeys.expires_at > now,
+                )
+            )
+        if record is not None:
+            if record.request_digest != request_digest:
+                raise IdempotencyKeyReusedError(
+                    f"Idempotency-Key {idempotency_key} was used for a different request"
+                )
+            return record.metadata_location
+
+        metadata_location = operation()
+        self._store(idempotency_key, request_digest, metadata_location)
+        return metadata_location
+
+    def _store(
+        self,
+        idempotency_key: str,
+        request_digest: str,
+        metadata_location: Optional[str],
+    ) -> None:
+        now = time.time()
+        with Session(self.engine) as session:
+            # Expired records are purged at most once per TTL; the one under this
+            # key, if any, has to go now to make room for the new record
+            expired = delete(IcebergIdempotencyKeys).where(
+                IcebergIdempotencyKeys.catalog_name == self.catalog_name,
+                IcebergIdempotencyKeys.expires_at <= now,
+            )
+            if now < self._next_purge:
+                expired = expired.where(
+                    IcebergIdempotencyKeys.idempotency_key == idempotency_key
+                )
+            else:
+                self._next_purge = now + self.ttl_seconds
+            session.execute(expired)
+            session.add(
+                IcebergIdempotencyKeys(
+                    catalog_name=self.catalog_name,
+                    idempotency_key=idempotency_key,
+                    request_digest=request_digest,
+                    metadata_location=metadata_location,
+                    expires_at=now + self.ttl_seconds,
+                )
+            )
+            try:
+                session.commit()
+            except IntegrityError:
+                # Another server process recorded the key first
+                session.rollback()
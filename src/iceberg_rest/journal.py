@@ -0,0 +1,139 @@
+import time
+from typing import List, Optional
+
+from pyiceberg.catalog.sql import SqlCatalogBaseTable
+from sqlalchemy import BigInteger, Engine, String, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+# Operations recorded in the change journal
+CREATE_TABLE = "create-table"
+REGISTER_TABLE = "register-table"
+COMMIT_TABLE = "commit-table"
+RENAME_TABLE = "rename-table"
+DROP_TABLE = "drop-table"
+CREATE_NAMESPACE = "create-namespace"
+UPDATE_NAMESPACE_PROPERTIES = "update-namespace-properties"
+DROP_NAMESPACE = "drop-namespace"
+
+
+class IcebergCatalogChanges(SqlCatalogBaseTable):
+    __tablename__ = "iceberg_catalog_changes"
+
+    catalog_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    sequence_number: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=False
+    )
+    operation: Mapped[str] = mapped_column(String(32), nullable=False)
+    # The namespace of the table, or the namespace itself for namespace changes
+    table_namespace: Mapped[str] = mapped_column(String(255), nullable=False)
+    # None for namespace changes
+    table_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # None once the table was dropped
+    metadata_location: Mapped[Optional[str]] = mapped_column(
+        String(1000), nullable=True
+    )
+    previous_metadata_location: Mapped[Optional[str]] = mapped_column(
+        String(1000), nullable=True
+    )
+    # The name a renamed table had before
+    source_namespace: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    source_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    timestamp_ms: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class IcebergChangeSequences(SqlCatalogBaseTable):
+    __tablename__ = "iceberg_change_sequences"
+
+    catalog_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    last_sequence_number: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+def create_sequence(engine: Engine, catalog_name: str) -> None:
+    """Add the sequence number counter of a catalog to the journal, unless it exists."""
+    with Session(engine) as session:
+        if session.get(IcebergChangeSequences, catalog_name) is not None:
+            return
+        last_sequence_number = session.scalar(
+            select(func.max(IcebergCatalogChanges.sequence_number)).where(
+                IcebergCatalogChanges.catalog_name == catalog_name
+            )
+        )
+        session.add(
+            IcebergChangeSequences(
+                catalog_name=catalog_name,
+                last_sequence_number=last_sequence_number or 0,
+            )
+        )
+        try:
+            session.commit()
+        except IntegrityError:
+            # Another server process added it first
+            pass
+
+
+def record_change(
+    session: Session,
+    catalog_name: str,
+    operation: str,
+    namespace: str,
+    table_name: Optional[str] = None,
+    metadata_location: Optional[str] = None,
+    previous_metadata_location: Optional[str] = None,
+    source_namespace: Optional[str] = None,
+    source_name: Optional[str] = None,
+) -> None:
+    """Append a change to the journal as part of the transaction of `session`, so the
+    change and its journal entry are committed, or rolled back, together.
+
+    The sequence number is taken from the counter of the catalog, whose row stays
+    locked until the transaction ends. Transactions that journal changes therefore
+    take their sequence numbers in the order they commit in, and a change becomes
+    visible only after every change with a lower sequence number. To keep that lock
+    short, journal a change after the other writes of its transaction.
+    """
+    session.execute(
+        update(IcebergChangeSequences)
+        .where(IcebergChangeSequences.catalog_name == catalog_name)
+        .values(last_sequence_number=IcebergChangeSequences.last_sequence_number + 1)
+    )
+    sequence_number = session.scalar(
+        select(IcebergChangeSequences.last_sequence_number).where(
+            IcebergChangeSequences.catalog_name == catalog_name
+        )
+    )
+    session.add(
+        IcebergCatalogChanges(
+            catalog_name=catalog_name,
+            sequence_number=sequence_number,
+            operation=operation,
+            table_namespace=namespace,
+            table_name=table_name,
+            metadata_location=metadata_location,
+            previous_metadata_location=previous_metadata_location,
+            source_namespace=source_namespace,
+            source_name=source_name,
+            timestamp_ms=int(time.time() * 1000),
+        )
+    )
+
+
+def list_changes(
+    session: Session, catalog_name: str, since: int, limit: int
+) -> List[IcebergCatalogChanges]:
+    """Return up to `limit` changes with a sequence number above `since`, oldest first.
+
+    The primary key index serves the range, so a page costs the same however long
+    the journal is.
+    """
+    return list(
+        session.scalars(
+            select(IcebergCatalogChanges)
+            .where(
+                IcebergCatalogChanges.catalog_name == catalog_name,
+                IcebergCatalogChanges.sequence_number > since,
+            )
+            .order_by(IcebergCatalogChanges.sequence_number)
+            .limit(limit)
+        )
+    )
@@ -1,13 +1,19 @@
 import uvicorn
 from fastapi import FastAPI
 from iceberg_rest.api.catalog_api import router as CatalogApiRouter
+from iceberg_rest.compression import CompressionMiddleware
 from iceberg_rest.exception import IcebergHTTPException, iceberg_http_exception_handler
+from iceberg_rest.responses import get_response_class
+from iceberg_rest.settings import settings
 
 
 def create_app():
-    app = FastAPI()
+    app = FastAPI(default_response_class=get_response_class())
     app.include_router(CatalogApiRouter)
     app.add_exception_handler(IcebergHTTPException, iceberg_http_exception_handler)
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.CATALOG_COMPRESSION_MIN_BYTES
+    )
     return app
 
 
@@ -0,0 +1,315 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from pyiceberg.io import FileIO
+from pyiceberg.manifest import ManifestFile
+from pyiceberg.table import PropertyUtil
+from pyiceberg.table.metadata import TableMetadata
+from pyiceberg.table.snapshots import MetadataLogEntry, Snapshot, ancestors_of
+from pyiceberg.typedef import Identifier
+
+logger = logging.getLogger(__name__)
+
+# Table properties that bound the metadata log and delete files that drop out of it
+METADATA_DELETE_AFTER_COMMIT_ENABLED = "write.metadata.delete-after-commit.enabled"
+METADATA_PREVIOUS_VERSIONS_MAX = "write.metadata.previous-versions-max"
+METADATA_PREVIOUS_VERSIONS_MAX_DEFAULT = 100
+
+
+def add_previous_metadata(
+    metadata: TableMetadata, previous_location: str, previous: TableMetadata
+) -> TableMetadata:
+    """Return `metadata` with the metadata file it replaces appended to its metadata log.
+
+    The log keeps at most `write.metadata.previous-versions-max` entries, the oldest
+    ones are dropped, the same way a Java catalog maintains it.
+    """
+    max_versions = max(
+        1,
+        PropertyUtil.property_as_int(
+            metadata.properties,
+            METADATA_PREVIOUS_VERSIONS_MAX,
+            METADATA_PREVIOUS_VERSIONS_MAX_DEFAULT,
+        ),
+    )
+    metadata_log = metadata.metadata_log + [
+        MetadataLogEntry(
+            metadata_file=previous_location, timestamp_ms=previous.last_updated_ms
+        )
+    ]
+    return metadata.model_copy(update={"metadata_log": metadata_log[-max_versions:]})
+
+
+# Table properties with the defaults of a snapshot expiration, as in Java
+HISTORY_EXPIRE_MAX_SNAPSHOT_AGE_MS = "history.expire.max-snapshot-age-ms"
+HISTORY_EXPIRE_MAX_SNAPSHOT_AGE_MS_DEFAULT = 5 * 24 * 60 * 60 * 1000
+HISTORY_EXPIRE_MIN_SNAPSHOTS_TO_KEEP = "history.expire.min-snapshots-to-keep"
+HISTORY_EXPIRE_MIN_SNAPSHOTS_TO_KEEP_DEFAULT = 1
+
+
+def removed_metadata_files(
+    previous: TableMetadata, metadata: TableMetadata
+) -> Set[str]:
+    """Metadata files in the log of `previous` that are no longer in the log of `metadata`."""
+    kept = {entry.metadata_file for entry in metadata.metadata_log}
+    return {
+        entry.metadata_file
+        for entry in previous.metadata_log
+        if entry.metadata_file not in kept
+    }
+
+
+class MetadataPruner:
+    """
+    Deletes metadata files that dropped out of the metadata log of a table.
+
+    Deletes run on a pool of `max_workers` threads, off the request path, and only for
+    tables that set `write.metadata.delete-after-commit.enabled`. A file that cannot be
+    deleted is logged and left behind, the commit that superseded it already succeeded.
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="metadata-pruner"
+        )
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+
+    def prune(
+        self, io: FileIO, previous: TableMetadata, metadata: TableMetadata
+    ) -> List[Future]:
+        """Schedule the deletion of the files `metadata` no longer logs, if the table asks."""
+        if not PropertyUtil.property_as_bool(
+            metadata.properties, METADATA_DELETE_AFTER_COMMIT_ENABLED, False
+        ):
+            return []
+        futures = [
+            self._executor.submit(self._delete, io, location)
+            for location in sorted(removed_metadata_files(previous, metadata))
+        ]
+        with self._lock:
+            self._pending.update(futures)
+        for future in futures:
+            future.add_done_callback(self._done)
+        return futures
+
+    def wait(self) -> None:
+        """Block until every scheduled delete has finished."""
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    @staticmethod
+    def _delete(io: FileIO, location: str) -> None:
+        try:
+            io.delete(location)
+        except Exception:
+            logger.warning(
+                "Failed to delete old metadata file %s", location, exc_info=True
+            )
+
+
+def snapshots_to_expire(
+    metadata: TableMetadata,
+    older_than_ms: Optional[int] = None,
+    retain_last: Optional[int] = None,
+) -> Set[int]:
+    """Return the ids of the snapshots older than `older_than_ms` that can be expired.
+
+    Snapshots that a branch or tag points at are kept, and so are the `retain_last`
+    most recent ancestors of the current snapshot, whatever their age. Both bounds
+    default to the `history.expire.*` properties of the table.
+    """
+    if older_than_ms is None:
+        older_than_ms = int(time.time() * 1000) - PropertyUtil.property_as_int(
+            metadata.properties,
+            HISTORY_EXPIRE_MAX_SNAPSHOT_AGE_MS,
+            HISTORY_EXPIRE_MAX_SNAPSHOT_AGE_MS_DEFAULT,
+        )
+    if retain_last is None:
+        retain_last = PropertyUtil.property_as_int(
+            metadata.properties,
+            HISTORY_EXPIRE_MIN_SNAPSHOTS_TO_KEEP,
+            HISTORY_EXPIRE_MIN_SNAPSHOTS_TO_KEEP_DEFAULT,
+        )
+    retained = {ref.snapshot_id for ref in metadata.refs.values()}
+    retained.update(
+        snapshot.snapshot_id
+        for snapshot in islice(
+            ancestors_of(metadata.current_snapshot(), metadata), retain_last
+        )
+    )
+    return {
+        snapshot.snapshot_id
+        for snapshot in metadata.snapshots
+        if snapshot.timestamp_ms < older_than_ms
+        and snapshot.snapshot_id not in retained
+    }
+
+
+def remove_snapshots(metadata: TableMetadata, snapshot_ids: Set[int]) -> TableMetadata:
+    """Return `metadata` without the given snapshots and their snapshot log entries."""
+    return metadata.model_copy(
+        update={
+            "snapshots": [
+                snapshot
+                for snapshot in metadata.snapshots
+                if snapshot.snapshot_id not in snapshot_ids
+            ],
+            "snapshot_log": [
+                entry
+                for entry in metadata.snapshot_log
+                if entry.snapshot_id not in snapshot_ids
+            ],
+            "last_updated_ms": int(time.time() * 1000),
+        }
+    )
+
+
+class ExpiredSnapshots(NamedTuple):
+    snapshot_ids: List[int]
+    deleted_files: int
+
+
+def delete_unreachable_files(
+    io: FileIO,
+    previous: TableMetadata,
+    metadata: TableMetadata,
+    max_workers: int,
+    batch_size: int,
+) -> int:
+    """Delete the files only the snapshots removed from `previous` referenced.
+
+    Those are the manifest lists of the removed snapshots, their manifests that no
+    kept snapshot lists, and the data and delete files in those manifests that no
+    kept manifest lists. Manifests are read, and files deleted in batches, on up to
+    `max_workers` threads. Returns the number of files deleted; files that cannot be
+    deleted are logged and skipped.
+    """
+    kept_ids = {snapshot.snapshot_id for snapshot in metadata.snapshots}
+    removed = [s for s in previous.snapshots if s.snapshot_id not in kept_ids]
+    if not removed:
+        return 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        kept_manifests = _manifests(executor, io, metadata.snapshots)
+        removed_manifests = {
+            path: manifest
+            for path, manifest in _manifests(executor, io, removed).items()
+            if path not in kept_manifests
+        }
+        removed_files: Set[str] = set()
+        if removed_manifests:
+            removed_files = _file_paths(
+                executor, io, removed_manifests.values()
+            ) - _file_paths(executor, io, kept_manifests.values())
+        kept_manifest_lists = {s.manifest_list for s in metadata.snapshots}
+        removed_manifest_lists = {
+            s.manifest_list for s in removed if s.manifest_list
+        } - kept_manifest_lists
+        locations = sorted(
+            removed_manifest_lists | removed_manifests.keys() | removed_files
+        )
+        batches = [
+            locations[i : i + batch_size] for i in range(0, len(locations), batch_size)
+        ]
+        return sum(executor.map(lambda batch: _delete_batch(io, batch), batches))
+
+
+def _manifests(
+    executor: ThreadPoolExecutor, io: FileIO, snapshots: Iterable[Snapshot]
+) -> Dict[str, ManifestFile]:
+    return {
+        manifest.manifest_path: manifest
+        for manifests in executor.map(lambda s: s.manifests(io), snapshots)
+        for manifest in manifests
+    }
+
+
+def _file_paths(
+    executor: ThreadPoolExecutor, io: FileIO, manifests: Iterable[ManifestFile]
+) -> Set[str]:
+    return {
+        entry.data_file.file_path
+        for entries in executor.map(
+            lambda m: m.fetch_manifest_entry(io, discard_deleted=False), manifests
+        )
+        for entry in entries
+    }
+
+
+def _delete_batch(io: FileIO, locations: List[str]) -> int:
+    deleted = 0
+    for location in locations:
+        try:
+            io.delete(location)
+            deleted += 1
+        except Exception:
+            logger.warning(
+                "Failed to delete unreachable file %s", location, exc_info=True
+            )
+    return deleted
+
+
+class MaintenanceJob:
+    """A maintenance job on a table and, once it finished, its result or error."""
+
+    def __init__(self, kind: str, identifier: Identifier):
+        self.job_id = str(uuid.uuid4())
+        self.kind = kind
+        self.identifier = identifier
+        self.status = "pending"
+        self.result: Any = None
+        self.error: Optional[str] = None
+
+
+class MaintenanceJobs:
+    """
+    Runs maintenance jobs in the background and keeps them around for polling.
+
+    At most `max_workers` jobs run at once and later ones wait their turn. Jobs live in
+    the memory of this server process; the `max_jobs` most recent ones are kept.
+    """
+
+    def __init__(self, max_workers: int, max_jobs: int = 1000):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="maintenance"
+        )
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, MaintenanceJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self, kind: str, identifier: Identifier, run: Callable[[], Any]
+    ) -> MaintenanceJob:
+        job = MaintenanceJob(kind, identifier)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job, run)
+        return job
+
+    def get(self, job_id: str) -> Optional[MaintenanceJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @staticmethod
+    def _run(job: MaintenanceJob, run: Callable[[], Any]) -> None:
+        job.status = "running"
+        try:
+            job.result = run()
+            job.status = "succeeded"
+        except Exception as e:
+            logger.exception("Maintenance job %s failed", job.job_id)
+            job.error = str(e)
+            job.status = "failed"
@@ -0,0 +1,164 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pyiceberg.exceptions import CommitFailedException, TableAlreadyExistsError
+
+# Upper bounds in seconds, from sub-millisecond SQL updates to slow object store uploads
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    A cumulative histogram per label set, rendered in the Prometheus text format.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> (count per bucket, with a last bucket for +Inf, sum)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        label_values = tuple(labels[name] for name in self.label_names)
+        with self._lock:
+            counts, total = self._series.get(
+                label_values, ([0] * (len(self.buckets) + 1), 0.0)
+            )
+            counts[bisect_left(self.buckets, value)] += 1
+            self._series[label_values] = (counts, total + value)
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = sorted(
+                (label_values, list(counts), total)
+                for label_values, (counts, total) in self._series.items()
+            )
+        for label_values, counts, total in series:
+            labels = ",".join(
+                f'{name}="{value}"'
+                for name, value in zip(self.label_names, label_values)
+            )
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+COMMIT_PHASE_SECONDS = Histogram(
+    "iceberg_rest_commit_phase_seconds",
+    "Time spent in each phase of a table commit, by outcome.",
+    label_names=("phase", "outcome"),
+)
+
+REGISTRY = (COMMIT_PHASE_SECONDS,)
+
+
+def render_metrics() -> str:
+    return "".join(histogram.render() for histogram in REGISTRY)
+
+
+class CommitTimer:
+    """
+    Collects how long the phases of a commit took.
+
+    Phases are `parse` (validating the request body), `precheck` (checking requirements
+    against cached metadata), `wait` (queueing behind other commits to the same
+    table), `load` (reading the current metadata), `validate` (checking requirements),
+    `apply` (applying the updates), `write` (serializing and uploading metadata
+    files), `swap` (the compare-and-swap in the catalog database) and `backoff`
+    (sleeping before a retry). A phase that runs more than once, e.g.
+    when a commit is retried, accumulates.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Make this the timer of the commit running in the current context, and record
+        the phases and total time in `COMMIT_PHASE_SECONDS` once it is done."""
+        # The timer was created by a route dependency, before the body was validated
+        self.add("parse", time.perf_counter() - self.started)
+        token = _current_timer.set(self)
+        outcome = "error"
+        try:
+            yield
+            outcome = "success"
+        except (CommitFailedException, TableAlreadyExistsError):
+            outcome = "conflict"
+            raise
+        finally:
+            _current_timer.reset(token)
+            self.add("total", time.perf_counter() - self.started)
+            for phase, seconds in self.durations.items():
+                COMMIT_PHASE_SECONDS.observe(seconds, phase=phase, outcome=outcome)
+
+    def server_timing(self) -> str:
+        """The durations as a `Server-Timing` header value, in milliseconds."""
+        return ", ".join(
+            f"{phase};dur={seconds * 1000:.1f}"
+            for phase, seconds in self.durations.items()
+        )
+
+
+_current_timer: ContextVar[Optional[CommitTimer]] = ContextVar(
+    "commit_timer", default=None
+)
+
+
+@contextmanager
+def commit_phase(phase: str) -> Iterator[None]:
+    """Time a phase of the commit running in the current context, if it is measured."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(phase, time.perf_counter() - start)
+
+
+def start_commit_timer() -> CommitTimer:
+    """Route dependency that starts timing a commit before the request body is validated."""
+    return CommitTimer()
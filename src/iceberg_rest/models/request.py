@@ -1,5 +1,5 @@
 from typing import Dict, List, Optional
-from pydantic import BaseModel, Field, StrictBool, StrictStr
+from pydantic import BaseModel, Field, StrictBool, StrictInt, StrictStr
 
 from pyiceberg.table import TableIdentifier, TableRequirement, TableUpdate
 from pyiceberg.schema import Schema
@@ -80,3 +80,19 @@ class RenameTableRequest(BaseModel):
 
     source: TableIdentifier
     destination: TableIdentifier
+
+
+class ExpireSnapshotsRequest(BaseModel):
+    """
+    ExpireSnapshotsRequest
+    """  # noqa: E501
+
+    older_than_ms: Optional[StrictInt] = Field(
+        default=None,
+        description="Expire snapshots older than this timestamp in milliseconds. Defaults to now minus the table's history.expire.max-snapshot-age-ms.",
+    )
+    retain_last: Optional[StrictInt] = Field(
+        default=None,
+        ge=1,
+        description="Number of ancestors of the current snapshot to keep whatever their age. Defaults to the table's history.expire.min-snapshots-to-keep.",
+    )
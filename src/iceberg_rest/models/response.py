@@ -1,5 +1,5 @@
-from typing import Dict, List, Optional
-from pydantic import BaseModel, Field, StrictStr
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, StrictInt, StrictStr
 
 from pyiceberg.table import TableIdentifier
 from pyiceberg.table.metadata import TableMetadata
@@ -24,7 +24,13 @@ class ListNamespacesResponse(BaseModel):
     ListNamespacesResponse
     """  # noqa: E501
 
-    # next_page_token: Optional[StrictStr] = Field(default=None, description="An opaque token which allows clients to make use of pagination for a list API (e.g. ListTables). Clients will initiate the first paginated request by sending an empty `pageToken` e.g. `GET /tables?pageToken` or `GET /tables?pageToken=` signaling to the service that the response should be paginated. Servers that support pagination will recognize `pageToken` and return a `next-page-token` in response if there are more results available. After the initial request, it is expected that the value of `next-page-token` from the last response is used in the subsequent request. Servers that do not support pagination will ignore `next-page-token` and return all results.", alias="next-page-token")
+    model_config = ConfigDict(populate_by_name=True)
+
+    next_page_token: Optional[StrictStr] = Field(
+        default=None,
+        description="An opaque token which allows clients to make use of pagination for a list API (e.g. ListTables). Clients will initiate the first paginated request by sending an empty `pageToken` e.g. `GET /tables?pageToken` or `GET /tables?pageToken=` signaling to the service that the response should be paginated. Servers that support pagination will recognize `pageToken` and return a `next-page-token` in response if there are more results available. After the initial request, it is expected that the value of `next-page-token` from the last response is used in the subsequent request. Servers that do not support pagination will ignore `next-page-token` and return all results.",
+        alias="next-page-token",
+    )
     namespaces: Optional[List[List[StrictStr]]] = None
 
 
@@ -62,6 +68,8 @@ class ListTablesResponse(BaseModel):
     ListTablesResponse
     """  # noqa: E501
 
+    model_config = ConfigDict(populate_by_name=True)
+
     next_page_token: Optional[StrictStr] = Field(
         default=None,
         description="An opaque token which allows clients to make use of pagination for a list API (e.g. ListTables). Clients will initiate the first paginated request by sending an empty `pageToken` e.g. `GET /tables?pageToken` or `GET /tables?pageToken=` signaling to the service that the response should be paginated. Servers that support pagination will recognize `pageToken` and return a `next-page-token` in response if there are more results available. After the initial request, it is expected that the value of `next-page-token` from the last response is used in the subsequent request. Servers that do not support pagination will ignore `next-page-token` and return all results.",
@@ -77,3 +85,65 @@ class CommitTableResponse(BaseModel):
 
     metadata_location: StrictStr = Field()
     metadata: TableMetadata
+
+
+class MaintenanceJobResponse(BaseModel):
+    """
+    MaintenanceJobResponse
+    """  # noqa: E501
+
+    job_id: StrictStr
+    kind: StrictStr
+    identifier: TableIdentifier
+    status: Literal["pending", "running", "succeeded", "failed"]
+    expired_snapshot_ids: Optional[List[StrictInt]] = Field(
+        default=None, description="Snapshots removed by an expire-snapshots job"
+    )
+    deleted_files: Optional[StrictInt] = Field(
+        default=None,
+        description="Manifest lists, manifests and data files deleted by the job",
+    )
+    error: Optional[StrictStr] = None
+
+
+class CatalogChange(BaseModel):
+    """
+    CatalogChange
+    """  # noqa: E501
+
+    sequence_number: StrictInt
+    operation: Literal[
+        "create-table",
+        "register-table",
+        "commit-table",
+        "rename-table",
+        "drop-table",
+        "create-namespace",
+        "update-namespace-properties",
+        "drop-namespace",
+    ]
+    identifier: Optional[TableIdentifier] = Field(
+        default=None, description="Table the change applies to, unset for namespaces"
+    )
+    namespace: Optional[List[StrictStr]] = Field(
+        default=None, description="Namespace the change applies to, unset for tables"
+    )
+    metadata_location: Optional[StrictStr] = Field(
+        default=None, description="Metadata location after the change, unset for drops"
+    )
+    previous_metadata_location: Optional[StrictStr] = None
+    source: Optional[TableIdentifier] = Field(
+        default=None, description="Name a renamed table had before the rename"
+    )
+    timestamp_ms: StrictInt
+
+
+class ListChangesResponse(BaseModel):
+    """
+    ListChangesResponse
+    """  # noqa: E501
+
+    changes: List[CatalogChange]
+    next_since: StrictInt = Field(
+        description="Sequence number to send as `since` to get the changes after these"
+    )
@@ -0,0 +1,42 @@
+import base64
+import binascii
+import json
+from typing import Optional, Tuple
+
+
+class InvalidPageTokenError(ValueError):
+    """Raised when a page token was not issued by this server for the same listing."""
+
+
+def encode_page_token(listing: str, *key: str) -> str:
+    """Return an opaque token for the page after the row with `key` in `listing`.
+
+    The token holds the key itself rather than an offset, so the next page is read
+    with a range seek on the index and stays correct when rows are added or removed
+    in between.
+    """
+    payload = json.dumps([listing, *key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_page_token(token: str, listing: str) -> Optional[Tuple[str, ...]]:
+    """Return the key of the last row of the previous page, or None for an empty
+    token, which asks for the first page.
+
+    Raises:
+        InvalidPageTokenError: If the token is malformed or was issued for another listing.
+    """
+    if not token:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidPageTokenError(f"Invalid page token: {token}") from e
+    if (
+        not isinstance(payload, list)
+        or len(payload) < 2
+        or payload[0] != listing
+        or not all(isinstance(part, str) for part in payload[1:])
+    ):
+        raise InvalidPageTokenError(f"Invalid page token: {token}")
+    return tuple(payload[1:])
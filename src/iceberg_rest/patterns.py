@@ -0,0 +1,108 @@
+import re
+from typing import List, NamedTuple, Optional
+
+from iceberg_rest.collation import collate
+from sqlalchemy import ColumnElement, Dialect
+from sqlalchemy.orm import Mapped
+
+# Escape character of the LIKE patterns built from name patterns
+LIKE_ESCAPE = "\\"
+
+
+class NamePattern(NamedTuple):
+    """
+    A glob over names: `*` matches any run of characters, `?` any single character,
+    and `\\` makes the character after it literal.
+    """
+
+    pattern: str
+    # The literal characters before the first wildcard
+    prefix: str
+    # The same pattern in LIKE syntax, escaped with LIKE_ESCAPE
+    like: str
+    # The same pattern in the GLOB syntax of SQLite
+    glob: str
+    regex: "re.Pattern[str]"
+    has_wildcards: bool
+
+    def matches(self, name: str) -> bool:
+        return self.regex.fullmatch(name) is not None
+
+    def prefix_end(self) -> Optional[str]:
+        """The smallest string above every string that starts with `prefix`, if any."""
+        prefix = self.prefix
+        while prefix and prefix[-1] == chr(0x10FFFF):
+            prefix = prefix[:-1]
+        if not prefix:
+            return None
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def parse_name_pattern(pattern: str) -> NamePattern:
+    prefix: List[str] = []
+    like: List[str] = []
+    glob: List[str] = []
+    regex: List[str] = []
+    has_wildcards = False
+    chars = iter(pattern)
+    for char in chars:
+        if char in "*?":
+            has_wildcards = True
+            like.append("%" if char == "*" else "_")
+            glob.append(char)
+            regex.append(".*" if char == "*" else ".")
+            continue
+        if char == "\\":
+            # A trailing backslash stands for itself
+            char = next(chars, "\\")
+        if not has_wildcards:
+            prefix.append(char)
+        like.append(_escape_like(char))
+        glob.append(f"[{char}]" if char in "*?[" else char)
+        regex.append(re.escape(char))
+    return NamePattern(
+        pattern=pattern,
+        prefix="".join(prefix),
+        like="".join(like),
+        glob="".join(glob),
+        regex=re.compile("".join(regex), re.DOTALL),
+        has_wildcards=has_wildcards,
+    )
+
+
+def name_conditions(
+    column: Mapped[str],
+    pattern: NamePattern,
+    dialect: Dialect,
+    collation: Optional[str] = None,
+) -> List[ColumnElement[bool]]:
+    """SQL conditions on `column` that select the names matching `pattern`, as
+    case-sensitively as `NamePattern.matches` does.
+
+    The literal prefix of the pattern becomes a range on the column, and the rest of
+    the pattern a LIKE over that range. Both compare under `collation`, see
+    `name_collation`, so the primary key, or the index `create_name_indexes` adds
+    under that collation, serves the range. SQLite ignores the case of ASCII letters in LIKE
+    whatever the collation, so there the rest of the pattern is a GLOB instead.
+    """
+    if not pattern.has_wildcards:
+        return [column == pattern.prefix]
+    binary_column = collate(column, collation)
+    conditions = []
+    if pattern.prefix:
+        conditions.append(binary_column >= pattern.prefix)
+        if (prefix_end := pattern.prefix_end()) is not None:
+            conditions.append(binary_column < prefix_end)
+    # A pattern that is a prefix followed by `*` is decided by the range alone
+    if pattern.like != _escape_like(pattern.prefix) + "%":
+        if dialect.name == "sqlite":
+            conditions.append(column.op("GLOB")(pattern.glob))
+        else:
+            conditions.append(binary_column.like(pattern.like, escape=LIKE_ESCAPE))
+    return conditions
+
+
+def _escape_like(text: str) -> str:
+    return "".join(
+        LIKE_ESCAPE + char if char in "%_" + LIKE_ESCAPE else char for char in text
+    )
@@ -0,0 +1,56 @@
+import json
+from typing import Any, Dict, Type
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from iceberg_rest.settings import settings
+
+
+def _dump_model(model: BaseModel) -> Any:
+    # Same shape as the routes' response_model_by_alias / response_model_exclude_none
+    return model.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+class CatalogJSONResponse(JSONResponse):
+    """
+    JSONResponse that also accepts pydantic models, at the top level or nested.
+
+    Routes can hand their response model to the response class as-is, which skips
+    FastAPI's dump, re-validate and serialize round trip of the return value.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            default=_default,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+class ORJSONCatalogResponse(CatalogJSONResponse):
+    """CatalogJSONResponse that encodes with orjson instead of the standard library."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return _dump_model(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+RESPONSE_CLASSES: Dict[str, Type[CatalogJSONResponse]] = {
+    "json": CatalogJSONResponse,
+    "orjson": ORJSONCatalogResponse,
+}
+
+
+def get_response_class() -> Type[CatalogJSONResponse]:
+    """Return the response class for the encoder selected by `CATALOG_JSON_ENCODER`."""
+    return RESPONSE_CLASSES[settings.CATALOG_JSON_ENCODER]
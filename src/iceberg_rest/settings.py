@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import (
     Field,
 )
@@ -30,5 +32,52 @@ class Settings(BaseSettings):
     AWS_REGION: str = Field(default="us-east-1")
     CATALOG_S3_ENDPOINT: str = Field(default="http://127.0.0.1:9000")
 
+    # Response settings
+    # Encoder used to render JSON responses
+    CATALOG_JSON_ENCODER: Literal["json", "orjson"] = Field(default="orjson")
+    # Responses smaller than this are sent uncompressed
+    CATALOG_COMPRESSION_MIN_BYTES: int = Field(default=1024)
+    # Compression levels for gzip (1-9) and zstd (1-22); zstd is offered when zstandard is installed
+    CATALOG_COMPRESSION_GZIP_LEVEL: int = Field(default=6)
+    CATALOG_COMPRESSION_ZSTD_LEVEL: int = Field(default=3)
+    # Upper bound on the identifiers returned by one page of a listing, and the page
+    # size of clients that ask for pages without a size
+    CATALOG_LIST_MAX_PAGE_SIZE: int = Field(default=1000)
+    # Rows fetched per round trip from the catalog database by streamed listings
+    CATALOG_LIST_STREAM_BATCH_SIZE: int = Field(default=1000)
+    # Upper bound on the changes returned by one page of the change feed
+    CATALOG_CHANGES_MAX_PAGE_SIZE: int = Field(default=1000)
+
+    # Commit settings
+    # Upper bound on the metadata files written concurrently by a multi-table commit
+    CATALOG_COMMIT_MAX_PARALLEL_WRITES: int = Field(default=8)
+    # Attempts at a commit whose tables were moved by a concurrent commit; 1 disables retries
+    CATALOG_COMMIT_MAX_ATTEMPTS: int = Field(default=4)
+    # Bounds of the exponential backoff between commit attempts
+    CATALOG_COMMIT_RETRY_MIN_WAIT_MS: int = Field(default=50)
+    CATALOG_COMMIT_RETRY_MAX_WAIT_MS: int = Field(default=1000)
+    # How long the result of a request sent with an Idempotency-Key is replayed to its retries
+    CATALOG_IDEMPOTENCY_KEY_TTL_SECONDS: float = Field(default=3600.0)
+    # Codec of the metadata files of tables that do not set write.metadata.compression-codec
+    CATALOG_METADATA_COMPRESSION_CODEC: Literal["none", "gzip"] = Field(default="none")
+
+    # Maintenance settings
+    # Upper bound on the background threads deleting files that tables no longer reference
+    CATALOG_MAINTENANCE_MAX_WORKERS: int = Field(default=4)
+    # Files deleted by one task of a maintenance job
+    CATALOG_MAINTENANCE_DELETE_BATCH_SIZE: int = Field(default=100)
+    # Maintenance jobs, like snapshot expiration, that run at the same time
+    CATALOG_MAINTENANCE_MAX_JOBS: int = Field(default=2)
+
+    # Cache settings
+    # Upper bound on the memory held by cached table metadata, see `CachedMetadata.weight`; 0 disables the cache
+    CATALOG_METADATA_CACHE_MAX_BYTES: int = Field(default=256 * 1024 * 1024)
+    # Serve load_table from the stored metadata JSON instead of re-serializing the parsed model
+    CATALOG_METADATA_PASSTHROUGH: bool = Field(default=True)
+    # Metadata files larger than this are cached parsed instead of as JSON, so cache hits re-serialize the model
+    CATALOG_METADATA_PASSTHROUGH_MAX_BYTES: int = Field(default=16 * 1024 * 1024)
+    # How long a table that was not found keeps being reported missing without a catalog lookup; 0 disables
+    CATALOG_MISSING_TABLE_TTL_SECONDS: float = Field(default=1.0)
+
 
 settings = Settings()
@@ -17,8 +17,15 @@
 # pylint:disable=redefined-outer-name
 
 
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import PosixPath
 from typing import (
+    Any,
+    Dict,
+    Tuple,
     Union,
 )
 
@@ -33,6 +40,8 @@ from pyiceberg.catalog import (
 )
 from pyiceberg.catalog.rest import RestCatalog
 from pyiceberg.exceptions import (
+    BadRequestError,
+    CommitFailedException,
     NamespaceAlreadyExistsError,
     NamespaceNotEmptyError,
     NoSuchNamespaceError,
@@ -53,6 +62,7 @@ from pyiceberg.table import (
     Table,
     TableIdentifier,
 )
+from pyiceberg.table.snapshots import ancestors_of
 from pyiceberg.transforms import IdentityTransform
 from pyiceberg.typedef import EMPTY_DICT, Properties
 from pyiceberg.types import IntegerType, LongType, NestedField
@@ -272,6 +282,282 @@ def test_table_exists_on_table_not_found(catalog: Catalog) -> None:
     assert not catalog.table_exists(TEST_TABLE_IDENTIFIER)
 
 
+def test_table_exists_right_after_create(catalog: Catalog) -> None:
+    # Given
+    assert not catalog.table_exists(TEST_TABLE_IDENTIFIER)
+    # When
+    given_catalog_has_a_table(catalog)
+    # Then
+    assert catalog.table_exists(TEST_TABLE_IDENTIFIER)
+
+
+TEST_TABLE_URL = (
+    f"{REST_ENDPOINT}v1/namespaces/{TEST_TABLE_NAMESPACE[0]}/tables/{TEST_TABLE_NAME}"
+)
+
+
+def test_load_table_not_modified(catalog: Catalog) -> None:
+    # Given
+    given_catalog_has_a_table(catalog)
+    etag = requests.get(
+        TEST_TABLE_URL, headers={"Accept-Encoding": "identity"}
+    ).headers["ETag"]
+    # When
+    response = requests.get(TEST_TABLE_URL, headers={"If-None-Match": etag})
+    # Then
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert requests.head(TEST_TABLE_URL).headers["ETag"] == etag
+
+
+def test_load_table_etag_is_specific_to_the_content_coding(catalog: Catalog) -> None:
+    # Given
+    given_table_has_snapshots(given_catalog_has_a_table(catalog), 3)
+    etag = requests.get(
+        TEST_TABLE_URL, headers={"Accept-Encoding": "identity"}
+    ).headers["ETag"]
+    # When
+    gzip_etag = requests.get(
+        TEST_TABLE_URL, headers={"Accept-Encoding": "gzip"}
+    ).headers["ETag"]
+    response = requests.get(
+        TEST_TABLE_URL,
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag},
+    )
+    # Then
+    assert gzip_etag == f'{etag[:-1]}-gzip"'
+    assert response.status_code == 304
+    assert response.headers["ETag"] == gzip_etag
+
+
+def test_load_table_etag_changes_on_commit(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    etag = requests.get(TEST_TABLE_URL).headers["ETag"]
+    # When
+    given_table.transaction().set_properties(key3="value3").commit_transaction()
+    response = requests.get(TEST_TABLE_URL, headers={"If-None-Match": etag})
+    # Then
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["metadata"]["properties"]["key3"] == "value3"
+
+
+def test_load_table_returns_stored_metadata(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    given_table.transaction().set_properties(key3="value3").commit_transaction()
+    # When
+    response = requests.get(TEST_TABLE_URL).json()
+    # Then
+    input_file = given_table.io.new_input(response["metadata_location"])
+    with input_file.open() as input_stream:
+        assert response["metadata"] == json.load(input_stream)
+    assert response["config"] == {**TEST_TABLE_PROPERTIES, "key3": "value3"}
+
+
+def given_table_has_snapshots(table: Table, count: int) -> None:
+    arrow_schema = pa.schema(
+        [pa.field(name, pa.int64(), nullable=False) for name in ("x", "y", "z")]
+    )
+    for i in range(count):
+        table.append(pa.Table.from_pylist([{"x": i, "y": i, "z": i}], arrow_schema))
+
+
+def test_load_table_compressed(catalog: Catalog) -> None:
+    # Given
+    given_table_has_snapshots(given_catalog_has_a_table(catalog), 3)
+    uncompressed = requests.get(TEST_TABLE_URL, headers={"Accept-Encoding": "identity"})
+    # When
+    response = requests.get(TEST_TABLE_URL, headers={"Accept-Encoding": "gzip"})
+    # Then
+    assert "Content-Encoding" not in uncompressed.headers
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json() == uncompressed.json()
+
+
+def test_create_table_transaction(catalog: Catalog) -> None:
+    # Given
+    catalog.create_namespace(TEST_TABLE_NAMESPACE)
+    transaction = catalog.create_table_transaction(
+        identifier=TEST_TABLE_IDENTIFIER,
+        schema=TEST_TABLE_SCHEMA,
+        partition_spec=TEST_TABLE_PARTITION_SPEC,
+        properties=TEST_TABLE_PROPERTIES,
+    )
+    transaction.set_properties(key3="value3")
+    assert not catalog.table_exists(TEST_TABLE_IDENTIFIER)
+    # When
+    transaction.commit_transaction()
+    # Then
+    table = catalog.load_table(TEST_TABLE_IDENTIFIER)
+    assert table.properties == {**TEST_TABLE_PROPERTIES, "key3": "value3"}
+    assert table.schema() == TEST_TABLE_SCHEMA
+
+
+def test_stage_create_table_writes_nothing(catalog: Catalog) -> None:
+    # Given
+    catalog.create_namespace(TEST_TABLE_NAMESPACE)
+    url = f"{REST_ENDPOINT}v1/namespaces/{TEST_TABLE_NAMESPACE[0]}/tables"
+    body = {
+        "name": TEST_TABLE_NAME,
+        "schema": json.loads(TEST_TABLE_SCHEMA.model_dump_json()),
+        "partition-spec": {"spec-id": 0, "fields": []},
+        "location": f"{DEFAULT_WAREHOUSE_LOCATION}/staged_{uuid.uuid4()}",
+        "properties": TEST_TABLE_PROPERTIES,
+        "stage-create": True,
+    }
+    # When
+    response = requests.post(url, json=body)
+    # Then
+    assert response.status_code == 200
+    assert response.json()["metadata_location"] is None
+    location = response.json()["metadata"]["location"]
+    assert not PosixPath(location.removeprefix("file://")).exists()
+    assert not catalog.table_exists(TEST_TABLE_IDENTIFIER)
+
+
+def test_stage_create_table_raises_error_when_table_already_exists(
+    catalog: Catalog,
+) -> None:
+    given_catalog_has_a_table(catalog)
+    with pytest.raises(TableAlreadyExistsError, match=TABLE_ALREADY_EXISTS_ERROR):
+        catalog.create_table_transaction(
+            identifier=TEST_TABLE_IDENTIFIER, schema=TEST_TABLE_SCHEMA
+        )
+
+
+def test_create_table_with_compressed_metadata(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(
+        catalog,
+        properties={
+            **TEST_TABLE_PROPERTIES,
+            "write.metadata.compression-codec": "gzip",
+        },
+    )
+    # When
+    given_table.transaction().set_properties(key3="value3").commit_transaction()
+    table = catalog.load_table(TEST_TABLE_IDENTIFIER)
+    # Then
+    assert table.metadata_location.endswith(".gz.metadata.json")
+    with table.io.new_input(table.metadata_location).open() as input_stream:
+        assert input_stream.read(2) == b"\x1f\x8b"
+    assert table.properties["key3"] == "value3"
+    assert requests.get(TEST_TABLE_URL).json()["metadata"] == json.loads(
+        table.metadata.model_dump_json(exclude_none=True)
+    )
+
+
+def test_commit_switches_metadata_compression(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    assert not given_table.metadata_location.endswith(".gz.metadata.json")
+    # When
+    given_table.transaction().set_properties(
+        {"write.metadata.compression-codec": "gzip"}
+    ).commit_transaction()
+    # Then
+    table = catalog.load_table(TEST_TABLE_IDENTIFIER)
+    assert table.metadata_location.endswith(".gz.metadata.json")
+    assert table.properties["write.metadata.compression-codec"] == "gzip"
+
+
+def test_unsupported_metadata_compression_is_rejected(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    # Then
+    with pytest.raises(BadRequestError, match="Unsupported metadata compression"):
+        given_table.transaction().set_properties(
+            {"write.metadata.compression-codec": "snappy"}
+        ).commit_transaction()
+    with pytest.raises(BadRequestError, match="Unsupported metadata compression"):
+        catalog.create_table(
+            identifier=(settings.CATALOG_NAME, "my_other_table"),
+            schema=TEST_TABLE_SCHEMA,
+            properties={"write.metadata.compression-codec": "snappy"},
+        )
+
+
+def test_commit_prunes_old_metadata_files(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(
+        catalog,
+        properties={
+            **TEST_TABLE_PROPERTIES,
+            "write.metadata.delete-after-commit.enabled": "true",
+            "write.metadata.previous-versions-max": "2",
+        },
+    )
+    metadata_locations = [given_table.metadata_location]
+    # When
+    for i in range(4):
+        given_table.transaction().set_properties(key3=str(i)).commit_transaction()
+        metadata_locations.append(given_table.metadata_location)
+    # Then
+    assert [entry.metadata_file for entry in given_table.metadata.metadata_log] == (
+        metadata_locations[2:4]
+    )
+    for _ in range(50):
+        if not any(
+            given_table.io.new_input(location).exists()
+            for location in metadata_locations[:2]
+        ):
+            break
+        time.sleep(0.1)
+    assert [
+        given_table.io.new_input(location).exists() for location in metadata_locations
+    ] == [False, False, True, True, True]
+
+
+def test_expire_snapshots(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    given_table_has_snapshots(given_table, 3)
+    expired_manifest_lists = [
+        snapshot.manifest_list for snapshot in given_table.metadata.snapshots[:2]
+    ]
+    # When
+    response = requests.post(
+        f"{TEST_TABLE_URL}/expire-snapshots",
+        json={"older_than_ms": 2**62, "retain_last": 1},
+    )
+    job_url = f"{REST_ENDPOINT}{response.headers['Location'].lstrip('/')}"
+    for _ in range(50):
+        job = requests.get(job_url).json()
+        if job["status"] not in ("pending", "running"):
+            break
+        time.sleep(0.1)
+    # Then
+    assert response.status_code == 202
+    assert job["status"] == "succeeded"
+    assert len(job["expired_snapshot_ids"]) == 2
+    assert job["deleted_files"] == 2
+    table = catalog.load_table(TEST_TABLE_IDENTIFIER)
+    assert len(table.metadata.snapshots) == 1
+    assert not any(
+        table.io.new_input(location).exists() for location in expired_manifest_lists
+    )
+    assert len(table.scan().to_arrow()) == 3
+
+
+def test_load_table_with_referenced_snapshots_only(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    given_table_has_snapshots(given_table, 3)
+    # When
+    all_snapshots = requests.get(TEST_TABLE_URL, params={"snapshots": "all"})
+    refs_snapshots = requests.get(TEST_TABLE_URL, params={"snapshots": "refs"})
+    # Then
+    metadata = refs_snapshots.json()["metadata"]
+    assert len(all_snapshots.json()["metadata"]["snapshots"]) == 3
+    assert [snapshot["snapshot-id"] for snapshot in metadata["snapshots"]] == [
+        metadata["current-snapshot-id"]
+    ]
+    assert refs_snapshots.headers["ETag"] != all_snapshots.headers["ETag"]
+
+
 def test_drop_table(catalog: Catalog) -> None:
     # Given
     given_catalog_has_a_table(catalog)
@@ -363,6 +649,181 @@ def test_rename_table_from_self_identifier(catalog: Catalog) -> None:
         catalog.load_table(TEST_TABLE_IDENTIFIER)
 
 
+def test_list_tables_in_pages(catalog: Catalog) -> None:
+    # Given
+    catalog.create_namespace(TEST_TABLE_NAMESPACE)
+    table_names = [f"table_{i}" for i in range(5)]
+    for table_name in reversed(table_names):
+        catalog.create_table((*TEST_TABLE_NAMESPACE, table_name), TEST_TABLE_SCHEMA)
+    url = f"{REST_ENDPOINT}v1/namespaces/{TEST_TABLE_NAMESPACE[0]}/tables"
+    # When
+    pages = [requests.get(url, params={"pageToken": "", "pageSize": 2}).json()]
+    while "next-page-token" in pages[-1]:
+        pages.append(
+            requests.get(
+                url,
+                params={"pageToken": pages[-1]["next-page-token"], "pageSize": 2},
+            ).json()
+        )
+    # Then
+    assert [
+        [identifier["name"] for identifier in page["identifiers"]] for page in pages
+    ] == [table_names[0:2], table_names[2:4], table_names[4:]]
+    assert requests.get(url, params={"pageToken": "not a token"}).status_code == 400
+
+
+def test_list_tables_matching_a_name_pattern(catalog: Catalog) -> None:
+    # Given
+    catalog.create_namespace(TEST_TABLE_NAMESPACE)
+    for table_name in ["events_2023", "events_2024_01", "events_2024_02", "eventsx"]:
+        catalog.create_table((*TEST_TABLE_NAMESPACE, table_name), TEST_TABLE_SCHEMA)
+    url = f"{REST_ENDPOINT}v1/namespaces/{TEST_TABLE_NAMESPACE[0]}/tables"
+    # When
+    matching = requests.get(url, params={"namePattern": "events_2024*"}).json()
+    first_page = requests.get(
+        url, params={"namePattern": "events_*", "pageSize": 2}
+    ).json()
+    second_page = requests.get(
+        url,
+        params={
+            "namePattern": "events_*",
+            "pageToken": first_page["next-page-token"],
+            "pageSize": 2,
+        },
+    ).json()
+    # Then
+    assert [identifier["name"] for identifier in matching["identifiers"]] == [
+        "events_2024_01",
+        "events_2024_02",
+    ]
+    assert [
+        identifier["name"]
+        for page in (first_page, second_page)
+        for identifier in page["identifiers"]
+    ] == ["events_2023", "events_2024_01", "events_2024_02"]
+    assert "next-page-token" not in second_page
+    assert (
+        requests.get(
+            url,
+            params={"pageToken": first_page["next-page-token"], "pageSize": 2},
+        ).status_code
+        == 400
+    )
+
+
+def test_list_tables_name_pattern_is_case_sensitive(catalog: Catalog) -> None:
+    # Given
+    catalog.create_namespace(TEST_TABLE_NAMESPACE)
+    for table_name in ["aXB", "aXb", "abcb", "a_B"]:
+        catalog.create_table((*TEST_TABLE_NAMESPACE, table_name), TEST_TABLE_SCHEMA)
+    url = f"{REST_ENDPOINT}v1/namespaces/{TEST_TABLE_NAMESPACE[0]}/tables"
+    # When
+    matching = requests.get(url, params={"namePattern": "a*B"}).json()
+    streamed = requests.get(
+        url,
+        params={"namePattern": "a?B"},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    # Then
+    assert [identifier["name"] for identifier in matching["identifiers"]] == [
+        "aXB",
+        "a_B",
+    ]
+    assert [json.loads(line)["name"] for line in streamed.text.splitlines()] == [
+        "aXB",
+        "a_B",
+    ]
+
+
+def test_list_tables_as_ndjson_stream(catalog: Catalog) -> None:
+    # Given
+    catalog.create_namespace(TEST_TABLE_NAMESPACE)
+    for table_name in ["events_2024", "clicks", "events_2023"]:
+        catalog.create_table((*TEST_TABLE_NAMESPACE, table_name), TEST_TABLE_SCHEMA)
+    url = f"{REST_ENDPOINT}v1/namespaces/{TEST_TABLE_NAMESPACE[0]}/tables"
+    headers = {"Accept": "application/x-ndjson"}
+    # When
+    response = requests.get(url, headers=headers, stream=True)
+    events = requests.get(url, headers=headers, params={"namePattern": "events*"})
+    # Then
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.iter_lines()] == [
+        {"namespace": ["default"], "name": "clicks"},
+        {"namespace": ["default"], "name": "events_2023"},
+        {"namespace": ["default"], "name": "events_2024"},
+    ]
+    assert [json.loads(line)["name"] for line in events.text.splitlines()] == [
+        "events_2023",
+        "events_2024",
+    ]
+    assert (
+        requests.get(
+            f"{REST_ENDPOINT}v1/namespaces/missing/tables", headers=headers
+        ).status_code
+        == 404
+    )
+
+
+def test_list_namespaces_as_ndjson_stream(catalog: Catalog) -> None:
+    # Given
+    for namespace in [("accounting", "tax"), ("billing",)]:
+        catalog.create_namespace(namespace)
+    # When
+    response = requests.get(
+        f"{REST_ENDPOINT}v1/namespaces",
+        headers={"Accept": "application/x-ndjson"},
+    )
+    # Then
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        ["accounting"],
+        ["billing"],
+    ]
+
+
+def test_list_changes(catalog: Catalog) -> None:
+    # Given
+    table = given_catalog_has_a_table(catalog)
+    created_metadata_location = table.metadata_location
+    table.transaction().set_properties(key3="value3").commit_transaction()
+    catalog.create_namespace(("new_namespace",))
+    catalog.rename_table(TEST_TABLE_IDENTIFIER, ("new_namespace", "new_table"))
+    catalog.drop_table(("new_namespace", "new_table"))
+    catalog.update_namespace_properties(("new_namespace",), updates={"key": "value"})
+    catalog.drop_namespace(("new_namespace",))
+    # When
+    first_page = requests.get(f"{REST_ENDPOINT}v1/changes", params={"pageSize": 5})
+    second_page = requests.get(
+        f"{REST_ENDPOINT}v1/changes",
+        params={"since": first_page.json()["next_since"], "pageSize": 5},
+    )
+    # Then
+    changes = first_page.json()["changes"] + second_page.json()["changes"]
+    assert [change["operation"] for change in changes] == [
+        "create-namespace",
+        "create-table",
+        "commit-table",
+        "create-namespace",
+        "rename-table",
+        "drop-table",
+        "update-namespace-properties",
+        "drop-namespace",
+    ]
+    assert [change["sequence_number"] for change in changes] == list(
+        range(changes[0]["sequence_number"], changes[0]["sequence_number"] + 8)
+    )
+    assert changes[0]["namespace"] == ["default"]
+    assert "identifier" not in changes[0]
+    assert changes[2]["previous_metadata_location"] == created_metadata_location
+    assert changes[4]["identifier"] == {
+        "namespace": ["new_namespace"],
+        "name": "new_table",
+    }
+    assert changes[4]["source"] == {"namespace": ["default"], "name": "my_table"}
+    assert "metadata_location" not in changes[5]
+    assert changes[7]["namespace"] == ["new_namespace"]
+    assert second_page.json()["next_since"] == changes[-1]["sequence_number"]
+
+
 def test_create_namespace(catalog: Catalog) -> None:
     # When
     catalog.create_namespace(TEST_TABLE_NAMESPACE, TEST_TABLE_PROPERTIES)
@@ -400,6 +861,120 @@ def test_list_namespaces(catalog: Catalog) -> None:
     assert TEST_TABLE_NAMESPACE in namespaces
 
 
+def test_list_namespaces_in_pages(catalog: Catalog) -> None:
+    # Given
+    namespace_names = [f"namespace_{i}" for i in range(5)]
+    for namespace_name in reversed(namespace_names):
+        catalog.create_namespace((namespace_name,))
+    catalog.create_table(("namespace_0", "my_table"), TEST_TABLE_SCHEMA)
+    url = f"{REST_ENDPOINT}v1/namespaces"
+    # When
+    pages = [requests.get(url, params={"pageToken": "", "pageSize": 2}).json()]
+    while "next-page-token" in pages[-1]:
+        pages.append(
+            requests.get(
+                url,
+                params={"pageToken": pages[-1]["next-page-token"], "pageSize": 2},
+            ).json()
+        )
+    # Then
+    assert [page["namespaces"] for page in pages] == [
+        [[name] for name in namespace_names[0:2]],
+        [[name] for name in namespace_names[2:4]],
+        [[name] for name in namespace_names[4:]],
+    ]
+
+
+def test_list_namespaces_one_level_at_a_time(catalog: Catalog) -> None:
+    # Given
+    for namespace in [
+        ("accounting",),
+        ("accounting", "tax"),
+        ("accounting", "tax", "paid"),
+        ("accounting", "tax-2024"),
+        ("accounting", "tax", "due"),
+        ("billing", "invoices"),
+    ]:
+        catalog.create_namespace(namespace)
+    # When
+    top_level = catalog.list_namespaces()
+    accounting = catalog.list_namespaces(("accounting",))
+    accounting_tax = catalog.list_namespaces(("accounting", "tax"))
+    pages = [
+        requests.get(
+            f"{REST_ENDPOINT}v1/namespaces",
+            params={"parent": "accounting", "pageSize": 1},
+        ).json()
+    ]
+    while "next-page-token" in pages[-1]:
+        pages.append(
+            requests.get(
+                f"{REST_ENDPOINT}v1/namespaces",
+                params={
+                    "parent": "accounting",
+                    "pageToken": pages[-1]["next-page-token"],
+                    "pageSize": 1,
+                },
+            ).json()
+        )
+    # Then
+    assert top_level == [("accounting",), ("billing",)]
+    assert accounting == [("accounting", "tax"), ("accounting", "tax-2024")]
+    assert accounting_tax == [
+        ("accounting", "tax", "due"),
+        ("accounting", "tax", "paid"),
+    ]
+    assert [namespace for page in pages for namespace in page["namespaces"]] == [
+        ["accounting", "tax"],
+        ["accounting", "tax-2024"],
+    ]
+    assert catalog.list_namespaces(("billing",)) == [("billing", "invoices")]
+    assert (
+        requests.get(
+            f"{REST_ENDPOINT}v1/namespaces", params={"parent": "payroll"}
+        ).status_code
+        == 404
+    )
+
+
+def test_list_namespaces_matching_a_name_pattern(catalog: Catalog) -> None:
+    # Given
+    for namespace in [
+        ("tenant_a",),
+        ("tenant_a", "sales"),
+        ("tenant_b", "sales"),
+        ("tenant_b", "marketing"),
+        ("tenantless",),
+    ]:
+        catalog.create_namespace(namespace)
+    url = f"{REST_ENDPOINT}v1/namespaces"
+    # When
+    tenants = requests.get(url, params={"namePattern": "tenant_?"}).json()
+    sales = requests.get(url, params={"parent": "tenant_b", "namePattern": "s*"}).json()
+    # Then
+    assert tenants["namespaces"] == [["tenant_a"], ["tenant_b"]]
+    assert sales["namespaces"] == [["tenant_b", "sales"]]
+
+
+def test_table_in_a_multipart_namespace(catalog: Catalog) -> None:
+    # Given
+    namespace = ("finance", "reports")
+    catalog.create_namespace(namespace, TEST_TABLE_PROPERTIES)
+    # When
+    table = catalog.create_table((*namespace, TEST_TABLE_NAME), TEST_TABLE_SCHEMA)
+    table.transaction().set_properties(key3="value3").commit_transaction()
+    # Then
+    assert catalog.load_namespace_properties(namespace) == TEST_TABLE_PROPERTIES
+    assert catalog.list_tables(namespace) == [(*namespace, TEST_TABLE_NAME)]
+    assert catalog.load_table((*namespace, TEST_TABLE_NAME)).properties == {
+        "key3": "value3"
+    }
+    catalog.rename_table((*namespace, TEST_TABLE_NAME), (*namespace, "new_table"))
+    assert catalog.table_exists((*namespace, "new_table"))
+    catalog.drop_table((*namespace, "new_table"))
+    assert catalog.list_tables(namespace) == []
+
+
 def test_drop_namespace(catalog: Catalog) -> None:
     # Given
     catalog.create_namespace(TEST_TABLE_NAMESPACE, TEST_TABLE_PROPERTIES)
@@ -424,6 +999,19 @@ def test_drop_namespace_raises_error_when_namespace_not_empty(catalog: Catalog)
         catalog.drop_namespace(TEST_TABLE_NAMESPACE)
 
 
+def test_drop_namespace_raises_error_when_namespace_has_children(
+    catalog: Catalog,
+) -> None:
+    # Given
+    catalog.create_namespace(TEST_TABLE_NAMESPACE)
+    catalog.create_namespace((*TEST_TABLE_NAMESPACE, "child"))
+    # When
+    with pytest.raises(NamespaceNotEmptyError, match=NAMESPACE_NOT_EMPTY_ERROR):
+        catalog.drop_namespace(TEST_TABLE_NAMESPACE)
+    # Then
+    assert TEST_TABLE_NAMESPACE in catalog.list_namespaces()
+
+
 def test_list_tables(catalog: Catalog) -> None:
     # Given
     given_catalog_has_a_table(catalog)
@@ -538,6 +1126,254 @@ def test_commit_table(catalog: Catalog) -> None:
     assert response.metadata.current_schema_id == new_schema.schema_id
 
 
+def test_concurrent_commits_are_retried_on_the_server(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+
+    # When
+    def set_property(i: int) -> None:
+        given_table.transaction().set_properties(
+            {f"key{i}": "value"}
+        ).commit_transaction()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(set_property, range(3, 11)))
+    # Then
+    properties = catalog.load_table(TEST_TABLE_IDENTIFIER).properties
+    assert all(properties[f"key{i}"] == "value" for i in range(3, 11))
+
+
+def test_concurrent_appends_are_group_committed(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(
+        catalog,
+        properties={**TEST_TABLE_PROPERTIES, "commit.group-commit.enabled": "true"},
+    )
+    given_table_has_snapshots(given_table, 1)
+    tables = [catalog.load_table(TEST_TABLE_IDENTIFIER) for _ in range(6)]
+    # When
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(given_table_has_snapshots, tables, [1] * len(tables)))
+    # Then
+    table = catalog.load_table(TEST_TABLE_IDENTIFIER)
+    assert len(table.scan().to_arrow()) == 7
+    assert table.current_snapshot().summary["total-records"] == "7"
+    assert len(list(ancestors_of(table.current_snapshot(), table.metadata))) == 7
+
+
+def test_stale_merge_append_is_not_group_committed(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(
+        catalog,
+        properties={
+            **TEST_TABLE_PROPERTIES,
+            "commit.group-commit.enabled": "true",
+            "commit.manifest-merge.enabled": "true",
+            "commit.manifest.min-count-to-merge": "2",
+        },
+    )
+    given_table_has_snapshots(given_table, 1)
+    stale_table = catalog.load_table(TEST_TABLE_IDENTIFIER)
+    given_table_has_snapshots(given_table, 1)
+    # Then
+    with pytest.raises(CommitFailedException):
+        given_table_has_snapshots(stale_table, 1)
+    assert len(catalog.load_table(TEST_TABLE_IDENTIFIER).scan().to_arrow()) == 2
+
+
+def test_concurrent_appends_conflict_without_group_commit(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    given_table_has_snapshots(given_table, 1)
+    stale_table = catalog.load_table(TEST_TABLE_IDENTIFIER)
+    given_table_has_snapshots(given_table, 1)
+    # Then
+    with pytest.raises(CommitFailedException):
+        given_table_has_snapshots(stale_table, 1)
+
+
+TEST_TRANSACTION_URL = f"{REST_ENDPOINT}v1/transactions/commit"
+
+
+def given_catalog_has_two_tables(catalog: Catalog) -> Tuple[Table, Table]:
+    first_table = given_catalog_has_a_table(catalog)
+    second_table = catalog.create_table(
+        identifier=(settings.CATALOG_NAME, "my_other_table"),
+        schema=TEST_TABLE_SCHEMA,
+        properties=TEST_TABLE_PROPERTIES,
+    )
+    return first_table, second_table
+
+
+def table_change(table: Table, table_uuid: str, key3: str) -> Dict[str, Any]:
+    return {
+        "identifier": {
+            "namespace": list(TEST_TABLE_NAMESPACE),
+            "name": table.name()[-1],
+        },
+        "requirements": [{"type": "assert-table-uuid", "uuid": table_uuid}],
+        "updates": [{"action": "set-properties", "updates": {"key3": key3}}],
+    }
+
+
+def test_commit_transaction(catalog: Catalog) -> None:
+    # Given
+    tables = given_catalog_has_two_tables(catalog)
+    # When
+    response = requests.post(
+        TEST_TRANSACTION_URL,
+        json={
+            "table-changes": [
+                table_change(table, str(table.metadata.table_uuid), "value3")
+                for table in tables
+            ]
+        },
+    )
+    # Then
+    assert response.status_code == 200
+    for table in tables:
+        assert catalog.load_table(table.identifier).properties["key3"] == "value3"
+
+
+def test_commit_transaction_is_atomic(catalog: Catalog) -> None:
+    # Given
+    first_table, second_table = given_catalog_has_two_tables(catalog)
+    # When
+    response = requests.post(
+        TEST_TRANSACTION_URL,
+        json={
+            "table-changes": [
+                table_change(first_table, str(first_table.metadata.table_uuid), "v"),
+                table_change(second_table, str(first_table.metadata.table_uuid), "v"),
+            ]
+        },
+    )
+    # Then
+    assert response.status_code == 409
+    for table in (first_table, second_table):
+        assert "key3" not in catalog.load_table(table.identifier).properties
+
+
+def test_commit_with_idempotency_key_is_applied_once(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    change = table_change(given_table, str(given_table.metadata.table_uuid), "value3")
+    headers = {"Idempotency-Key": "7f7a3a5e-commit"}
+    first_response = requests.post(TEST_TABLE_URL, json=change, headers=headers)
+    # When
+    retry_response = requests.post(TEST_TABLE_URL, json=change, headers=headers)
+    # Then
+    assert first_response.status_code == retry_response.status_code == 200
+    assert retry_response.json() == first_response.json()
+    table = catalog.load_table(TEST_TABLE_IDENTIFIER)
+    assert table.metadata_location == first_response.json()["metadata_location"]
+    assert len(table.metadata.metadata_log) == 1
+
+
+def test_commit_retried_after_its_metadata_was_pruned(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(
+        catalog,
+        properties={
+            **TEST_TABLE_PROPERTIES,
+            "write.metadata.delete-after-commit.enabled": "true",
+            "write.metadata.previous-versions-max": "1",
+        },
+    )
+    change = table_change(given_table, str(given_table.metadata.table_uuid), "value3")
+    headers = {"Idempotency-Key": "7f7a3a5e-pruned"}
+    first_response = requests.post(TEST_TABLE_URL, json=change, headers=headers)
+    metadata_location = first_response.json()["metadata_location"]
+    given_table.refresh()
+    for i in range(2):
+        given_table.transaction().set_properties(key3=str(i)).commit_transaction()
+    for _ in range(50):
+        if not given_table.io.new_input(metadata_location).exists():
+            break
+        time.sleep(0.1)
+    # When
+    retry_response = requests.post(TEST_TABLE_URL, json=change, headers=headers)
+    # Then
+    assert first_response.status_code == 200
+    assert retry_response.status_code == 410
+    assert metadata_location in retry_response.json()["error"]["message"]
+
+
+def test_idempotency_key_reused_for_another_request(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    table_uuid = str(given_table.metadata.table_uuid)
+    headers = {"Idempotency-Key": "7f7a3a5e-reused"}
+    requests.post(
+        TEST_TABLE_URL, json=table_change(given_table, table_uuid, "v"), headers=headers
+    )
+    # When
+    response = requests.post(
+        TEST_TABLE_URL, json=table_change(given_table, table_uuid, "w"), headers=headers
+    )
+    # Then
+    assert response.status_code == 422
+    assert catalog.load_table(TEST_TABLE_IDENTIFIER).properties["key3"] == "v"
+
+
+def test_create_table_with_idempotency_key_is_applied_once(catalog: Catalog) -> None:
+    # Given
+    url = f"{REST_ENDPOINT}v1/namespaces/{TEST_TABLE_NAMESPACE[0]}/tables"
+    body = {
+        "name": TEST_TABLE_NAME,
+        "schema": json.loads(TEST_TABLE_SCHEMA.model_dump_json()),
+        "partition-spec": {"spec-id": 0, "fields": []},
+        "properties": TEST_TABLE_PROPERTIES,
+    }
+    headers = {"Idempotency-Key": "7f7a3a5e-create"}
+    catalog.create_namespace(TEST_TABLE_NAMESPACE)
+    first_response = requests.post(url, json=body, headers=headers)
+    # When
+    retry_response = requests.post(url, json=body, headers=headers)
+    # Then
+    assert first_response.status_code == retry_response.status_code == 200
+    assert retry_response.json() == first_response.json()
+    assert requests.post(url, json=body).status_code == 409
+
+
+def test_commit_with_failed_requirement_fails_before_loading(
+    catalog: Catalog,
+) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    change = table_change(given_table, "8a1b6ae2-93d3-4e14-a8a4-4b83f3f8c8d4", "v")
+    # When
+    response = requests.post(TEST_TABLE_URL, json=change)
+    # Then
+    assert response.status_code == 409
+    phases = [
+        entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")
+    ]
+    assert "precheck" in phases
+    assert "load" not in phases
+
+
+def test_commit_reports_phase_timings(catalog: Catalog) -> None:
+    # Given
+    given_table = given_catalog_has_a_table(catalog)
+    # When
+    response = requests.post(
+        TEST_TABLE_URL,
+        json=table_change(given_table, str(given_table.metadata.table_uuid), "value3"),
+    )
+    metrics = requests.get(f"{REST_ENDPOINT}metrics").text
+    # Then
+    assert response.status_code == 200
+    phases = [
+        entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")
+    ]
+    assert {"parse", "wait", "load", "write", "swap", "total"} <= set(phases)
+    assert (
+        'iceberg_rest_commit_phase_seconds_count{phase="swap",outcome="success"}'
+        in metrics
+    )
+
+
 def test_add_column(catalog: Catalog) -> None:
     given_table = given_catalog_has_a_table(catalog)
 
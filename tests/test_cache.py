@@ -0,0 +1,184 @@
+import time
+from pathlib import PosixPath
+
+import pytest
+from iceberg_rest.cache import (
+    PARSED_METADATA_WEIGHT,
+    CachedMetadata,
+    MetadataCache,
+    MissingTables,
+)
+from iceberg_rest.catalog import RestSqlCatalog
+from iceberg_rest.settings import settings
+
+TEST_TABLE_IDENTIFIER = ("default", "my_table")
+TEST_METADATA_JSON = b"""{
+    "format-version": 2,
+    "table-uuid": "9c12d441-03fe-4693-9a96-a0705ddf69c1",
+    "location": "s3://bucket/test/location",
+    "last-sequence-number": 0,
+    "last-updated-ms": 1602638573590,
+    "last-column-id": 1,
+    "current-schema-id": 0,
+    "schemas": [{"type": "struct", "schema-id": 0, "fields": [{"id": 1, "name": "x", "required": true, "type": "long"}]}],
+    "default-spec-id": 0,
+    "partition-specs": [{"spec-id": 0, "fields": []}],
+    "last-partition-id": 999,
+    "default-sort-order-id": 0,
+    "sort-orders": [{"order-id": 0, "fields": []}],
+    "properties": {"key1": "value1"}
+}"""
+
+
+def entry_of_size(size: int) -> CachedMetadata:
+    return CachedMetadata(size, json_bytes=b" " * size)
+
+
+def test_get_returns_cached_metadata() -> None:
+    cache = MetadataCache(max_bytes=100)
+    entry = entry_of_size(10)
+    cache.put("s3://warehouse/00000.metadata.json", entry)
+    assert cache.get("s3://warehouse/00000.metadata.json") is entry
+    assert cache.get("s3://warehouse/00001.metadata.json") is None
+
+
+def test_evicts_least_recently_used_entries_by_size() -> None:
+    cache = MetadataCache(max_bytes=100)
+    cache.put("a", entry_of_size(40))
+    cache.put("b", entry_of_size(40))
+    cache.get("a")
+    cache.put("c", entry_of_size(40))
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.current_bytes == 80
+
+
+def test_entry_larger_than_the_cache_is_not_stored() -> None:
+    cache = MetadataCache(max_bytes=100)
+    cache.put("a", entry_of_size(101))
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
+
+
+def test_bind_evicts_superseded_location() -> None:
+    cache = MetadataCache(max_bytes=100)
+    cache.put("v0", entry_of_size(10))
+    cache.bind(TEST_TABLE_IDENTIFIER, "v0")
+    cache.put("v1", entry_of_size(10))
+    cache.bind(TEST_TABLE_IDENTIFIER, "v1")
+    assert cache.get("v0") is None
+    assert cache.get("v1") is not None
+
+
+def test_invalidate_and_forget() -> None:
+    cache = MetadataCache(max_bytes=100)
+    cache.put("v0", entry_of_size(10))
+    cache.bind(TEST_TABLE_IDENTIFIER, "v0")
+    cache.forget(TEST_TABLE_IDENTIFIER)
+    cache.invalidate(TEST_TABLE_IDENTIFIER)
+    assert cache.get("v0") is not None
+    cache.bind(TEST_TABLE_IDENTIFIER, "v0")
+    cache.invalidate(TEST_TABLE_IDENTIFIER)
+    assert cache.get("v0") is None
+
+
+def test_cached_metadata_is_parsed_lazily() -> None:
+    entry = CachedMetadata(len(TEST_METADATA_JSON), json_bytes=TEST_METADATA_JSON)
+    assert entry.properties == {"key1": "value1"}
+    assert entry._metadata is None
+    assert str(entry.metadata.table_uuid) == "9c12d441-03fe-4693-9a96-a0705ddf69c1"
+    assert entry.properties == {"key1": "value1"}
+
+
+def test_entries_are_reweighed_as_they_grow() -> None:
+    size = len(TEST_METADATA_JSON)
+    cache = MetadataCache(max_bytes=size * (PARSED_METADATA_WEIGHT + 1) + 10)
+    entry = CachedMetadata(size, json_bytes=TEST_METADATA_JSON)
+    cache.put("v0", entry)
+    assert cache.current_bytes == size
+    entry.metadata
+    assert cache.current_bytes == size * (PARSED_METADATA_WEIGHT + 1)
+    entry.add_encoded_body("gzip", b" " * 10)
+    assert cache.current_bytes == size * (PARSED_METADATA_WEIGHT + 1) + 10
+    # Growing past the bound evicts the entry like any other
+    entry.add_encoded_body("zstd", b" " * 10)
+    assert cache.get("v0") is None
+    assert cache.current_bytes == 0
+
+
+def test_stream_metadata_reads_the_file_once(tmp_path: PosixPath) -> None:
+    catalog = RestSqlCatalog(
+        "test", uri=f"sqlite:///{tmp_path}/catalog.db", warehouse=f"file://{tmp_path}"
+    )
+    metadata_location = f"file://{tmp_path}/00000.metadata.json"
+    (tmp_path / "00000.metadata.json").write_bytes(TEST_METADATA_JSON)
+    assert (
+        catalog.load_cached_metadata(TEST_TABLE_IDENTIFIER, metadata_location) is None
+    )
+    # When
+    stream = catalog.stream_metadata(
+        TEST_TABLE_IDENTIFIER, metadata_location, chunk_size=64
+    )
+    chunks = []
+    try:
+        while True:
+            chunks.append(next(stream))
+    except StopIteration as stop:
+        entry = stop.value
+    (tmp_path / "00000.metadata.json").unlink()
+    # Then
+    assert b"".join(chunks) == TEST_METADATA_JSON
+    assert entry.properties == {"key1": "value1"}
+    cached = catalog.load_cached_metadata(TEST_TABLE_IDENTIFIER, metadata_location)
+    assert cached is entry
+
+
+def test_missing_tables_expire() -> None:
+    missing = MissingTables(ttl_seconds=0.05)
+    missing.add(TEST_TABLE_IDENTIFIER, missing.generation)
+    assert TEST_TABLE_IDENTIFIER in missing
+    time.sleep(0.06)
+    assert TEST_TABLE_IDENTIFIER not in missing
+
+
+def test_missing_tables_skip_misses_that_raced_with_a_create() -> None:
+    missing = MissingTables(ttl_seconds=60)
+    generation = missing.generation
+    missing.discard(TEST_TABLE_IDENTIFIER)
+    missing.add(TEST_TABLE_IDENTIFIER, generation)
+    assert TEST_TABLE_IDENTIFIER not in missing
+    missing.add(TEST_TABLE_IDENTIFIER, missing.generation)
+    missing.discard(TEST_TABLE_IDENTIFIER)
+    assert TEST_TABLE_IDENTIFIER not in missing
+
+
+def test_stream_metadata_raises_before_streaming_a_missing_file(
+    tmp_path: PosixPath,
+) -> None:
+    catalog = RestSqlCatalog(
+        "test", uri=f"sqlite:///{tmp_path}/catalog.db", warehouse=f"file://{tmp_path}"
+    )
+    with pytest.raises(FileNotFoundError):
+        catalog.stream_metadata(
+            TEST_TABLE_IDENTIFIER, f"file://{tmp_path}/00000.metadata.json"
+        )
+
+
+def test_metadata_too_large_to_cache_is_not_parsed(
+    tmp_path: PosixPath, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    size = len(TEST_METADATA_JSON)
+    monkeypatch.setattr(settings, "CATALOG_METADATA_PASSTHROUGH_MAX_BYTES", size - 1)
+    catalog = RestSqlCatalog(
+        "test", uri=f"sqlite:///{tmp_path}/catalog.db", warehouse=f"file://{tmp_path}"
+    )
+    catalog.metadata_cache.max_bytes = size * PARSED_METADATA_WEIGHT - 1
+    metadata_location = f"file://{tmp_path}/00000.metadata.json"
+    (tmp_path / "00000.metadata.json").write_bytes(TEST_METADATA_JSON)
+    # When
+    entry = catalog.read_metadata(metadata_location)
+    # Then
+    assert entry._metadata is None
+    assert entry.properties == {"key1": "value1"}
+    assert catalog.metadata_cache.get(metadata_location) is None
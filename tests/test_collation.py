@@ -0,0 +1,37 @@
+from pathlib import PosixPath
+
+from iceberg_rest.catalog import RestSqlCatalog
+from iceberg_rest.collation import _name_indexes, collate
+from sqlalchemy import String, column
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.schema import CreateIndex
+
+
+def test_sqlite_compares_names_by_code_point(tmp_path: PosixPath) -> None:
+    catalog = RestSqlCatalog(
+        "test", uri=f"sqlite:///{tmp_path}/catalog.db", warehouse=f"file://{tmp_path}"
+    )
+    assert catalog.name_collation is None
+    condition = collate(column("namespace", String), catalog.name_collation) < "a/"
+    assert str(condition.compile(compile_kwargs={"literal_binds": True})) == (
+        "namespace < 'a/'"
+    )
+
+
+def test_name_indexes_use_the_collation_of_the_lookups() -> None:
+    assert [
+        str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in _name_indexes("C")
+    ] == [
+        'CREATE INDEX iceberg_tables_namespace_bin ON iceberg_tables (catalog_name, (table_namespace COLLATE "C"))',
+        'CREATE INDEX iceberg_tables_name_bin ON iceberg_tables (catalog_name, table_namespace, (table_name COLLATE "C"))',
+        'CREATE INDEX iceberg_namespace_properties_namespace_bin ON iceberg_namespace_properties (catalog_name, (namespace COLLATE "C"))',
+    ]
+    assert [
+        str(CreateIndex(index).compile(dialect=mysql.dialect()))
+        for index in _name_indexes("utf8mb3_bin")
+    ] == [
+        "CREATE INDEX iceberg_tables_namespace_bin ON iceberg_tables (catalog_name, (table_namespace COLLATE utf8mb3_bin))",
+        "CREATE INDEX iceberg_tables_name_bin ON iceberg_tables (catalog_name, table_namespace, (table_name COLLATE utf8mb3_bin))",
+        "CREATE INDEX iceberg_namespace_properties_namespace_bin ON iceberg_namespace_properties (catalog_name, (namespace COLLATE utf8mb3_bin))",
+    ]
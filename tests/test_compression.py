@@ -0,0 +1,119 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from iceberg_rest.compression import (
+    GZIP,
+    ZSTD,
+    CompressionMiddleware,
+    available_encodings,
+    compress,
+    encoded_etag,
+    identity_etag,
+    negotiate_encoding,
+)
+
+BODY = "metadata" * 1000
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    def large() -> PlainTextResponse:
+        return PlainTextResponse(BODY, headers={"ETag": '"metadata"'})
+
+    @app.get("/small")
+    def small() -> PlainTextResponse:
+        return PlainTextResponse("metadata")
+
+    @app.get("/streamed")
+    def streamed() -> StreamingResponse:
+        return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+    @app.get("/encoded")
+    def encoded() -> PlainTextResponse:
+        return PlainTextResponse(
+            gzip.compress(BODY.encode()), headers={"Content-Encoding": "gzip"}
+        )
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", GZIP),
+        ("deflate, gzip;q=0.5", GZIP),
+        ("gzip;q=0", None),
+        ("*", available_encodings()[0]),
+        ("gzip, *;q=0", GZIP),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected) -> None:
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+@pytest.mark.skipif(
+    ZSTD not in available_encodings(), reason="zstandard is not installed"
+)
+def test_negotiate_encoding_prefers_zstd() -> None:
+    assert negotiate_encoding("gzip, zstd") == ZSTD
+    assert negotiate_encoding("gzip, zstd;q=0.5") == GZIP
+
+
+@pytest.mark.skipif(
+    ZSTD not in available_encodings(), reason="zstandard is not installed"
+)
+def test_compress_zstd() -> None:
+    import zstandard
+
+    compressed = compress(ZSTD, BODY.encode())
+    decompressor = zstandard.ZstdDecompressor().decompressobj()
+    assert decompressor.decompress(compressed) == BODY.encode()
+
+
+def test_compresses_large_responses(client: TestClient) -> None:
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) < len(BODY)
+    assert response.text == BODY
+
+
+def test_leaves_small_responses_uncompressed(client: TestClient) -> None:
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.text == "metadata"
+
+
+def test_compressed_bodies_get_their_own_etag(client: TestClient) -> None:
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["ETag"] == '"metadata-gzip"'
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert response.headers["ETag"] == '"metadata"'
+
+
+def test_identity_etag_reverses_encoded_etag() -> None:
+    assert identity_etag(encoded_etag('"metadata"', GZIP)) == '"metadata"'
+    assert identity_etag('"metadata"') == '"metadata"'
+    assert encoded_etag('W/"metadata"', GZIP) == 'W/"metadata"'
+
+
+def test_compresses_streamed_responses(client: TestClient) -> None:
+    response = client.get("/streamed", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == BODY * 2
+
+
+def test_passes_encoded_responses_through(client: TestClient) -> None:
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == BODY
@@ -0,0 +1,132 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from iceberg_rest.concurrency import GroupCommitQueue, KeyedLock, SingleFlight
+
+
+def test_single_flight_shares_result_between_concurrent_callers() -> None:
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch() -> str:
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "metadata"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leader = executor.submit(flights.do, "my_table", fetch)
+        started.wait()
+        followers = [executor.submit(flights.do, "my_table", fetch) for _ in range(7)]
+        # give the followers time to join the in-flight call
+        time.sleep(0.1)
+        release.set()
+        results = [leader.result()] + [follower.result() for follower in followers]
+
+    assert results == ["metadata"] * 8
+    assert len(calls) == 1
+
+
+def test_single_flight_runs_again_once_the_call_finished() -> None:
+    flights = SingleFlight()
+    assert flights.do("my_table", lambda: 1) == 1
+    assert flights.do("my_table", lambda: 2) == 2
+
+
+def test_single_flight_forget_starts_a_new_call_for_later_callers() -> None:
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch_stale() -> str:
+        started.set()
+        release.wait()
+        return "v0"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        stale = executor.submit(flights.do, "my_table", fetch_stale)
+        started.wait()
+        flights.forget("my_table")
+        # A caller arriving after the forget does not wait for the stale call
+        assert flights.do("my_table", lambda: "v1") == "v1"
+        release.set()
+        assert stale.result() == "v0"
+    assert flights.do("my_table", lambda: "v2") == "v2"
+
+
+def test_single_flight_propagates_errors() -> None:
+    flights = SingleFlight()
+
+    def fail() -> None:
+        raise ValueError("no such table")
+
+    with pytest.raises(ValueError, match="no such table"):
+        flights.do("my_table", fail)
+
+
+def test_keyed_lock_grants_turns_in_arrival_order() -> None:
+    lock = KeyedLock()
+    order = []
+
+    def commit(i: int) -> None:
+        with lock.hold("my_table"):
+            order.append(i)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        with lock.hold("my_table"):
+            futures = []
+            for i in range(8):
+                futures.append(executor.submit(commit, i))
+                # let each caller queue up before the next one arrives
+                time.sleep(0.02)
+        for future in futures:
+            future.result()
+
+    assert order == list(range(8))
+
+
+def test_keyed_lock_does_not_block_other_keys() -> None:
+    lock = KeyedLock()
+
+    def commit() -> bool:
+        with lock.hold_all(["other_table", "third_table"]):
+            return True
+
+    with lock.hold("my_table"):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(commit).result(timeout=1)
+
+
+def test_group_commit_queue_batches_commits_that_arrive_meanwhile() -> None:
+    queue = GroupCommitQueue()
+    started = threading.Event()
+    release = threading.Event()
+    batches = []
+
+    def commit_batch(requests):
+        batches.append(requests)
+        started.set()
+        release.wait()
+        return [ValueError(r) if r == "bad" else r.upper() for r in requests]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(queue.submit, "my_table", "a", commit_batch)
+        started.wait()
+        others = [
+            executor.submit(queue.submit, "my_table", request, commit_batch)
+            for request in ("b", "bad", "c")
+        ]
+        # give the other commits time to queue up behind the first batch
+        time.sleep(0.1)
+        release.set()
+        assert first.result() == "A"
+        assert others[0].result() == "B"
+        with pytest.raises(ValueError):
+            others[1].result()
+        assert others[2].result() == "C"
+
+    assert batches == [["a"], ["b", "bad", "c"]]
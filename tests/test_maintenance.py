@@ -0,0 +1,135 @@
+from pathlib import PosixPath
+from typing import Dict, List
+
+from iceberg_rest.maintenance import (
+    MetadataPruner,
+    add_previous_metadata,
+    remove_snapshots,
+    snapshots_to_expire,
+)
+from pyiceberg.io.pyarrow import PyArrowFileIO
+from pyiceberg.table.metadata import TableMetadataUtil
+
+TEST_METADATA = {
+    "format-version": 2,
+    "table-uuid": "9c12d441-03fe-4693-9a96-a0705ddf69c1",
+    "location": "s3://bucket/test/location",
+    "last-sequence-number": 0,
+    "last-updated-ms": 1602638573590,
+    "last-column-id": 1,
+    "current-schema-id": 0,
+    "schemas": [
+        {
+            "type": "struct",
+            "schema-id": 0,
+            "fields": [{"id": 1, "name": "x", "required": True, "type": "long"}],
+        }
+    ],
+    "default-spec-id": 0,
+    "partition-specs": [{"spec-id": 0, "fields": []}],
+    "last-partition-id": 999,
+    "default-sort-order-id": 0,
+    "sort-orders": [{"order-id": 0, "fields": []}],
+}
+
+
+def metadata_with(**properties: str):
+    return TableMetadataUtil.parse_obj({**TEST_METADATA, "properties": properties})
+
+
+def test_add_previous_metadata_keeps_the_newest_versions() -> None:
+    metadata = metadata_with(**{"write.metadata.previous-versions-max": "2"})
+    for version in range(4):
+        metadata = add_previous_metadata(
+            metadata, f"{version:05d}.metadata.json", metadata
+        )
+
+    assert [entry.metadata_file for entry in metadata.metadata_log] == [
+        "00002.metadata.json",
+        "00003.metadata.json",
+    ]
+
+
+def test_pruner_deletes_files_that_dropped_out_of_the_log(tmp_path: PosixPath) -> None:
+    locations = [
+        f"file://{tmp_path}/{version:05d}.metadata.json" for version in range(3)
+    ]
+    for location in locations:
+        PosixPath(location.removeprefix("file://")).touch()
+    previous = metadata_with(
+        **{
+            "write.metadata.delete-after-commit.enabled": "true",
+            "write.metadata.previous-versions-max": "1",
+        }
+    )
+    previous = add_previous_metadata(previous, locations[0], previous)
+    metadata = add_previous_metadata(previous, locations[1], previous)
+    pruner = MetadataPruner(max_workers=2)
+
+    pruner.prune(PyArrowFileIO(), previous, metadata)
+    pruner.wait()
+
+    assert [
+        PosixPath(location.removeprefix("file://")).exists() for location in locations
+    ] == [False, True, True]
+
+
+def test_pruner_keeps_files_unless_the_table_asks(tmp_path: PosixPath) -> None:
+    location = f"file://{tmp_path}/00000.metadata.json"
+    PosixPath(location.removeprefix("file://")).touch()
+    previous = metadata_with(**{"write.metadata.previous-versions-max": "1"})
+    previous = add_previous_metadata(previous, location, previous)
+    metadata = add_previous_metadata(previous, f"file://{tmp_path}/1", previous)
+
+    assert (
+        MetadataPruner(max_workers=1).prune(PyArrowFileIO(), previous, metadata) == []
+    )
+    assert PosixPath(location.removeprefix("file://")).exists()
+
+
+def metadata_with_snapshots(timestamps: List[int], refs: Dict[str, int]):
+    return TableMetadataUtil.parse_obj(
+        {
+            **TEST_METADATA,
+            "last-sequence-number": len(timestamps),
+            "current-snapshot-id": len(timestamps),
+            "snapshots": [
+                {
+                    "snapshot-id": i + 1,
+                    "parent-snapshot-id": i or None,
+                    "sequence-number": i + 1,
+                    "timestamp-ms": timestamp,
+                    "manifest-list": f"s3://bucket/test/location/snap-{i + 1}.avro",
+                    "summary": {"operation": "append"},
+                    "schema-id": 0,
+                }
+                for i, timestamp in enumerate(timestamps)
+            ],
+            "refs": {
+                name: {"snapshot-id": snapshot_id, "type": "branch"}
+                for name, snapshot_id in refs.items()
+            },
+            "snapshot-log": [
+                {"snapshot-id": i + 1, "timestamp-ms": timestamp}
+                for i, timestamp in enumerate(timestamps)
+            ],
+        }
+    )
+
+
+def test_snapshots_to_expire_keeps_refs_and_recent_ancestors() -> None:
+    metadata = metadata_with_snapshots(
+        [1000, 2000, 3000, 4000, 5000], refs={"main": 5, "audit": 1}
+    )
+
+    assert snapshots_to_expire(metadata, older_than_ms=4500, retain_last=2) == {2, 3}
+    assert snapshots_to_expire(metadata, older_than_ms=2500, retain_last=1) == {2}
+
+
+def test_remove_snapshots_drops_their_log_entries() -> None:
+    metadata = metadata_with_snapshots([1000, 2000, 3000], refs={"main": 3})
+
+    metadata = remove_snapshots(metadata, {1, 2})
+
+    assert [snapshot.snapshot_id for snapshot in metadata.snapshots] == [3]
+    assert [entry.snapshot_id for entry in metadata.snapshot_log] == [3]
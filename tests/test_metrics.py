@@ -0,0 +1,40 @@
+import pytest
+from iceberg_rest.metrics import CommitTimer, Histogram, commit_phase
+from pyiceberg.exceptions import CommitFailedException
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram(
+        "commit_seconds", "Commit time.", label_names=("phase",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, phase="write")
+
+    assert histogram.render().splitlines() == [
+        "# HELP commit_seconds Commit time.",
+        "# TYPE commit_seconds histogram",
+        'commit_seconds_bucket{phase="write",le="0.1"} 1',
+        'commit_seconds_bucket{phase="write",le="1.0"} 3',
+        'commit_seconds_bucket{phase="write",le="+Inf"} 4',
+        'commit_seconds_sum{phase="write"} 4.05',
+        'commit_seconds_count{phase="write"} 4',
+    ]
+
+
+def test_commit_timer_collects_phases_of_the_current_commit() -> None:
+    timer = CommitTimer()
+    with commit_phase("write"):
+        pass  # no commit is measured, nothing is recorded
+    assert "write" not in timer.durations
+
+    with pytest.raises(CommitFailedException):
+        with timer.measure():
+            with commit_phase("write"):
+                pass
+            with commit_phase("write"):
+                pass
+            raise CommitFailedException("Requirement failed")
+
+    assert set(timer.durations) == {"parse", "write", "total"}
+    phases = [entry.split(";")[0] for entry in timer.server_timing().split(", ")]
+    assert phases == ["parse", "write", "total"]
@@ -0,0 +1,28 @@
+import pytest
+from iceberg_rest.pagination import (
+    InvalidPageTokenError,
+    decode_page_token,
+    encode_page_token,
+)
+
+
+def test_page_token_round_trips_the_key() -> None:
+    token = encode_page_token("tables:default", "my_table")
+    assert decode_page_token(token, "tables:default") == ("my_table",)
+
+
+def test_empty_page_token_asks_for_the_first_page() -> None:
+    assert decode_page_token("", "tables:default") is None
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not a token",
+        encode_page_token("tables:other_namespace", "my_table"),
+        encode_page_token("tables:default"),
+    ],
+)
+def test_page_token_from_another_listing_is_rejected(token: str) -> None:
+    with pytest.raises(InvalidPageTokenError):
+        decode_page_token(token, "tables:default")
@@ -0,0 +1,83 @@
+from typing import Optional
+
+import pytest
+from iceberg_rest.patterns import name_conditions, parse_name_pattern
+from sqlalchemy import Dialect, String, column
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+
+@pytest.mark.parametrize(
+    "pattern,name,matches",
+    [
+        ("events_2024*", "events_2024_01", True),
+        ("events_2024*", "events_2023_12", False),
+        ("events_????", "events_2024", True),
+        ("events_????", "events_2024_01", False),
+        ("*_raw", "clicks_raw", True),
+        ("100\\%", "100%", True),
+        ("a\\*b", "a*b", True),
+        ("a\\*b", "axb", False),
+    ],
+)
+def test_name_pattern_matches_like_a_glob(
+    pattern: str, name: str, matches: bool
+) -> None:
+    assert parse_name_pattern(pattern).matches(name) is matches
+
+
+def test_name_pattern_prefix_stops_at_the_first_wildcard() -> None:
+    pattern = parse_name_pattern("events_2024*_raw")
+    assert pattern.prefix == "events_2024"
+    assert pattern.prefix_end() == "events_2025"
+    assert pattern.like == "events\\_2024%\\_raw"
+    assert pattern.glob == "events_2024*_raw"
+
+
+def test_name_pattern_escapes_glob_characters() -> None:
+    assert parse_name_pattern("a\\*b?[c]").glob == "a[*]b?[[]c]"
+
+
+def _sql(
+    pattern: str, dialect: Dialect = sqlite.dialect(), collation: Optional[str] = None
+) -> str:
+    conditions = name_conditions(
+        column("table_name", String), parse_name_pattern(pattern), dialect, collation
+    )
+    return " AND ".join(
+        str(condition.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+        for condition in conditions
+    )
+
+
+def test_name_conditions_use_a_range_for_the_prefix() -> None:
+    assert _sql("events_2024*") == (
+        "table_name >= 'events_2024' AND table_name < 'events_2025'"
+    )
+    assert _sql("events_2024*_raw") == (
+        "table_name >= 'events_2024' AND table_name < 'events_2025'"
+        " AND table_name GLOB 'events_2024*_raw'"
+    )
+    assert _sql("*_raw") == "table_name GLOB '*_raw'"
+    assert _sql("events") == "table_name = 'events'"
+
+
+def test_name_conditions_are_case_sensitive_on_every_dialect() -> None:
+    assert _sql("a*B", mysql.dialect(), "utf8mb4_bin") == (
+        "(table_name COLLATE utf8mb4_bin) >= 'a' AND (table_name COLLATE utf8mb4_bin)"
+        " < 'b' AND (table_name COLLATE utf8mb4_bin) LIKE 'a%%B' ESCAPE '\\\\'"
+    )
+    assert _sql("a*B", postgresql.dialect(), "C") == (
+        "(table_name COLLATE \"C\") >= 'a' AND (table_name COLLATE \"C\") < 'b'"
+        " AND (table_name COLLATE \"C\") LIKE 'a%%B' ESCAPE '\\'"
+    )
+
+
+def test_name_conditions_on_binary_columns_need_no_collation() -> None:
+    # Columns that compare by code point already are served by the primary key as is
+    assert _sql("a*B", mysql.dialect()) == (
+        "table_name >= 'a' AND table_name < 'b'"
+        " AND table_name LIKE 'a%%B' ESCAPE '\\\\'"
+    )
+    assert _sql("a*B", postgresql.dialect()) == (
+        "table_name >= 'a' AND table_name < 'b' AND table_name LIKE 'a%%B' ESCAPE '\\'"
+    )
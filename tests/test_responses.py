@@ -0,0 +1,21 @@
+import json
+
+import pytest
+from iceberg_rest.models.response import ListNamespacesResponse
+from iceberg_rest.responses import RESPONSE_CLASSES
+
+
+@pytest.mark.parametrize("response_class", RESPONSE_CLASSES.values())
+def test_response_class_renders_models(response_class) -> None:
+    response = response_class(ListNamespacesResponse(namespaces=[["default"]]))
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"namespaces": [["default"]]}
+    assert json.loads(response_class(ListNamespacesResponse()).body) == {}
+
+
+@pytest.mark.parametrize("response_class", RESPONSE_CLASSES.values())
+def test_response_class_renders_nested_models(response_class) -> None:
+    response = response_class(
+        {"responses": [ListNamespacesResponse(namespaces=[["a"], ["b"]])]}
+    )
+    assert json.loads(response.body) == {"responses": [{"namespaces": [["a"], ["b"]]}]}